@@ -0,0 +1,98 @@
+"""
+Response compression benchmark: bandwidth and CPU cost of each available
+encoding and level on the real /get_map and /game/state bodies (map matrix,
+row layout, columnar layout) of generated islands, weather stubbed.
+Records compression time, compressed size and ratio; decompression time is
+recorded as the client-side cost.
+
+Usage (from Backend/):
+    python -m benchmarks.bench_compression --sizes 50 200 1000 --output bench_compression.json
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import gzip
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+os.environ.setdefault("FARMIT_LOG_LEVEL", "WARNING")
+os.environ.setdefault("FARMIT_MAP_POOL_DEPTH", "0")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.stubs import stub_weather, temp_database
+from benchmarks.timing import BenchmarkResults, measure
+from game.compression import brotli, zstandard
+from game.serialization import FastJSONResponse
+from game.state import get_game_state_columns, get_game_state_payload, get_map_from_tiles, initialize_game
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+
+def codecs() -> Dict[str, Codec]:
+    """(compress, decompress) per 'encoding-level', for the installed encoders"""
+    found: Dict[str, Codec] = {}
+    for level in (1, 5, 9):
+        found[f"gzip-{level}"] = (lambda body, level=level: gzip.compress(body, compresslevel=level, mtime=0),
+                                  gzip.decompress)
+    if brotli is not None:
+        for quality in (4, 6, 11):
+            found[f"br-{quality}"] = (lambda body, quality=quality: brotli.compress(body, quality=quality),
+                                      brotli.decompress)
+    if zstandard is not None:
+        for level in (1, 3, 9):
+            found[f"zstd-{level}"] = (zstandard.ZstdCompressor(level=level).compress,
+                                      zstandard.ZstdDecompressor().decompress)
+    return found
+
+
+def payloads(db) -> Dict[str, bytes]:
+    """Bodies served by /get_map, /game/state?serializer=orjson and /game/state?layout=columns"""
+    matrix = get_map_from_tiles(db)
+    map_body = JSONResponse(jsonable_encoder({
+        "status": "success", "shape": matrix.shape, "data": matrix.tolist(),
+        "layers": ["mask", "soil_moisture", "soil_temperature"],
+    })).body
+    return {
+        "map": map_body,
+        "state": FastJSONResponse(get_game_state_payload(db)).body,
+        "columns": FastJSONResponse(get_game_state_columns(db)).body,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Response compression benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_compression.json")
+    args = parser.parse_args(argv)
+
+    available = codecs()
+    results = BenchmarkResults("compression", sizes=args.sizes, repeat=args.repeat, codecs=list(available))
+    with stub_weather():
+        for size in args.sizes:
+            with temp_database() as SessionLocal:
+                db = SessionLocal()
+                try:
+                    initialize_game(db, grid_size=(size, size), seed=args.seed)
+                    bodies = payloads(db)
+                finally:
+                    db.close()
+
+            for name, body in bodies.items():
+                for codec, (compress, decompress) in available.items():
+                    compressed = compress(body)
+                    results.add(f"compression.{name}.{codec}", size,
+                                measure(lambda: compress(body), repeat=args.repeat),
+                                bytes_in=len(body), bytes_out=len(compressed),
+                                ratio=round(len(body) / len(compressed), 2))
+                    results.add(f"decompression.{name}.{codec}", size,
+                                measure(lambda: decompress(compressed), repeat=args.repeat))
+    results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
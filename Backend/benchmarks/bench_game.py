@@ -0,0 +1,204 @@
+"""
+Benchmarks for map generation, game state, turn mechanics, adjacency helpers
+and tile actions, run against a temporary SQLite database with weather stubbed.
+
+Usage (from Backend/):
+    python -m benchmarks.bench_game --sizes 50 200 1000 --repeat 5 --output bench.json
+    python -m benchmarks.compare before.json after.json
+"""
+from typing import Callable, List, Optional
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from benchmarks.stubs import stub_weather, temp_database
+from benchmarks.timing import BenchmarkResults, measure
+from database.models import GameState, Player, Tile
+from game.actions import (
+    buy_tile,
+    plant_crop,
+    build_water_reserve,
+    build_firebreak,
+    set_forest_exploitation,
+)
+from game.adjacency import (
+    get_neighbors,
+    get_adjacent_tiles,
+    count_adjacent_conserved_forests,
+    get_tiles_adjacent_to_water_reserves,
+)
+from game.mechanics import irrigate_tile, harvest_tile
+from game.state import (
+    initialize_game,
+    get_current_game_state,
+    get_map_from_tiles,
+    advance_to_next_step,
+)
+from get_map.get_map import generate_bean_gdf_and_mask
+
+
+# Share of island tiles given an owner/crop before timing turn mechanics
+ACTIVE_FRACTION = 0.05
+
+
+class _TilePicker:
+    """Hands out distinct tile ids so repeated actions never hit the same tile"""
+
+    def __init__(self, tile_ids: List[int]):
+        self._ids = list(tile_ids)
+        self._index = 0
+
+    def next(self) -> int:
+        tile_id = self._ids[self._index % len(self._ids)]
+        self._index += 1
+        return tile_id
+
+
+def _prepare_activity(db, seed: int) -> None:
+    """Give the player a realistic mix of owned fields, crops, reserves and forests"""
+    rng = random.Random(seed)
+    tiles = db.query(Tile).all()
+    active = rng.sample(tiles, max(1, int(len(tiles) * ACTIVE_FRACTION)))
+    for index, tile in enumerate(active):
+        tile.owner = "player"
+        kind = index % 4
+        if kind == 0:
+            tile.type = "field"
+            tile.tile_state = rng.choice(["seed", "growing", "harvest"])
+        elif kind == 1:
+            tile.type = "forest"
+            tile.exploited = "conserve"
+        elif kind == 2:
+            tile.has_water_reserve = True
+    game_state = db.query(GameState).first()
+    game_state.max_steps = 10 ** 6
+    db.commit()
+
+
+def _refill(player: Player) -> None:
+    player.shovels = 10 ** 6
+    player.drops = 10 ** 6
+
+
+def bench_size(results: BenchmarkResults, SessionLocal, size: int, repeat: int, seed: int,
+               selected: Optional[Callable[[str], bool]] = None) -> None:
+    grid = (size, size)
+    wanted = selected or (lambda name: True)
+
+    def run(case: str, fn, setup=None, case_repeat: Optional[int] = None, **extra):
+        if wanted(case):
+            results.add(case, size, measure(fn, setup, repeat=case_repeat or repeat), **extra)
+
+    # Map generation alone
+    run("generate_bean_gdf_and_mask",
+        lambda: generate_bean_gdf_and_mask(grid_size=grid, scale_range=(0.4, 0.8),
+                                           rng=random.Random(seed)))
+
+    db = SessionLocal()
+    try:
+        def fresh_game():
+            initialize_game(db, grid_size=grid, seed=seed)
+
+        run("initialize_game", fresh_game)
+
+        # Build the game used by the remaining cases
+        fresh_game()
+        _prepare_activity(db, seed)
+        tile_count = db.query(Tile).count()
+        game_state = db.query(GameState).first()
+        player = db.query(Player).first()
+
+        run("get_current_game_state", lambda: get_current_game_state(db), tiles=tile_count)
+        run("get_map_from_tiles", lambda: get_map_from_tiles(db), tiles=tile_count)
+
+        def reset_turn():
+            game_state.current_step = 1
+            game_state.is_game_over = False
+            db.commit()
+
+        run("advance_to_next_step", lambda: advance_to_next_step(db), setup=reset_turn, tiles=tile_count)
+
+        # Adjacency helpers
+        sample_tile = db.query(Tile).filter(Tile.owner == "player").first()
+        run("adjacency.get_neighbors_x1000",
+            lambda: [get_neighbors(i % size, (i * 7) % size, size, size) for i in range(1000)])
+        run("adjacency.get_adjacent_tiles", lambda: get_adjacent_tiles(sample_tile, db))
+        run("adjacency.count_adjacent_conserved_forests",
+            lambda: count_adjacent_conserved_forests(sample_tile, db))
+        run("adjacency.get_tiles_adjacent_to_water_reserves",
+            lambda: get_tiles_adjacent_to_water_reserves(db), tiles=tile_count)
+
+        # Tile actions (each repetition targets a fresh tile, committed like the routers do)
+        unowned = _TilePicker([t.id for t in db.query(Tile.id).filter(Tile.owner.is_(None)).all()])
+        owned = _TilePicker([t.id for t in db.query(Tile.id).filter(Tile.owner == "player").all()])
+        target = {}
+
+        def pick(picker: _TilePicker, **attrs):
+            def setup():
+                _refill(player)
+                tile = db.get(Tile, picker.next())
+                for key, value in attrs.items():
+                    setattr(tile, key, value)
+                db.commit()
+                target["tile"] = tile
+            return setup
+
+        def committed(action):
+            def fn():
+                action()
+                db.commit()
+            return fn
+
+        run("action.buy_tile",
+            committed(lambda: buy_tile(target["tile"].id, player, db)),
+            setup=pick(unowned))
+        run("action.plant_crop",
+            committed(lambda: plant_crop(target["tile"].id, player, "wheat", db)),
+            setup=pick(owned, type="field", tile_state=None))
+        run("action.irrigate_tile",
+            committed(lambda: irrigate_tile(target["tile"], player, game_state.current_step, db)),
+            setup=pick(owned, type="field", tile_state="growing"))
+        run("action.harvest_tile",
+            committed(lambda: harvest_tile(target["tile"], player, db)),
+            setup=pick(owned, type="field", tile_state="harvest"))
+        run("action.build_water_reserve",
+            committed(lambda: build_water_reserve(target["tile"].id, player, db)),
+            setup=pick(owned, has_water_reserve=False))
+        run("action.build_firebreak",
+            committed(lambda: build_firebreak(target["tile"].id, player, db)),
+            setup=pick(owned, has_firebreak=False))
+        run("action.set_forest_exploitation",
+            committed(lambda: set_forest_exploitation(target["tile"].id, player, "exploit", db)),
+            setup=pick(owned, type="forest", tile_state=None, exploited="conserve"))
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Farm It game mechanics benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000],
+                        help="Square grid sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per case")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for map generation and activity")
+    parser.add_argument("--cases", nargs="*", default=None,
+                        help="Only run cases whose name contains one of these substrings")
+    parser.add_argument("--output", default="bench_game.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    selected = None
+    if args.cases:
+        selected = lambda name: any(part in name for part in args.cases)
+
+    results = BenchmarkResults("game", sizes=args.sizes, repeat=args.repeat, seed=args.seed)
+    with stub_weather():
+        for size in args.sizes:
+            with temp_database() as SessionLocal:
+                bench_size(results, SessionLocal, size, args.repeat, args.seed, selected)
+    results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
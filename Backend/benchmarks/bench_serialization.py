@@ -0,0 +1,102 @@
+"""
+/game/state serialization benchmark: the default Pydantic path (ORM tiles ->
+TileResponse models -> FastAPI's validate / dump / json.dumps) against the
+orjson path (plain row dicts -> orjson) and the columnar layout (one list per
+tile field -> orjson), on all-land maps of 2.5k, 40k and 1M tiles. Records
+build and encode times separately, plus payload size.
+
+Usage (from Backend/):
+    python -m benchmarks.bench_serialization --sizes 50 200 1000 --output bench_serialization.json
+"""
+from typing import List, Optional
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+os.environ.setdefault("FARMIT_LOG_LEVEL", "WARNING")
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from benchmarks.stubs import temp_database
+from benchmarks.timing import BenchmarkResults, measure
+from database.models import GameState, Player, Tile
+from game.schemas import GameStateResponse
+from game.serialization import FastJSONResponse
+from game.state import get_current_game_state, get_game_state_columns, get_game_state_payload, insert_tiles
+
+_adapter = TypeAdapter(GameStateResponse)
+
+
+def fastapi_encode(state: GameStateResponse) -> bytes:
+    """What FastAPI does with a response_model return value: dump, validate, dump to JSON types, json.dumps"""
+    value = _adapter.validate_python(state.model_dump())
+    content = _adapter.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def create_game(db, size: int) -> int:
+    """Game whose map is land everywhere (size x size tiles), a few of them owned"""
+    matrix = np.ones((size, size, 3))
+    matrix[:, :, 1] = 0.2
+    matrix[:, :, 2] = 21.0
+    db.add(GameState(current_step=0, max_steps=10, is_game_over=False, map_rows=size, map_cols=size, seed=0))
+    db.add(Player(shovels=3, drops=3, score=0))
+    tiles = insert_tiles(db, matrix)
+    db.execute(Tile.__table__.update().where(Tile.id % 97 == 0).values(owner="player"))
+    db.commit()
+    return tiles
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Game state serialization benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000],
+                        help="Map sides (all land: 50 -> 2.5k tiles, 200 -> 40k, 1000 -> 1M)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_serialization.json")
+    args = parser.parse_args(argv)
+
+    results = BenchmarkResults("serialization", sizes=args.sizes, repeat=args.repeat)
+    for size in args.sizes:
+        with temp_database() as SessionLocal:
+            db = SessionLocal()
+            try:
+                tiles = create_game(db, size)
+
+                state = get_current_game_state(db)
+                body = fastapi_encode(state)
+                results.add("serialization.pydantic.build", size,
+                            measure(lambda: get_current_game_state(db), repeat=args.repeat), tiles=tiles)
+                results.add("serialization.pydantic.encode", size,
+                            measure(lambda: fastapi_encode(state), repeat=args.repeat),
+                            tiles=tiles, bytes=len(body))
+                del state
+
+                payload = get_game_state_payload(db)
+                fast_body = FastJSONResponse(payload).body
+                results.add("serialization.orjson.build", size,
+                            measure(lambda: get_game_state_payload(db), repeat=args.repeat), tiles=tiles)
+                results.add("serialization.orjson.encode", size,
+                            measure(lambda: FastJSONResponse(payload).body, repeat=args.repeat),
+                            tiles=tiles, bytes=len(fast_body))
+                if json.loads(fast_body) != json.loads(body):
+                    print(f"warning: payloads differ at size {size}")
+                del payload, fast_body, body
+
+                columns = get_game_state_columns(db)
+                columns_body = FastJSONResponse(columns).body
+                results.add("serialization.columns.build", size,
+                            measure(lambda: get_game_state_columns(db), repeat=args.repeat), tiles=tiles)
+                results.add("serialization.columns.encode", size,
+                            measure(lambda: FastJSONResponse(columns).body, repeat=args.repeat),
+                            tiles=tiles, bytes=len(columns_body))
+            finally:
+                db.close()
+    results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
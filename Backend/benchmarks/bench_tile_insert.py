@@ -0,0 +1,85 @@
+"""
+Tile creation benchmark: per-object ORM add_all (the original initialize_game
+path) against the bulk insert_tiles() executemany path.
+
+Usage (from Backend/):
+    python -m benchmarks.bench_tile_insert --sizes 200 1000 --output bench_insert.json
+"""
+from typing import List, Optional
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from benchmarks.stubs import temp_database
+from benchmarks.timing import BenchmarkResults, measure
+from database.models import Tile
+from game.state import insert_tiles
+from get_map.get_map import generate_bean_gdf_and_mask
+
+
+def orm_add_all(db, matrix: np.ndarray) -> int:
+    """Reference implementation: one ORM Tile per island cell, committed with add_all"""
+    ny, nx = matrix.shape[:2]
+    tiles = []
+    tile_id = 1
+    for i in range(ny):
+        for j in range(nx):
+            if matrix[i, j, 0] == 1:
+                tiles.append(Tile(
+                    id=tile_id, grid_i=i, grid_j=j, zone_id=1, type="empty", owner=None,
+                    temperature=float(matrix[i, j, 2]), humidity=float(matrix[i, j, 1]),
+                    last_irrigated_step=-1, irrigated_this_step=False, exploited="conserve"
+                ))
+                tile_id += 1
+    db.add_all(tiles)
+    return len(tiles)
+
+
+def build_matrix(size: int, seed: int) -> np.ndarray:
+    _, mask = generate_bean_gdf_and_mask(grid_size=(size, size), scale_range=(0.4, 0.8),
+                                         rng=random.Random(seed))
+    matrix = np.zeros((size, size, 3))
+    matrix[:, :, 0] = mask
+    matrix[:, :, 1] = mask * 0.25
+    matrix[:, :, 2] = mask * 21.0
+    return matrix
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk tile insert benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_tile_insert.json")
+    args = parser.parse_args(argv)
+
+    results = BenchmarkResults("tile_insert", sizes=args.sizes, repeat=args.repeat, seed=args.seed)
+    for size in args.sizes:
+        matrix = build_matrix(size, args.seed)
+        tiles = int(matrix[:, :, 0].sum())
+        with temp_database() as SessionLocal:
+            db = SessionLocal()
+            try:
+                def clear():
+                    db.query(Tile).delete()
+                    db.commit()
+                    db.expunge_all()
+
+                for case, insert in (("tile_insert.orm_add_all", orm_add_all),
+                                     ("tile_insert.bulk_executemany", insert_tiles)):
+                    def run(insert=insert):
+                        insert(db, matrix)
+                        db.commit()
+                    results.add(case, size, measure(run, setup=clear, repeat=args.repeat), tiles=tiles)
+            finally:
+                db.close()
+    results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Weather point fetching benchmark against the local mock NASA POWER server:
+sequential calls (one worker) against the concurrent fetch_all() thread pool,
+for the 25-point grid of generate_grid_histories_25 and larger point sets.
+
+Usage (from Backend/):
+    python -m benchmarks.bench_weather_fetch --points 25 100 --latency 0.2 --output bench_fetch.json
+"""
+from typing import List, Optional
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+os.environ.setdefault("FARMIT_LOG_LEVEL", "WARNING")
+
+from benchmarks.mock_power import mock_power_server
+from benchmarks.timing import BenchmarkResults, measure
+from get_map import fetcher
+from get_map.download_files import get_nasa_power_point, grid_points
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Concurrent weather fetch benchmark")
+    parser.add_argument("--points", type=int, nargs="+", default=[25, 100])
+    parser.add_argument("--workers", type=int, default=fetcher.MAX_WORKERS)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock server latency per request (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_weather_fetch.json")
+    args = parser.parse_args(argv)
+
+    # Rate limiting is measured separately: lift it so latency dominates
+    fetcher.RATE_LIMIT = fetcher.RATE_BURST = 1000
+    fetcher._limiters.clear()
+
+    results = BenchmarkResults("weather_fetch", points=args.points, workers=args.workers,
+                               latency_s=args.latency, failure_rate=args.failure_rate, repeat=args.repeat)
+    with mock_power_server(latency=args.latency, failure_rate=args.failure_rate) as server:
+        for n_points in args.points:
+            side = int(n_points ** 0.5 + 0.999)
+            points = grid_points(20.0, 0.943227, side, side, 15.0)[:n_points]
+            for case, workers in (("weather_fetch.sequential", 1),
+                                  ("weather_fetch.thread_pool", args.workers)):
+                server.reset_stats()
+                frames = []
+                run = lambda: frames.append(fetcher.fetch_all(get_nasa_power_point, points, "nasa_power",
+                                                              max_workers=workers, backoff=0.05))
+                stats = measure(run, repeat=args.repeat)
+                missing = sum(frame is None for frame in frames[-1])
+                results.add(case, n_points, stats, workers=workers, requests=server.requests,
+                            failures=server.failures, max_in_flight=server.max_in_flight, missing=missing)
+    results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare two benchmark JSON files case by case.
+
+Usage (from Backend/):
+    python -m benchmarks.compare baseline.json candidate.json --threshold 1.10
+
+Exits with status 1 when a case is slower than `threshold` x the baseline median.
+"""
+from typing import List, Optional
+import argparse
+import json
+import sys
+
+
+def _index(path: str) -> tuple:
+    with open(path) as f:
+        document = json.load(f)
+    return {(r["case"], r["grid"]): r for r in document["results"]}, document.get("meta", {})
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="Slowdown ratio considered a regression")
+    args = parser.parse_args(argv)
+
+    baseline, baseline_meta = _index(args.baseline)
+    candidate, candidate_meta = _index(args.candidate)
+
+    print(f"baseline:  {baseline_meta.get('git_revision')}  ({args.baseline})")
+    print(f"candidate: {candidate_meta.get('git_revision')}  ({args.candidate})")
+    print(f"{'case':<48} {'grid':>5} {'baseline ms':>12} {'candidate ms':>13} {'ratio':>7}")
+
+    regressions = 0
+    for key in sorted(set(baseline) | set(candidate)):
+        case, grid = key
+        before, after = baseline.get(key), candidate.get(key)
+        if before is None or after is None:
+            status = "only in baseline" if after is None else "only in candidate"
+            print(f"{case:<48} {grid:>5} {status}")
+            continue
+        ratio = after["median_s"] / before["median_s"] if before["median_s"] else float("inf")
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{case:<48} {grid:>5} {before['median_s'] * 1000:12.3f} {after['median_s'] * 1000:13.3f} "
+              f"{ratio:7.2f}{flag}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
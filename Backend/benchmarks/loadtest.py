@@ -0,0 +1,252 @@
+"""
+Local HTTP load generator driving the FastAPI app with scripted players.
+
+Each simulated player plays full games: /game/start, then every turn it polls
+/game/state, buys and plants tiles, irrigates, harvests ripe crops and calls
+/game/next-step until the game is over. Weather and map APIs are stubbed and
+the app runs against a temporary SQLite database.
+
+The game is a server-wide singleton, so concurrent players share (and restart)
+the same game; rejected actions (4xx) are expected and reported per route.
+A rejected /game/start is retried after an exponential backoff and counted
+in failed_starts.
+
+Usage (from Backend/):
+    python -m benchmarks.loadtest --players 8 --duration 30                 # in-process ASGI
+    python -m benchmarks.loadtest --players 8 --duration 30 --uvicorn 8765  # local uvicorn
+"""
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+# Keep the app quiet unless the caller asked otherwise
+os.environ.setdefault("FARMIT_LOG_LEVEL", "WARNING")
+
+import httpx
+import numpy as np
+
+from benchmarks.stubs import stub_weather, temp_database
+from benchmarks.timing import git_revision
+
+# Backoff after a rejected /game/start (409 while another player's turn runs): doubles up to the max
+START_RETRY_DELAY = 0.05
+START_RETRY_MAX_DELAY = 1.0
+
+
+class RouteStats:
+    """Latency samples and status codes recorded per route template"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[int, int]] = {}
+        self.failed_starts = 0
+
+    def record(self, route: str, latency: float, status: int) -> None:
+        self.latencies.setdefault(route, []).append(latency)
+        codes = self.statuses.setdefault(route, {})
+        codes[status] = codes.get(status, 0) + 1
+
+    def summary(self, elapsed: float) -> List[dict]:
+        rows = []
+        for route in sorted(self.latencies):
+            samples = np.asarray(self.latencies[route]) * 1000
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            codes = self.statuses[route]
+            rows.append({
+                "route": route,
+                "requests": int(samples.size),
+                "rps": samples.size / elapsed,
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(samples.max()),
+                "errors_4xx": sum(n for code, n in codes.items() if 400 <= code < 500),
+                "errors_5xx": sum(n for code, n in codes.items() if code >= 500),
+            })
+        return rows
+
+
+class ScriptedPlayer:
+    """Plays games through the HTTP API, recording every call"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: RouteStats, rng: random.Random,
+                 deadline: float, think_time: float):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.deadline = deadline
+        self.think_time = think_time
+
+    async def call(self, method: str, url: str, route: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.stats.record(route, time.perf_counter() - start, response.status_code)
+        if self.think_time:
+            await asyncio.sleep(self.rng.uniform(0, self.think_time))
+        return response
+
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.deadline
+
+    async def play(self) -> None:
+        failures = 0
+        while not self.expired():
+            response = await self.call("POST", "/game/start", "/game/start")
+            if response.status_code != 200:
+                # Another player holds the game: back off instead of hammering /game/start
+                self.stats.failed_starts += 1
+                delay = min(START_RETRY_DELAY * 2 ** failures, START_RETRY_MAX_DELAY)
+                failures += 1
+                await asyncio.sleep(min(self.rng.uniform(delay / 2, delay),
+                                        max(self.deadline - time.perf_counter(), 0)))
+                continue
+            failures = 0
+            tile_ids = [tile["id"] for tile in response.json()["tiles"]]
+            if tile_ids:
+                await self.play_game(tile_ids)
+
+    async def play_game(self, tile_ids: List[int]) -> None:
+        owned: List[int] = []
+        while not self.expired():
+            state = await self.call("GET", "/game/state", "/game/state")
+            if state.status_code == 200:
+                ripe = [t["id"] for t in state.json()["tiles"]
+                        if t["owner"] == "player" and t["tile_state"] == "harvest"]
+                for tile_id in ripe:
+                    await self.call("POST", f"/tile/{tile_id}/harvest", "/tile/{tile_id}/harvest")
+
+            for _ in range(self.rng.randint(1, 2)):
+                tile_id = self.rng.choice(tile_ids)
+                bought = await self.call("POST", f"/tile/{tile_id}/buy", "/tile/{tile_id}/buy")
+                if bought.status_code == 200:
+                    owned.append(tile_id)
+
+            for tile_id in owned[-2:]:
+                await self.call("POST", f"/tile/{tile_id}/plant", "/tile/{tile_id}/plant",
+                                json={"action": "plant", "crop_type": "wheat"})
+
+            for tile_id in self.rng.sample(owned, min(len(owned), 3)):
+                await self.call("POST", f"/tile/{tile_id}/irrigate", "/tile/{tile_id}/irrigate")
+
+            if self.rng.random() < 0.2:
+                await self.call("GET", "/get_map", "/get_map")
+
+            step = await self.call("POST", "/game/next-step", "/game/next-step")
+            if step.status_code != 200 or step.json().get("is_game_over"):
+                return
+
+
+def _build_app(SessionLocal):
+    """Import the FastAPI app and route its sessions to the temporary database"""
+    from main import app
+    from database.session import get_db
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def _start_uvicorn(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def run_players(client: httpx.AsyncClient, players: int, duration: float,
+                      think_time: float, seed: int) -> tuple:
+    stats = RouteStats()
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        ScriptedPlayer(client, stats, random.Random(seed + index), deadline, think_time).play()
+        for index in range(players)
+    ))
+    return stats, time.perf_counter() - start
+
+
+def print_report(rows: List[dict], elapsed: float, failed_starts: int = 0) -> None:
+    total = sum(row["requests"] for row in rows)
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s), "
+          f"{failed_starts} failed game starts retried\n")
+    print(f"{'route':<28} {'count':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'4xx':>6} {'5xx':>6}")
+    for row in rows:
+        print(f"{row['route']:<28} {row['requests']:>7} {row['rps']:>8.1f} {row['p50_ms']:>9.2f} "
+              f"{row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['errors_4xx']:>6} {row['errors_5xx']:>6}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Farm It HTTP load test with scripted players")
+    parser.add_argument("--players", type=int, default=4, help="Concurrent simulated players")
+    parser.add_argument("--duration", type=float, default=20.0, help="Test duration in seconds")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Max random pause between a player's requests (seconds)")
+    parser.add_argument("--uvicorn", type=int, default=None, metavar="PORT",
+                        help="Serve the app with a local uvicorn on PORT instead of in-process ASGI")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Optional JSON results file")
+    args = parser.parse_args(argv)
+
+    with stub_weather(), temp_database() as SessionLocal:
+        app = _build_app(SessionLocal)
+        server = None
+        if args.uvicorn:
+            server, thread = _start_uvicorn(app, args.uvicorn)
+            client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.uvicorn}", timeout=60)
+        else:
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                       base_url="http://farmit.local", timeout=60)
+
+        async def session():
+            async with client:
+                return await run_players(client, args.players, args.duration, args.think_time, args.seed)
+
+        try:
+            stats, elapsed = asyncio.run(session())
+        finally:
+            if server is not None:
+                server.should_exit = True
+                thread.join(timeout=10)
+            app.dependency_overrides.clear()
+
+    rows = stats.summary(elapsed)
+    print_report(rows, elapsed, stats.failed_starts)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "suite": "loadtest",
+                    "git_revision": git_revision(),
+                    "players": args.players,
+                    "duration_s": elapsed,
+                    "mode": "uvicorn" if args.uvicorn else "asgi",
+                    "think_time_s": args.think_time,
+                    "failed_starts": stats.failed_starts,
+                },
+                "results": rows,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
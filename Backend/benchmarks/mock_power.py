@@ -0,0 +1,144 @@
+"""
+Local mock of the NASA POWER daily point API.
+
+Serves the deterministic series of stubs.fake_nasa_power_point() in the API's
+JSON layout, with configurable latency and transient failures (429 / 503), and
+records request counts and peak concurrency so the concurrent fetcher can be
+exercised without network access.
+
+Usage (from Backend/):
+    python -m benchmarks.mock_power --port 8766 --latency 0.3 --failure-rate 0.1
+    FARMIT_NASA_POWER_URL=http://127.0.0.1:8766/api/temporal/daily/point uvicorn main:app
+"""
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from benchmarks.stubs import fake_nasa_power_point
+
+POINT_PATH = "/api/temporal/daily/point"
+
+
+class MockPowerServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering POINT_PATH requests"""
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, failure_rate: float = 0.0,
+                 seed: int = 0):
+        super().__init__(("127.0.0.1", port), _PowerHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{POINT_PATH}"
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = self.failures = self.max_in_flight = 0
+
+
+class _PowerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server: MockPowerServer = self.server
+        url = urlparse(self.path)
+        if url.path != POINT_PATH:
+            self._send(404, {"messages": [f"Unknown path {url.path}"]})
+            return
+
+        with server._lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            fail = server.rng.random() < server.failure_rate
+            if fail:
+                server.failures += 1
+        try:
+            if server.latency:
+                time.sleep(server.latency)
+            if fail:
+                self._send(server.rng.choice((429, 503)), {"messages": ["Transient failure (mock)"]})
+                return
+
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            df = fake_nasa_power_point(float(query["latitude"]), float(query["longitude"]),
+                                       query.get("start", "20230101"), query.get("end", "20231231"))
+            df.index = df.index.strftime("%Y%m%d")
+            self._send(200, {"properties": {"parameter": {
+                column: df[column].round(3).to_dict() for column in query["parameters"].split(",")
+                if column in df.columns
+            }}})
+        finally:
+            with server._lock:
+                server.in_flight -= 1
+
+
+@contextmanager
+def mock_power_server(latency: float = 0.0, failure_rate: float = 0.0,
+                      seed: int = 0) -> Iterator[MockPowerServer]:
+    """
+    Run a MockPowerServer on a free port and route get_nasa_power_point() to it.
+    """
+    import get_map.download_files as download_module
+
+    server = MockPowerServer(0, latency, failure_rate, seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    original_url = download_module.NASA_POWER_URL
+    download_module.NASA_POWER_URL = server.url
+    try:
+        yield server
+    finally:
+        download_module.NASA_POWER_URL = original_url
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local mock NASA POWER point API")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds per response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of 429/503 responses")
+    args = parser.parse_args(argv)
+
+    server = MockPowerServer(args.port, args.latency, args.failure_rate)
+    print(f"Mock NASA POWER listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Offline stand-ins for the benchmark and load-test harnesses:
+a throw-away SQLite database and deterministic weather sources
+replacing the NASA POWER and Open-Meteo network calls.
+"""
+from contextlib import contextmanager
+from typing import Iterator
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import Base
+
+
+def fake_nasa_power_point(lat, lon, start="20230101", end="20231231"):
+    """Deterministic daily T2M / RH2M / PRECTOT series shaped like get_nasa_power_point()"""
+    dates = pd.date_range(pd.to_datetime(start, format="%Y%m%d"), pd.to_datetime(end, format="%Y%m%d"), freq="D")
+    phase = np.linspace(0, 2 * np.pi, len(dates))
+    offset = (lat + lon) % 1.0
+    return pd.DataFrame({
+        "T2M": 24.0 + 6.0 * np.sin(phase) + offset,
+        "RH2M": 70.0 + 15.0 * np.cos(phase) - 10.0 * offset,
+        "PRECTOT": np.clip(3.0 * np.sin(3 * phase), 0, None),
+    }, index=dates)
+
+
+def fake_history_info(lat: float, lon: float):
+    """Deterministic daily soil moisture / temperature series shaped like get_history_info()"""
+    dates = pd.date_range("2024-01-01", "2024-12-31", freq="D", tz="UTC")
+    phase = np.linspace(0, 2 * np.pi, len(dates))
+    offset = (lat + lon) % 1.0
+    return pd.DataFrame({
+        "date": dates,
+        "soil_moisture_0_to_7cm_mean": 0.22 + 0.08 * np.sin(phase) - 0.02 * offset,
+        "soil_temperature_28_to_100cm_mean": 21.0 + 4.0 * np.cos(phase) + offset,
+    })
+
+
+class _FakeVariable:
+    def __init__(self, values: np.ndarray):
+        self._values = values
+
+    def ValuesAsNumpy(self) -> np.ndarray:
+        return self._values
+
+
+class _FakeDaily:
+    def __init__(self, frame: pd.DataFrame, variables):
+        self._frame = frame
+        self._variables = list(variables)
+
+    def Time(self) -> int:
+        return int(self._frame["date"].iloc[0].timestamp())
+
+    def TimeEnd(self) -> int:
+        return int(self._frame["date"].iloc[-1].timestamp()) + self.Interval()
+
+    def Interval(self) -> int:
+        return 86400
+
+    def Variables(self, index: int) -> _FakeVariable:
+        return _FakeVariable(self._frame[self._variables[index]].to_numpy(dtype=np.float32))
+
+
+class FakeOpenMeteoResponse:
+    """Stand-in for one location of an Open-Meteo WeatherApiResponse (daily block only)"""
+
+    def __init__(self, location_id: int, lat: float, lon: float, variables):
+        self._location_id = location_id
+        self._daily = _FakeDaily(fake_history_info(lat, lon), variables)
+
+    def LocationId(self) -> int:
+        return self._location_id
+
+    def Daily(self) -> _FakeDaily:
+        return self._daily
+
+
+class FakeOpenMeteoClient:
+    """
+    Stand-in for openmeteo_requests.Client: answers weather_api() with one
+    FakeOpenMeteoResponse per requested location, like a multi-location call.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def weather_api(self, url: str, params: dict):
+        self.calls += 1
+        lats, lons = np.atleast_1d(params["latitude"]), np.atleast_1d(params["longitude"])
+        return [FakeOpenMeteoResponse(index, float(lat), float(lon), params["daily"])
+                for index, (lat, lon) in enumerate(zip(lats, lons))]
+
+
+@contextmanager
+def stub_weather() -> Iterator[None]:
+    """Replace every network weather source used by the game with the fakes above"""
+    import get_map.download_files as download_module
+    import get_map.get_history_info as history_module
+
+    patches = [
+        (download_module, "get_nasa_power_point", fake_nasa_power_point),
+        (history_module, "openmeteo", FakeOpenMeteoClient()),
+    ]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    try:
+        for module, name, replacement in patches:
+            setattr(module, name, replacement)
+        yield
+    finally:
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+
+@contextmanager
+def temp_database() -> Iterator[sessionmaker]:
+    """
+    Create a fresh SQLite database in a temporary directory.
+    Yields a session factory bound to it; the file is removed on exit.
+    """
+    with tempfile.TemporaryDirectory(prefix="farmit-bench-") as tmp_dir:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp_dir, 'farm_it.db')}",
+            connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        try:
+            yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        finally:
+            engine.dispose()
@@ -0,0 +1,81 @@
+"""
+Timing helpers and JSON result files shared by the benchmark scripts.
+"""
+from typing import Callable, List, Optional
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+
+def measure(fn: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+            repeat: int = 5, warmup: int = 0) -> dict:
+    """
+    Time `fn` `repeat` times, running `setup` (untimed) before each call.
+
+    Returns:
+        dict with min/median/mean/max durations in seconds
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+
+    return {
+        "repeat": repeat,
+        "min_s": min(durations),
+        "median_s": statistics.median(durations),
+        "mean_s": statistics.fmean(durations),
+        "max_s": max(durations),
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkResults:
+    """Collects benchmark records and writes them as a JSON document"""
+
+    def __init__(self, suite: str, **meta):
+        self.suite = suite
+        self.meta = {
+            "suite": suite,
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            **meta,
+        }
+        self.records: List[dict] = []
+
+    def add(self, case: str, grid: int, stats: dict, **extra) -> dict:
+        record = {"case": case, "grid": grid, **extra, **stats}
+        self.records.append(record)
+        print(f"{case:<48} grid={grid:<5} median={stats['median_s'] * 1000:10.3f} ms  "
+              f"min={stats['min_s'] * 1000:10.3f} ms")
+        return record
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"meta": self.meta, "results": self.records}, f, indent=2)
+        print(f"Results written to {path}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean
+from sqlalchemy import Column, Integer, String, Float, Boolean, LargeBinary, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -14,6 +14,9 @@ class GameState(Base):
     is_game_over = Column(Boolean, default=False)
     map_rows = Column(Integer, default=50)
     map_cols = Column(Integer, default=50)
+    seed = Column(Integer, nullable=True)  # Map generation seed, used to replay the game
+    zone = Column(String, nullable=True)  # Zone / region of zone-aware maps (None = synthetic island)
+    revision = Column(Integer, default=0)  # Bumped by every state-changing commit (see game.revision)
 
     def __repr__(self):
         return f"<GameState(step={self.current_step}, max_steps={self.max_steps}, game_over={self.is_game_over})>"
@@ -27,6 +30,9 @@ class Player(Base):
     shovels = Column(Integer, default=3)
     drops = Column(Integer, default=3)
     score = Column(Integer, default=0)
+    version_id = Column(Integer, nullable=False, server_default="1")  # Optimistic concurrency counter
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     def __repr__(self):
         return f"<Player(shovels={self.shovels}, drops={self.drops}, score={self.score})>"
@@ -35,11 +41,15 @@ class Player(Base):
 class Tile(Base):
     """Individual tile state"""
     __tablename__ = "tiles"
+    __table_args__ = (
+        Index("ix_tiles_grid_i_grid_j", "grid_i", "grid_j"),  # Viewport (bounding box) queries
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     grid_i = Column(Integer, nullable=False)
     grid_j = Column(Integer, nullable=False)
     zone_id = Column(Integer, nullable=False)
+    chunk_id = Column(Integer, nullable=True, index=True)  # See game.chunks
     type = Column(String, default="empty")
     owner = Column(String, nullable=True)
     tile_state = Column(String, nullable=True)
@@ -50,6 +60,38 @@ class Tile(Base):
     last_irrigated_step = Column(Integer, default=-1)
     irrigated_this_step = Column(Boolean, default=False)
     exploited = Column(String, default="conserve")
+    # Optimistic concurrency counter, checked by ORM updates (turn-time bulk updates hold the game lock)
+    version_id = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     def __repr__(self):
         return f"<Tile(id={self.id}, pos=({self.grid_i},{self.grid_j}), type={self.type}, owner={self.owner})>"
+
+
+class GameAction(Base):
+    """Append-only log of state-changing actions, replayed on top of a GameSnapshot or GameState.seed"""
+    __tablename__ = "game_actions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    step = Column(Integer, nullable=False)
+    action = Column(String, nullable=False)
+    tile_id = Column(Integer, nullable=True)
+    payload = Column(String, nullable=True)  # JSON-encoded extra arguments (crop_type, mode)
+
+    def __repr__(self):
+        return f"<GameAction(id={self.id}, step={self.step}, action={self.action}, tile_id={self.tile_id})>"
+
+
+class GameSnapshot(Base):
+    """Compressed columnar copy of the tiles, player and game state at the end of a step"""
+    __tablename__ = "game_snapshots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    step = Column(Integer, nullable=False)
+    action_id = Column(Integer, nullable=False)  # Last GameAction included in the snapshot
+    tile_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)  # np.savez_compressed archive
+
+    def __repr__(self):
+        return f"<GameSnapshot(id={self.id}, step={self.step}, action_id={self.action_id}, tiles={self.tile_count})>"
@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.orm import sessionmaker
 from typing import Generator
 
+from database.models import Base
+
 # SQLite database URL
 SQLALCHEMY_DATABASE_URL = "sqlite:///./farm_it.db"
 
@@ -25,3 +29,23 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def init_db(bind: Engine = engine) -> None:
+    """
+    Create missing tables and add columns/indexes introduced after a database
+    file was created (create_all() never alters existing tables).
+    """
+    Base.metadata.create_all(bind=bind)
+
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    # Full column DDL, so server defaults fill the existing rows
+                    definition = CreateColumn(column).compile(dialect=bind.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
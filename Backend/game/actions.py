@@ -5,6 +5,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from database.models import Tile, Player
+from game.active import track_tile
 
 
 def buy_tile(tile_id: int, player: Player, db: Session) -> dict:
@@ -27,6 +28,24 @@ def buy_tile(tile_id: int, player: Player, db: Session) -> dict:
             "message": f"Tile {tile_id} not found"
         }
 
+    result = apply_buy_tile(tile, player)
+    if result["success"]:
+        track_tile(db, tile)
+    return result
+
+
+def apply_buy_tile(tile: Tile, player: Player) -> dict:
+    """
+    Apply the purchase rules to a loaded tile. Costs 1 shovel.
+    Shared by the database-backed action above and the headless simulation.
+
+    Args:
+        tile: Tile to buy (ORM or in-memory tile)
+        player: Player object
+
+    Returns:
+        dict with success status and message
+    """
     # Validate tile is not already owned
     if tile.owner is not None:
         return {
@@ -48,7 +67,7 @@ def buy_tile(tile_id: int, player: Player, db: Session) -> dict:
     return {
         "success": True,
         "message": "Tile purchased successfully",
-        "tile_id": tile_id,
+        "tile_id": tile.id,
         "shovels_remaining": player.shovels
     }
 
@@ -74,6 +93,24 @@ def plant_crop(tile_id: int, player: Player, crop_type: str, db: Session) -> dic
             "message": f"Tile {tile_id} not found"
         }
 
+    result = apply_plant_crop(tile, player, crop_type)
+    if result["success"]:
+        track_tile(db, tile)
+    return result
+
+
+def apply_plant_crop(tile: Tile, player: Player, crop_type: str) -> dict:
+    """
+    Apply the planting rules to a loaded tile. Tile must be owned and empty or field.
+
+    Args:
+        tile: Tile to plant on (ORM or in-memory tile)
+        player: Player object
+        crop_type: Type of crop to plant
+
+    Returns:
+        dict with success status and message
+    """
     # Validate tile is owned by player
     if tile.owner != "player":
         return {
@@ -102,7 +139,7 @@ def plant_crop(tile_id: int, player: Player, crop_type: str, db: Session) -> dic
     return {
         "success": True,
         "message": f"Crop planted successfully",
-        "tile_id": tile_id,
+        "tile_id": tile.id,
         "crop_type": crop_type
     }
 
@@ -128,6 +165,23 @@ def build_water_reserve(tile_id: int, player: Player, db: Session) -> dict:
             "message": f"Tile {tile_id} not found"
         }
 
+    result = apply_build_water_reserve(tile, player)
+    if result["success"]:
+        track_tile(db, tile)
+    return result
+
+
+def apply_build_water_reserve(tile: Tile, player: Player) -> dict:
+    """
+    Apply the water reserve rules to a loaded tile. Costs 2 drops.
+
+    Args:
+        tile: Tile to build on (ORM or in-memory tile)
+        player: Player object
+
+    Returns:
+        dict with success status and message
+    """
     # Validate tile is owned by player
     if tile.owner != "player":
         return {
@@ -156,7 +210,7 @@ def build_water_reserve(tile_id: int, player: Player, db: Session) -> dict:
     return {
         "success": True,
         "message": "Water reserve built successfully",
-        "tile_id": tile_id,
+        "tile_id": tile.id,
         "drops_remaining": player.drops
     }
 
@@ -182,6 +236,20 @@ def build_firebreak(tile_id: int, player: Player, db: Session) -> dict:
             "message": f"Tile {tile_id} not found"
         }
 
+    return apply_build_firebreak(tile, player)
+
+
+def apply_build_firebreak(tile: Tile, player: Player) -> dict:
+    """
+    Apply the firebreak rules to a loaded tile. Costs 1 shovel.
+
+    Args:
+        tile: Tile to build on (ORM or in-memory tile)
+        player: Player object
+
+    Returns:
+        dict with success status and message
+    """
     # Validate tile is owned by player
     if tile.owner != "player":
         return {
@@ -210,7 +278,7 @@ def build_firebreak(tile_id: int, player: Player, db: Session) -> dict:
     return {
         "success": True,
         "message": "Firebreak built successfully",
-        "tile_id": tile_id,
+        "tile_id": tile.id,
         "shovels_remaining": player.shovels
     }
 
@@ -238,6 +306,21 @@ def set_forest_exploitation(tile_id: int, player: Player, mode: str, db: Session
             "message": f"Tile {tile_id} not found"
         }
 
+    return apply_forest_exploitation(tile, player, mode)
+
+
+def apply_forest_exploitation(tile: Tile, player: Player, mode: str) -> dict:
+    """
+    Apply the forest exploitation rules to a loaded tile.
+
+    Args:
+        tile: Forest tile (ORM or in-memory tile)
+        player: Player object
+        mode: "conserve" or "exploit"
+
+    Returns:
+        dict with success status and message
+    """
     # Validate tile is owned by player
     if tile.owner != "player":
         return {
@@ -265,6 +348,6 @@ def set_forest_exploitation(tile_id: int, player: Player, mode: str, db: Session
     return {
         "success": True,
         "message": f"Forest exploitation set to {mode}",
-        "tile_id": tile_id,
+        "tile_id": tile.id,
         "mode": mode
     }
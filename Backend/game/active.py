@@ -0,0 +1,126 @@
+"""
+Sparse sets of the tiles turn processing works on.
+
+Most of the island is unowned, empty land that no turn mechanic touches. The
+sets below map tile id -> grid position for owned, planted, water reserve and
+forest tiles. They are loaded once per game from the database and then kept up
+to date by the actions that change them (buy_tile, plant_crop, harvest_tile,
+build_water_reserve, check_crop_death), so advance_to_next_step does
+O(active tiles) work instead of O(map).
+
+Actions update the sets before their transaction commits, so later steps of
+the same transaction (a replay) see them. A transaction that changed or
+loaded the sets and ends without committing drops them, and they are
+reloaded from the committed rows.
+"""
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import GameState, Tile
+
+# Ids per IN (...) query when loading tiles from the sets (below SQLite's variable limit)
+ID_BATCH_SIZE = 500
+# Session.info key set while the session's transaction holds changes reflected in the sets
+_CHANGED_KEY = "active_tiles_changed"
+
+Position = Tuple[int, int]
+
+
+class ActiveTiles:
+    """Owned / planted / water reserve / forest tiles of the current game"""
+
+    def __init__(self):
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the sets; they are reloaded on next use"""
+        self.key: Optional[tuple] = None
+        self.owned: Dict[int, Position] = {}
+        self.planted: Dict[int, Position] = {}
+        self.reserves: Dict[int, Position] = {}
+        self.forests: Dict[int, Position] = {}
+
+    def ensure(self, db: Session) -> "ActiveTiles":
+        """Load the sets from the database if they belong to another game (or none)"""
+        game_state = db.query(GameState).first()
+        key = (game_state.id, game_state.seed, game_state.map_rows, game_state.map_cols) if game_state else None
+        if key != self.key:
+            self.invalidate()
+            rows = db.execute(
+                select(Tile.id, Tile.grid_i, Tile.grid_j, Tile.owner, Tile.tile_state,
+                       Tile.has_water_reserve, Tile.type)
+                .where(or_(Tile.owner.isnot(None), Tile.tile_state.isnot(None),
+                           Tile.has_water_reserve.is_(True), Tile.type == "forest"))
+            ).all()
+            for row in rows:
+                self._classify(row.id, (row.grid_i, row.grid_j), row.owner, row.tile_state,
+                               row.has_water_reserve, row.type)
+            self.key = key
+            db.info[_CHANGED_KEY] = True  # Read inside this transaction, possibly uncommitted rows
+        return self
+
+    def _classify(self, tile_id: int, position: Position, owner, tile_state,
+                  has_water_reserve, tile_type) -> None:
+        for members, active in ((self.owned, owner is not None),
+                                (self.planted, tile_state is not None),
+                                (self.reserves, bool(has_water_reserve)),
+                                (self.forests, tile_type == "forest")):
+            if active:
+                members[tile_id] = position
+            else:
+                members.pop(tile_id, None)
+
+    def track(self, db: Session, tile: Tile) -> None:
+        """Re-classify a tile after an action changed it"""
+        self.ensure(db)
+        self._classify(tile.id, (tile.grid_i, tile.grid_j), tile.owner, tile.tile_state,
+                       tile.has_water_reserve, tile.type)
+        db.info[_CHANGED_KEY] = True
+
+    def load(self, db: Session, tile_ids: Iterable[int]) -> List[Tile]:
+        """Load tiles by id, ordered by id, in IN (...) batches"""
+        ids = sorted(tile_ids)
+        tiles: List[Tile] = []
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            batch = ids[start:start + ID_BATCH_SIZE]
+            tiles.extend(db.query(Tile).filter(Tile.id.in_(batch)).order_by(Tile.id).all())
+        return tiles
+
+    def update_flags(self, db: Session, tile_ids: Iterable[int], values: dict) -> int:
+        """Bulk UPDATE the given tiles, without loading them. Returns the row count."""
+        ids = sorted(tile_ids)
+        updated = 0
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            updated += (db.query(Tile)
+                        .filter(Tile.id.in_(ids[start:start + ID_BATCH_SIZE]))
+                        .update(values, synchronize_session=False))
+        return updated
+
+
+# Active tiles of the (singleton) game served by this process
+active_tiles = ActiveTiles()
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_changes(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted_changes(session: Session, transaction) -> None:
+    if transaction.parent is not None and not transaction.nested:
+        return  # Internal subtransaction (flush), the outer transaction decides
+    # Rolled back or closed without a commit: the sets no longer match the rows
+    if session.info.pop(_CHANGED_KEY, None):
+        active_tiles.invalidate()
+
+
+def track_tile(db: Optional[Session], tile: Tile) -> None:
+    """Record a tile change in the active sets (no-op for in-memory simulation tiles)"""
+    if db is not None:
+        active_tiles.track(db, tile)
@@ -0,0 +1,112 @@
+"""
+Fixed-size map chunks and viewports.
+
+The grid is split into CHUNK_SIZE x CHUNK_SIZE chunks. Each tile stores the id
+of its chunk (indexed), so clients can fetch only the chunks in their viewport.
+Arbitrary rectangles of the grid are described by a Viewport (inclusive row and
+column ranges), served through the (grid_i, grid_j) index.
+"""
+from sqlalchemy.orm import Session
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import Tile
+
+# Tiles per chunk side
+CHUNK_SIZE = 64
+# chunk_id = chunk_row * CHUNK_STRIDE + chunk_col, independent of the map width
+# (supports maps up to CHUNK_SIZE * CHUNK_STRIDE columns)
+CHUNK_STRIDE = 4096
+
+
+def chunk_id_of(grid_i, grid_j):
+    """Chunk id of a cell (works on ints and NumPy arrays)"""
+    return (grid_i // CHUNK_SIZE) * CHUNK_STRIDE + grid_j // CHUNK_SIZE
+
+
+def chunk_id(chunk_row: int, chunk_col: int) -> int:
+    return chunk_row * CHUNK_STRIDE + chunk_col
+
+
+def chunk_bounds(chunk_row: int, chunk_col: int, ny: int, nx: int) -> Tuple[int, int, int, int]:
+    """Grid slice (i0, i1, j0, j1) covered by a chunk, clipped to the map"""
+    i0, j0 = chunk_row * CHUNK_SIZE, chunk_col * CHUNK_SIZE
+    return i0, min(i0 + CHUNK_SIZE, ny), j0, min(j0 + CHUNK_SIZE, nx)
+
+
+def parse_chunks(values: Iterable[str], ny: int, nx: int) -> List[Tuple[int, int]]:
+    """
+    Parse "row,col" chunk coordinates (e.g. from repeated query parameters).
+
+    Raises:
+        ValueError: On malformed or out-of-map coordinates
+    """
+    n_rows, n_cols = -(-ny // CHUNK_SIZE), -(-nx // CHUNK_SIZE)
+    chunks = []
+    for value in values:
+        try:
+            row, col = (int(part) for part in value.split(","))
+        except ValueError:
+            raise ValueError(f"Invalid chunk '{value}', expected 'row,col'")
+        if not (0 <= row < n_rows and 0 <= col < n_cols):
+            raise ValueError(f"Chunk {row},{col} is outside the {n_rows}x{n_cols} chunk grid")
+        if (row, col) not in chunks:
+            chunks.append((row, col))
+    return chunks
+
+
+def slice_chunks(matrix: np.ndarray, chunks: Sequence[Tuple[int, int]]) -> List[dict]:
+    """Cut a (ny, nx, layers) matrix into the requested chunks"""
+    ny, nx = matrix.shape[:2]
+    result = []
+    for row, col in chunks:
+        i0, i1, j0, j1 = chunk_bounds(row, col, ny, nx)
+        result.append({"chunk": [row, col], "origin": [i0, j0], "data": matrix[i0:i1, j0:j1]})
+    return result
+
+
+class Viewport(NamedTuple):
+    """Inclusive grid ranges of a bounding box"""
+    row_min: int
+    row_max: int
+    col_min: int
+    col_max: int
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.row_max - self.row_min + 1, self.col_max - self.col_min + 1
+
+
+def make_viewport(row_min: Optional[int], row_max: Optional[int], col_min: Optional[int],
+                  col_max: Optional[int], ny: int, nx: int) -> Optional[Viewport]:
+    """
+    Build a viewport clipped to the map; missing bounds default to the map edges.
+    Returns None when no bound is given.
+
+    Raises:
+        ValueError: If the box is empty or entirely outside the map
+    """
+    if row_min is None and row_max is None and col_min is None and col_max is None:
+        return None
+    viewport = Viewport(
+        max(row_min if row_min is not None else 0, 0),
+        min(row_max if row_max is not None else ny - 1, ny - 1),
+        max(col_min if col_min is not None else 0, 0),
+        min(col_max if col_max is not None else nx - 1, nx - 1),
+    )
+    if viewport.row_min > viewport.row_max or viewport.col_min > viewport.col_max:
+        raise ValueError(f"Bounding box rows {row_min}..{row_max}, cols {col_min}..{col_max} "
+                         f"does not intersect the {ny}x{nx} map")
+    return viewport
+
+
+def backfill_chunk_ids(db: Session) -> int:
+    """Fill chunk_id for tiles created before the column existed. Does not commit."""
+    return (db.query(Tile)
+            .filter(Tile.chunk_id.is_(None))
+            .update({Tile.chunk_id: chunk_id_of(Tile.grid_i, Tile.grid_j)}, synchronize_session=False))
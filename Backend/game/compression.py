@@ -0,0 +1,173 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+Map and state payloads are long runs of repeated numbers and compress 4x
+(columnar state) to 18x (map matrix). gzip is always available; brotli ("br")
+and zstandard ("zstd") are used when their packages are installed. Levels
+favour latency: the 24 MB map body of a 1000x1000 island compresses 18x in
+0.24 s at gzip 5, against 7x at level 1 and 18.6x in 0.64 s at level 9
+(benchmarks/bench_compression.py).
+
+CompressionMiddleware compresses any response above COMPRESSION_MIN_SIZE
+that is not already encoded; cached bodies (game.http_cache) are compressed
+once per revision and encoding instead. Bodies above COMPRESSION_THREAD_MIN_SIZE
+are compressed in a worker thread (compress_async) so the event loop keeps
+serving other requests meanwhile.
+"""
+from typing import Callable, Dict, Optional
+import gzip
+import os
+
+import anyio
+
+from monitoring.metrics import COMPRESSION_BYTES, COMPRESSION_SECONDS
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Smallest body worth compressing (bytes); below it, headers and CPU outweigh the gain
+COMPRESSION_MIN_SIZE = int(os.getenv("FARMIT_COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("FARMIT_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("FARMIT_BROTLI_QUALITY", "4"))
+ZSTD_LEVEL = int(os.getenv("FARMIT_ZSTD_LEVEL", "3"))
+# Bodies from this size (bytes) are compressed off the event loop; smaller ones
+# take less time to compress than a thread handoff
+COMPRESSION_THREAD_MIN_SIZE = int(os.getenv("FARMIT_COMPRESSION_THREAD_MIN_SIZE", str(64 * 1024)))
+
+# Content types that are already compressed or not worth it
+_SKIPPED_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "text/event-stream")
+
+
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _build_codecs() -> Dict[str, Callable[[bytes], bytes]]:
+    # In order of preference when the client accepts several with the same q-value
+    codecs: Dict[str, Callable[[bytes], bytes]] = {}
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        codecs["zstd"] = compressor.compress
+    if brotli is not None:
+        codecs["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+    codecs["gzip"] = _gzip
+    return codecs
+
+
+CODECS = _build_codecs()
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Best available encoding for an Accept-Encoding header, None for identity.
+    The highest q-value wins; ties go to the first encoding of CODECS.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in CODECS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress `body` with one of CODECS, recording the time and bytes saved"""
+    with COMPRESSION_SECONDS.time(encoding=encoding):
+        compressed = CODECS[encoding](body)
+    COMPRESSION_BYTES.inc(len(body), encoding=encoding, stage="in")
+    COMPRESSION_BYTES.inc(len(compressed), encoding=encoding, stage="out")
+    return compressed
+
+
+async def compress_async(body: bytes, encoding: str) -> bytes:
+    """compress(), in a worker thread when the body is large enough to stall the event loop"""
+    if len(body) < COMPRESSION_THREAD_MIN_SIZE:
+        return compress(body, encoding)
+    return await anyio.to_thread.run_sync(compress, body, encoding)
+
+
+def compressible(content_type: str, size: int) -> bool:
+    return size >= COMPRESSION_MIN_SIZE and not content_type.startswith(_SKIPPED_CONTENT_TYPES)
+
+
+def _vary(vary: Optional[bytes]) -> bytes:
+    if not vary:
+        return b"Accept-Encoding"
+    if b"accept-encoding" in vary.lower():
+        return vary
+    return vary + b", Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing response bodies with the negotiated
+    encoding. Responses that already carry a Content-Encoding (cached bodies),
+    are below the size threshold, or have an excluded content type are passed
+    through. The body is buffered, which suits the API's single-message responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or ())
+        encoding = negotiate(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        chunks = []
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            response_headers = list(start_message.get("headers", []))
+            lowered = {k.lower(): v for k, v in response_headers}
+            content_type = lowered.get(b"content-type", b"").decode("latin-1")
+            if b"content-encoding" not in lowered and compressible(content_type, len(body)):
+                body = await compress_async(body, encoding)
+                response_headers = [(k, v) for k, v in response_headers if k.lower() not in (b"content-length", b"vary")]
+                response_headers += [
+                    (b"content-encoding", encoding.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"vary", _vary(lowered.get(b"vary"))),
+                ]
+            await send({**start_message, "headers": response_headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -44,3 +44,8 @@ class GameNotInitializedError(GameException):
 class InvalidActionError(GameException):
     """Raised when action is invalid or not allowed"""
     pass
+
+
+class GameBusyError(GameException):
+    """Raised when a game operation conflicts with one already running (turn advance)"""
+    pass
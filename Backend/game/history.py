@@ -0,0 +1,235 @@
+"""
+Undo/redo of tile actions within the current turn.
+
+Versions share tile data copy-on-write: tiles are grouped in chunks of
+HISTORY_CHUNK_SIZE ids and a version only holds the chunks that changed since
+the start of the turn. Other chunks come from a shared base, loaded from the
+database the first time an action touches them. Memory therefore grows with
+the number of changed tiles, not with the map size.
+
+Undoing an action also removes its entry from the action log (redo appends it
+again), so replays stay consistent. History is dropped when the turn advances
+or the game is replaced.
+"""
+from dataclasses import dataclass, replace
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import GameAction, GameState, Player, Tile
+from game.active import active_tiles
+from game.journal import record_action
+from monitoring.log import get_logger
+
+log = get_logger(__name__)
+
+# Tiles per copy-on-write chunk
+HISTORY_CHUNK_SIZE = 64
+# Maximum number of actions that can be undone
+MAX_UNDO_DEPTH = 20
+
+# Tile columns an action can change during a turn (weather only changes at next step)
+_MUTABLE_COLUMNS = (
+    "type", "owner", "tile_state", "has_water_reserve", "has_firebreak",
+    "last_irrigated_step", "irrigated_this_step", "exploited",
+)
+
+# Writes back the _MUTABLE_COLUMNS of one tile (restored tiles get a new version)
+_RESTORE_TILE = (Tile.__table__.update()
+                 .where(Tile.__table__.c.id == bindparam("tile_id"))
+                 .values(version_id=Tile.__table__.c.version_id + 1,
+                         **{name: bindparam(f"new_{name}") for name in _MUTABLE_COLUMNS}))
+
+# Rows (id, *_MUTABLE_COLUMNS) of one chunk, ordered by id
+Chunk = Tuple[tuple, ...]
+# (action, tile_id, payload) as passed to record_action
+ActionRecord = Tuple[str, Optional[int], dict]
+
+
+@dataclass(frozen=True)
+class Version:
+    """Game state after one action of the current turn"""
+    chunks: Dict[int, Chunk]  # Chunks changed since the start of the turn
+    player: Tuple[int, int, int]  # shovels, drops, score
+    action: Optional[ActionRecord]  # Action that produced this version (None for the turn start)
+    action_id: int  # GameAction id of that action (last logged id for the turn start)
+
+
+def _chunk_index(tile_id: int) -> int:
+    return (tile_id - 1) // HISTORY_CHUNK_SIZE
+
+
+def _load_chunk(db: Session, index: int) -> Chunk:
+    first_id = index * HISTORY_CHUNK_SIZE + 1
+    columns = [getattr(Tile, name) for name in _MUTABLE_COLUMNS]
+    rows = db.connection().execute(
+        select(Tile.id, *columns)
+        .where(Tile.id >= first_id, Tile.id < first_id + HISTORY_CHUNK_SIZE)
+        .order_by(Tile.id)
+    ).all()
+    return tuple(tuple(row) for row in rows)
+
+
+def _player_values(db: Session) -> Tuple[int, int, int]:
+    player = db.query(Player).first()
+    return (player.shovels, player.drops, player.score) if player else (0, 0, 0)
+
+
+class UndoHistory:
+    """Bounded list of versions for the current turn, with a cursor for undo/redo"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, key: Optional[tuple] = None) -> None:
+        self.key = key
+        self.base: Dict[int, Chunk] = {}
+        self.versions: List[Version] = []
+        self.position = -1
+
+    @property
+    def undo_available(self) -> int:
+        return max(self.position, 0)
+
+    @property
+    def redo_available(self) -> int:
+        return len(self.versions) - 1 - self.position if self.versions else 0
+
+    def _sync(self, db: Session) -> Version:
+        """Start a fresh history if the turn, the game or the log changed behind our back"""
+        game_state = db.query(GameState).first()
+        key = (game_state.id, game_state.seed, game_state.current_step) if game_state else None
+        last_action_id = db.query(func.max(GameAction.id)).scalar() or 0
+
+        current = self.versions[self.position] if self.versions else None
+        if key != self.key or current is None or current.action_id != last_action_id:
+            self.reset(key)
+            current = Version({}, _player_values(db), None, last_action_id)
+            self.versions.append(current)
+            self.position = 0
+        return current
+
+    def _chunk(self, version: Version, index: int) -> Chunk:
+        chunk = version.chunks.get(index)
+        return chunk if chunk is not None else self.base[index]
+
+    def capture(self, db: Session, tile_ids: Iterable[int]) -> None:
+        """Load the chunks of tiles about to be modified (call before the action)"""
+        current = self._sync(db)
+        for index in {_chunk_index(tile_id) for tile_id in tile_ids}:
+            if index not in current.chunks and index not in self.base:
+                self.base[index] = _load_chunk(db, index)
+
+    def push(self, db: Session, action: ActionRecord, action_id: int) -> None:
+        """Add the version produced by a successful, flushed action"""
+        current = self.versions[self.position]
+        chunks = dict(current.chunks)
+        tile_id = action[1]
+        if tile_id is not None:
+            chunks[_chunk_index(tile_id)] = _load_chunk(db, _chunk_index(tile_id))
+
+        self.versions = self.versions[:self.position + 1]
+        self.versions.append(Version(chunks, _player_values(db), action, action_id))
+        if len(self.versions) > MAX_UNDO_DEPTH + 1:
+            del self.versions[:len(self.versions) - MAX_UNDO_DEPTH - 1]
+        self.position = len(self.versions) - 1
+
+    def _apply(self, db: Session, current: Version, target: Version) -> int:
+        """Write the tiles and player of `target` where they differ from `current`"""
+        changed = []
+        for index in set(current.chunks) | set(target.chunks):
+            old, new = self._chunk(current, index), self._chunk(target, index)
+            if old is new:
+                continue
+            changed.extend(
+                {"tile_id": row[0], **{f"new_{name}": value for name, value in zip(_MUTABLE_COLUMNS, row[1:])}}
+                for old_row, row in zip(old, new) if old_row != row
+            )
+        if changed:
+            # Core executemany: the ORM bulk update would require each row's version_id
+            db.connection().execute(_RESTORE_TILE, changed)
+            restored = {row["tile_id"] for row in changed}
+            for obj in list(db.identity_map.values()):
+                if isinstance(obj, Tile) and obj.id in restored:
+                    db.expire(obj)  # Stale version otherwise
+            active_tiles.invalidate()
+
+        player = db.query(Player).first()
+        player.shovels, player.drops, player.score = target.player
+        return len(changed)
+
+    def undo(self, db: Session) -> dict:
+        """
+        Revert the last action of the turn.
+
+        Raises:
+            ValueError: If there is nothing to undo
+        """
+        current = self._sync(db)
+        if self.position == 0:
+            raise ValueError("Nothing to undo")
+
+        target = self.versions[self.position - 1]
+        tiles = self._apply(db, current, target)
+        db.query(GameAction).filter(GameAction.id == current.action_id).delete()
+        self.position -= 1
+
+        action, tile_id, _ = current.action
+        log.info("↩️ Action undone", action=action, tile_id=tile_id, tiles_restored=tiles)
+        return self._result("undone", current.action, target)
+
+    def redo(self, db: Session) -> dict:
+        """
+        Re-apply the last undone action.
+
+        Raises:
+            ValueError: If there is nothing to redo
+        """
+        current = self._sync(db)
+        if self.position >= len(self.versions) - 1:
+            raise ValueError("Nothing to redo")
+
+        target = self.versions[self.position + 1]
+        self._apply(db, current, target)
+        action, tile_id, payload = target.action
+        entry = record_action(db, action, tile_id, **payload)
+        db.flush()
+        self.versions[self.position + 1] = replace(target, action_id=entry.id)
+        self.position += 1
+
+        log.info("↪️ Action redone", action=action, tile_id=tile_id)
+        return self._result("redone", target.action, target)
+
+    def _result(self, key: str, action: ActionRecord, version: Version) -> dict:
+        name, tile_id, payload = action
+        shovels, drops, score = version.player
+        return {
+            "success": True,
+            key: {"action": name, "tile_id": tile_id, **payload},
+            "player_resources": {"shovels": shovels, "drops": drops, "score": score},
+            "undo_available": self.undo_available,
+            "redo_available": self.redo_available,
+        }
+
+
+# History of the (singleton) game served by this process
+undo_history = UndoHistory()
+
+
+def reset_undo_history() -> None:
+    """Drop undo/redo history (called when the tiles are replaced)"""
+    undo_history.reset()
+
+
+def record_undoable(db: Session, action: str, tile_id: Optional[int] = None, **payload) -> None:
+    """
+    Log a successful tile action and push it on the undo history.
+    The tile must have been passed to undo_history.capture() before the action ran.
+    """
+    entry = record_action(db, action, tile_id, **payload)
+    db.flush()
+    undo_history.push(db, (action, tile_id, payload), entry.id)
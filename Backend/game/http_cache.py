@@ -0,0 +1,148 @@
+"""
+Conditional GET and response caching for the polled read endpoints.
+
+/get_map and /game/state only change when the game revision does (see
+game.revision). Their responses carry an ETag and a Last-Modified header
+derived from the revision; a request whose If-None-Match (or
+If-Modified-Since) matches gets a 304 answered from memory, and serialized
+bodies are kept per URL for the current revision so repeated polls skip the
+database and the encoder. Compressed variants (see game.compression) are
+cached next to each body, so the current map is compressed once per encoding.
+"""
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Optional, Tuple
+import threading
+
+from game.compression import compress_async, compressible, negotiate
+from game.revision import revision_tracker
+from monitoring.metrics import record_cache
+
+# Serialized bodies kept for the current revision (one per distinct URL)
+RESPONSE_CACHE_SIZE = 32
+
+
+class CachedBody:
+    """Serialized body of one URL, with its compressed variants by encoding"""
+
+    def __init__(self, body: bytes, media_type: str):
+        self.body = body
+        self.media_type = media_type
+        self.encoded: Dict[str, bytes] = {}
+
+    async def encode(self, encoding: Optional[str]) -> bytes:
+        """Body in `encoding` (None = identity), compressed on first use"""
+        if encoding is None:
+            return self.body
+        data = self.encoded.get(encoding)
+        record_cache("http_compressed", data is not None)
+        if data is None:
+            data = self.encoded[encoding] = await compress_async(self.body, encoding)
+        return data
+
+
+class ResponseCache:
+    """Rendered responses of the current revision, keyed by path and query"""
+
+    def __init__(self, size: int = RESPONSE_CACHE_SIZE):
+        self.size = size
+        self._revision: Optional[int] = None
+        self._entries: "OrderedDict[Tuple[str, str], CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, revision: int, key: Tuple[str, str]) -> Optional[CachedBody]:
+        with self._lock:
+            if revision != self._revision:
+                return None
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, revision: int, key: Tuple[str, str], entry: CachedBody) -> None:
+        with self._lock:
+            if revision != self._revision:
+                self._entries.clear()
+                self._revision = revision
+            self._entries[key] = entry
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revision = None
+
+
+response_cache = ResponseCache()
+
+
+def etag(revision: int, encoding: Optional[str] = None) -> str:
+    """Entity tag of a revision; each content encoding is a distinct representation"""
+    return f'"r{revision}-{encoding}"' if encoding else f'"r{revision}"'
+
+
+def _not_modified(request: Request, revision: int, modified_at: float) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110, 13.2.2)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Any representation of the current revision is still valid
+        tags = {tag.strip().removeprefix("W/").strip('"').split("-")[0] for tag in if_none_match.split(",")}
+        return "*" in tags or f"r{revision}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= modified_at
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def cached_response(request: Request, db: Session, build: Callable[[], Response]) -> Response:
+    """
+    Serve `build()` with revision validators: 304 when the client's copy is
+    current, the cached body of this URL when there is one, otherwise build,
+    cache and return it. Without a game (no revision) `build()` is returned as is.
+
+    Args:
+        request: Incoming request (URL and conditional headers)
+        db: Database session, only queried the first time the revision is needed
+        build: Renders the full response; only 200 responses are cached
+    """
+    revision, modified_at = revision_tracker.current(db)
+    if revision is None:
+        return build()
+
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    headers: Dict[str, str] = {
+        "ETag": etag(revision, encoding),
+        "Last-Modified": formatdate(modified_at, usegmt=True),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if _not_modified(request, revision, modified_at):
+        record_cache("http_not_modified", True)
+        return Response(status_code=304, headers=headers)
+    record_cache("http_not_modified", False)
+
+    key = (request.url.path, request.url.query)
+    entry = response_cache.get(revision, key)
+    record_cache("http_body", entry is not None)
+    if entry is None:
+        response = build()
+        if response.status_code != 200:
+            return response
+        entry = CachedBody(response.body, response.media_type)
+        # Only cached when no commit happened while building (the body would be newer than the ETag)
+        if revision_tracker.current(db)[0] == revision:
+            response_cache.put(revision, key, entry)
+
+    if encoding is not None and compressible(entry.media_type, len(entry.body)):
+        headers["Content-Encoding"] = encoding
+    else:
+        headers["ETag"] = etag(revision)
+        encoding = None
+    return Response(content=await entry.encode(encoding), media_type=entry.media_type, headers=headers)
@@ -0,0 +1,67 @@
+"""
+Append-only action log.
+
+Every state-changing action is stored as a GameAction row. Together with
+GameState.seed (which reproduces the generated map) the log is enough to
+rebuild any game state by replaying it, see game.replay.
+"""
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import GameAction, GameState
+
+
+# Actions that can be recorded and replayed
+ACTIONS = (
+    "buy", "plant", "irrigate", "harvest", "build_water_reserve",
+    "build_firebreak", "set_forest_exploitation", "next_step",
+)
+
+
+def record_action(db: Session, action: str, tile_id: Optional[int] = None,
+                  step: Optional[int] = None, **payload) -> GameAction:
+    """
+    Append an action to the log (committed with the caller's transaction).
+
+    Args:
+        db: Database session
+        action: One of ACTIONS
+        tile_id: Target tile, None for turn actions
+        step: Step the action was taken at (defaults to the current step)
+        **payload: Extra arguments needed to replay the action (crop_type, mode)
+
+    Returns:
+        The pending GameAction row
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action '{action}'")
+    if step is None:
+        game_state = db.query(GameState).first()
+        step = game_state.current_step if game_state else 0
+
+    entry = GameAction(
+        step=step,
+        action=action,
+        tile_id=tile_id,
+        payload=json.dumps(payload, sort_keys=True) if payload else None,
+    )
+    db.add(entry)
+    return entry
+
+
+def get_action_log(db: Session, after_id: int = 0) -> List[GameAction]:
+    """Return logged actions in the order they were applied, optionally after a given id"""
+    return (db.query(GameAction)
+            .filter(GameAction.id > after_id)
+            .order_by(GameAction.id)
+            .all())
+
+
+def action_payload(entry: GameAction) -> dict:
+    """Decode the JSON payload of a logged action"""
+    return json.loads(entry.payload) if entry.payload else {}
@@ -0,0 +1,106 @@
+"""
+Per-game locks between the turn advance and tile actions.
+
+Advancing a turn reads and rewrites the whole game, so it runs alone on its
+game, like starting a new game over it or replaying it: a second one, or a
+tile action arriving meanwhile, is refused with GameBusyError (409) instead
+of interleaving with it. Tile actions only share
+the game among themselves; races between two of them on the same rows (a
+double-clicked buy) are caught by the optimistic version checks of Player
+and Tile (version_id, see database.models). Each game has its own lock, and
+reads never take it.
+
+Locks are in-process, like the rest of the game's runtime state: the backend
+runs as a single worker.
+"""
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import threading
+
+from game.exceptions import GameBusyError
+
+# Longest wait of a turn for the tile actions still running (seconds)
+ACTION_DRAIN_SECONDS = 10.0
+# Key of the lock taken while creating a game when none exists yet
+NEW_GAME = 0
+
+
+class _GameLock:
+    """Shared (tile actions) / exclusive (turn) state of one game"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.actions = 0
+        self.turn = False
+        self.owner: Optional[int] = None  # Thread holding the turn
+
+
+class GameLocks:
+    """One lock per game id, created on first use"""
+
+    def __init__(self):
+        self._locks: Dict[int, _GameLock] = {}
+        self._guard = threading.Lock()
+
+    def _get(self, game_id: int) -> _GameLock:
+        with self._guard:
+            lock = self._locks.get(game_id)
+            if lock is None:
+                lock = self._locks[game_id] = _GameLock()
+            return lock
+
+    @contextmanager
+    def action(self, game_id: int) -> Iterator[None]:
+        """
+        Run a tile action on `game_id`, alongside other actions.
+
+        Raises:
+            GameBusyError: If the game's turn is being advanced
+        """
+        lock = self._get(game_id)
+        with lock.condition:
+            if lock.turn:
+                raise GameBusyError(f"Game {game_id} is advancing to the next step, retry the action")
+            lock.actions += 1
+        try:
+            yield
+        finally:
+            with lock.condition:
+                lock.actions -= 1
+                lock.condition.notify_all()
+
+    @contextmanager
+    def turn(self, game_id: int, timeout: float = ACTION_DRAIN_SECONDS) -> Iterator[None]:
+        """
+        Hold `game_id` alone (turn advance, new game, replay): new actions are
+        refused at once, running ones are waited for (up to `timeout` seconds).
+        Re-entrant for the holding thread, so a replay can advance turns.
+
+        Raises:
+            GameBusyError: If the game is already held or actions do not finish in time
+        """
+        lock = self._get(game_id)
+        thread = threading.get_ident()
+        with lock.condition:
+            if lock.turn and lock.owner == thread:
+                nested = True
+            elif lock.turn:
+                raise GameBusyError(f"Game {game_id} is busy with a turn, a new game or a replay, retry")
+            else:
+                nested = False
+                lock.turn, lock.owner = True, thread
+                if not lock.condition.wait_for(lambda: lock.actions == 0, timeout=timeout):
+                    lock.turn, lock.owner = False, None
+                    raise GameBusyError(f"Game {game_id} has tile actions still running, retry the step")
+        if nested:
+            yield
+            return
+        try:
+            yield
+        finally:
+            with lock.condition:
+                lock.turn, lock.owner = False, None
+                lock.condition.notify_all()
+
+
+game_locks = GameLocks()
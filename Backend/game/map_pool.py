@@ -0,0 +1,135 @@
+"""
+Pool of pre-generated maps for instant game starts.
+
+Synthetic islands depend on a random seed, so a few (seed, map) pairs per grid
+size are generated ahead of time in a process pool. initialize_game() pops a
+ready map when it was not asked for a specific seed, and every pop schedules
+a refill in the background. Zone maps do not depend on the seed and come from
+the get_map.zones cache instead.
+
+Configured through FARMIT_MAP_POOL_DEPTH (maps kept per grid size, 0 disables
+the pool) and FARMIT_MAP_POOL_WORKERS.
+"""
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Optional, Tuple
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+
+import numpy as np
+
+from get_map.get_map import get_map
+from monitoring.log import get_logger
+from monitoring.metrics import MAP_POOL_DEPTH, MAP_POOL_REFILL, record_cache
+
+log = get_logger(__name__)
+
+MAP_POOL_DEPTH_DEFAULT = int(os.getenv("FARMIT_MAP_POOL_DEPTH", "2"))
+MAP_POOL_WORKERS = int(os.getenv("FARMIT_MAP_POOL_WORKERS", "1"))
+
+GridSize = Tuple[int, int]
+
+
+def _generate(grid_size: GridSize, seed: int) -> np.ndarray:
+    """Worker entry point: the map initialize_game() would build for this seed"""
+    return get_map(grid_size=grid_size, seed=seed)
+
+
+class MapPool:
+    """
+    Bounded pool of (seed, map) pairs per grid size, refilled by worker processes.
+
+    Args:
+        depth: Maps kept ready per grid size (0 disables the pool)
+        workers: Worker processes generating maps
+    """
+
+    def __init__(self, depth: int = MAP_POOL_DEPTH_DEFAULT, workers: int = MAP_POOL_WORKERS):
+        self.depth = depth
+        self.workers = workers
+        self._ready: Dict[GridSize, Deque[Tuple[int, np.ndarray]]] = {}
+        self._pending: Dict[GridSize, int] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self, grid_sizes: Iterable[GridSize] = ((50, 50),)) -> None:
+        """Start the workers and fill the pool for `grid_sizes`"""
+        if self.depth <= 0 or self.running:
+            return
+        # Spawned, not forked: the server has live threads (logging, thread pool,
+        # locks) and an open database engine that a forked child would inherit
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        for grid_size in grid_sizes:
+            self._refill(tuple(grid_size))
+        log.info("🗺️ Map pool started", depth=self.depth, workers=self.workers)
+
+    def shutdown(self) -> None:
+        """Stop the workers and drop ready maps"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._ready.clear()
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def pop(self, grid_size: GridSize) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Take a ready (seed, map) pair, None when the pool is empty or stopped.
+        Schedules a refill either way, so the next start finds a map.
+        """
+        if not self.running:
+            return None
+        grid_size = tuple(grid_size)
+        with self._lock:
+            ready = self._ready.get(grid_size)
+            entry = ready.popleft() if ready else None
+            MAP_POOL_DEPTH.set(len(ready) if ready else 0, grid=_label(grid_size))
+        record_cache("map_pool", entry is not None)
+        self._refill(grid_size)
+        return entry
+
+    def ready_count(self, grid_size: GridSize) -> int:
+        with self._lock:
+            return len(self._ready.get(tuple(grid_size), ()))
+
+    def _refill(self, grid_size: GridSize) -> None:
+        with self._lock:
+            if self._executor is None:
+                return
+            missing = self.depth - len(self._ready.get(grid_size, ())) - self._pending.get(grid_size, 0)
+            for _ in range(max(missing, 0)):
+                seed = secrets.randbelow(2 ** 31)
+                future = self._executor.submit(_generate, grid_size, seed)
+                self._pending[grid_size] = self._pending.get(grid_size, 0) + 1
+                submitted = time.perf_counter()
+                future.add_done_callback(
+                    lambda f, seed=seed, submitted=submitted: self._on_ready(grid_size, seed, submitted, f))
+
+    def _on_ready(self, grid_size: GridSize, seed: int, submitted: float, future: Future) -> None:
+        with self._lock:
+            if self._executor is None:
+                return
+            self._pending[grid_size] -= 1
+            if future.cancelled() or future.exception() is not None:
+                log.warning("⚠️ Map pool generation failed", grid=_label(grid_size),
+                            error=str(None if future.cancelled() else future.exception()))
+                return
+            ready = self._ready.setdefault(grid_size, deque())
+            ready.append((seed, future.result()))
+            MAP_POOL_DEPTH.set(len(ready), grid=_label(grid_size))
+        MAP_POOL_REFILL.observe(time.perf_counter() - submitted, grid=_label(grid_size))
+
+
+def _label(grid_size: GridSize) -> str:
+    return f"{grid_size[0]}x{grid_size[1]}"
+
+
+map_pool = MapPool()
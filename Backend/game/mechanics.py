@@ -4,8 +4,9 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from database.models import Tile, Player
-from game.adjacency import count_adjacent_conserved_forests, get_tiles_adjacent_to_water_reserves
+from database.models import GameState, Tile, Player
+from game.active import active_tiles, track_tile
+from game.adjacency import count_adjacent_conserved_forests, get_neighbors
 
 
 # Humidity thresholds for crop death by zone
@@ -16,6 +17,16 @@ HUMIDITY_THRESHOLDS = {
     4: 0.18,  # Temperate zone
 }
 
+# Harvest rewards
+HARVEST_BASE_SCORE = 10
+HARVEST_SHOVEL_REWARD = 1
+FERTILIZER_BONUS_PER_FOREST = 5
+
+# Resources generated every step (from INITAL.md specifications)
+SHOVELS_PER_STEP = 1
+DROPS_PER_STEP = 1
+SCORE_PER_STEP = 10
+
 
 def advance_crop_state(tile: Tile, db: Session) -> None:
     """
@@ -58,6 +69,7 @@ def check_crop_death(tile: Tile, current_step: int, db: Session) -> bool:
         # Crop dies
         tile.tile_state = None
         tile.type = "empty"
+        track_tile(db, tile)
         return True
 
     return False
@@ -83,13 +95,43 @@ def harvest_tile(tile: Tile, player: Player, db: Session) -> dict:
             "message": "Tile is not ready for harvest"
         }
 
-    # Calculate rewards
-    base_score = 10
-    shovel_reward = 1
-
     # Check for fertilizer bonus from adjacent conserved forests
-    adjacent_forests = count_adjacent_conserved_forests(tile, db)
-    fertilizer_bonus = adjacent_forests * 5
+    # (skips the neighbor queries when the map has no forest at all)
+    if active_tiles.ensure(db).forests:
+        adjacent_forests = count_adjacent_conserved_forests(tile, db)
+    else:
+        adjacent_forests = 0
+
+    result = apply_harvest(tile, player, adjacent_forests)
+    if result["success"]:
+        track_tile(db, tile)
+    return result
+
+
+def apply_harvest(tile: Tile, player: Player, adjacent_forests: int) -> dict:
+    """
+    Apply the harvest rules to a loaded tile, given its number of adjacent
+    conserved forests. Shared with the headless simulation.
+
+    Args:
+        tile: Tile to harvest (ORM or in-memory tile)
+        player: Player object
+        adjacent_forests: Number of adjacent conserved forests
+
+    Returns:
+        dict with rewards and status
+    """
+    # Validate tile state
+    if tile.tile_state != "harvest":
+        return {
+            "success": False,
+            "message": "Tile is not ready for harvest"
+        }
+
+    # Calculate rewards
+    base_score = HARVEST_BASE_SCORE
+    shovel_reward = HARVEST_SHOVEL_REWARD
+    fertilizer_bonus = adjacent_forests * FERTILIZER_BONUS_PER_FOREST
 
     total_score = base_score + fertilizer_bonus
 
@@ -114,14 +156,15 @@ def harvest_tile(tile: Tile, player: Player, db: Session) -> dict:
 def reset_irrigation_flags(db: Session) -> None:
     """
     Reset irrigated_this_step flag for all tiles.
-    Called at the start of each turn.
+    Called at the start of each turn. Only owned and planted tiles can have been
+    irrigated (manually or by a water reserve), so only those are updated.
 
     Args:
         db: Database session
     """
-    tiles = db.query(Tile).all()
-    for tile in tiles:
-        tile.irrigated_this_step = False
+    active = active_tiles.ensure(db)
+    active.update_flags(db, active.owned.keys() | active.planted.keys(),
+                        {Tile.irrigated_this_step: False})
 
 
 def irrigate_tile(tile: Tile, player: Player, current_step: int, db: Session) -> dict:
@@ -182,16 +225,53 @@ def apply_water_reserve_auto_irrigation(db: Session, current_step: int) -> int:
     Returns:
         Number of tiles auto-irrigated
     """
-    # Get tiles adjacent to water reserves
-    adjacent_tiles = get_tiles_adjacent_to_water_reserves(db)
+    # Only planted tiles can be auto-irrigated: keep those next to a reserve
+    active = active_tiles.ensure(db)
+    if not active.reserves or not active.planted:
+        return 0
+
+    game_state = db.query(GameState).first()
+    reserve_positions = set(active.reserves.values())
+    candidates = [
+        tile_id for tile_id, (i, j) in active.planted.items()
+        if any(n in reserve_positions for n in get_neighbors(i, j, game_state.map_rows, game_state.map_cols))
+    ]
 
     auto_irrigated_count = 0
 
-    for tile in adjacent_tiles:
-        # Only irrigate fields with crops
-        if tile.type == "field" and tile.tile_state in ["seed", "growing", "harvest"]:
-            tile.irrigated_this_step = True
-            tile.last_irrigated_step = current_step
+    for tile in active.load(db, candidates):
+        if auto_irrigate_tile(tile, current_step):
             auto_irrigated_count += 1
 
     return auto_irrigated_count
+
+
+def auto_irrigate_tile(tile: Tile, current_step: int) -> bool:
+    """
+    Irrigate a tile next to a water reserve, if it holds a crop.
+
+    Args:
+        tile: Tile adjacent to a water reserve
+        current_step: Current game step
+
+    Returns:
+        True if the tile was irrigated
+    """
+    # Only irrigate fields with crops
+    if tile.type == "field" and tile.tile_state in ["seed", "growing", "harvest"]:
+        tile.irrigated_this_step = True
+        tile.last_irrigated_step = current_step
+        return True
+    return False
+
+
+def apply_turn_income(player: Player) -> None:
+    """
+    Generate the per-step resources: +1 shovel, +1 drop, +10 score.
+
+    Args:
+        player: Player object
+    """
+    player.shovels += SHOVELS_PER_STEP
+    player.drops += DROPS_PER_STEP
+    player.score += SCORE_PER_STEP
@@ -0,0 +1,76 @@
+"""
+Background prefetch of the next turn's weather.
+
+As soon as a step completes, the weather field of the following step is
+computed (and fetched when needed) on a background thread, so
+load_next_step_data() usually finds it ready. Starting a new game cancels the
+pending prefetch; a missing or failed prefetch falls back to a synchronous
+load.
+"""
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Optional
+import threading
+
+import numpy as np
+
+from monitoring.log import get_logger
+from monitoring.metrics import record_cache
+
+log = get_logger(__name__)
+
+# Longest wait for a prefetch still running when the turn needs it (seconds)
+PREFETCH_WAIT_SECONDS = 30.0
+
+
+class WeatherPrefetcher:
+    """Single background worker holding at most one prefetched field, identified by a key"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="weather-prefetch")
+        self._key: Optional[Hashable] = None
+        self._future: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    def schedule(self, key: Hashable, compute: Callable[[], np.ndarray]) -> None:
+        """Start computing the field of `key`, replacing (and cancelling) any previous prefetch"""
+        with self._lock:
+            if self._key == key and self._future is not None:
+                return
+            self._cancel_locked()
+            self._key = key
+            self._future = self._executor.submit(compute)
+        log.debug("🌦️ Weather prefetch scheduled", key=str(key))
+
+    def take(self, key: Hashable) -> Optional[np.ndarray]:
+        """
+        Return the prefetched field of `key` (waiting for it when still running),
+        or None on a miss or failure so the caller loads it synchronously.
+        """
+        with self._lock:
+            future = self._future if self._key == key else None
+            if future is not None:
+                self._key = self._future = None
+        field = None
+        if future is not None:
+            try:
+                field = future.result(timeout=PREFETCH_WAIT_SECONDS)
+            except CancelledError:
+                pass
+            except Exception as e:
+                log.warning("⚠️ Weather prefetch failed, loading synchronously", error=str(e))
+        record_cache("weather_prefetch", field is not None)
+        return field
+
+    def cancel(self) -> None:
+        """Drop the pending prefetch (called when a game is replaced)"""
+        with self._lock:
+            self._cancel_locked()
+
+    def _cancel_locked(self) -> None:
+        # A prefetch already running finishes in the background; its result is discarded
+        if self._future is not None:
+            self._future.cancel()
+        self._key = self._future = None
+
+
+weather_prefetch = WeatherPrefetcher()
@@ -0,0 +1,200 @@
+"""
+Rebuild a game from its seed and action log.
+
+initialize_game() with the stored seed regenerates the exact same map, and
+re-applying the logged actions in order through the regular game functions
+reproduces every later state, so a game only needs (seed, actions) to be stored.
+When periodic snapshots exist (game.snapshots) only the actions logged after
+the latest one are replayed.
+
+A rebuild runs in a single transaction, committed once every action applied:
+a log that diverges rolls it back, leaving the game and its log untouched.
+"""
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import GameAction, GameSnapshot, GameState, Player, Tile
+from game.active import active_tiles
+from game.actions import buy_tile, plant_crop, build_water_reserve, build_firebreak, set_forest_exploitation
+from game.history import reset_undo_history
+from game.journal import action_payload, get_action_log, record_action
+from game.locks import game_locks
+from game.revision import bump_revision
+from game.mechanics import irrigate_tile, harvest_tile
+from game.snapshots import latest_snapshot, restore_snapshot
+from game.state import initialize_game, advance_to_next_step, invalidate_map_cache
+from monitoring.log import get_logger
+
+log = get_logger(__name__)
+
+# (action, tile_id, payload) as stored in the log
+LoggedAction = Tuple[str, Optional[int], Dict]
+
+
+def apply_action(db: Session, action: str, tile_id: Optional[int] = None, **payload) -> dict:
+    """
+    Apply one logged action through the same functions the API uses and
+    record it in the log when it succeeds. Does not commit.
+
+    Returns:
+        The action result dict
+    """
+    if action == "next_step":
+        return advance_to_next_step(db, commit=False)  # records itself
+
+    player = db.query(Player).first()
+    game_state = db.query(GameState).first()
+    if not player or not game_state:
+        return {"success": False, "message": "Game not initialized"}
+
+    if action == "buy":
+        result = buy_tile(tile_id, player, db)
+    elif action == "plant":
+        result = plant_crop(tile_id, player, payload["crop_type"], db)
+    elif action == "build_water_reserve":
+        result = build_water_reserve(tile_id, player, db)
+    elif action == "build_firebreak":
+        result = build_firebreak(tile_id, player, db)
+    elif action == "set_forest_exploitation":
+        result = set_forest_exploitation(tile_id, player, payload["mode"], db)
+    elif action in ("irrigate", "harvest"):
+        tile = db.query(Tile).filter(Tile.id == tile_id).first()
+        if not tile:
+            return {"success": False, "message": f"Tile {tile_id} not found"}
+        if action == "irrigate":
+            result = irrigate_tile(tile, player, game_state.current_step, db)
+        else:
+            result = harvest_tile(tile, player, db)
+    else:
+        raise ValueError(f"Unknown action '{action}'")
+
+    if result["success"]:
+        record_action(db, action, tile_id, step=game_state.current_step, **payload)
+    return result
+
+
+def export_game(db: Session) -> dict:
+    """
+    Return the minimal description of the current game: seed, map size and action log.
+
+    Raises:
+        ValueError: If no game is initialized
+    """
+    game_state = db.query(GameState).first()
+    if not game_state:
+        raise ValueError("Game not initialized")
+    return {
+        "seed": game_state.seed,
+        "zone": game_state.zone,
+        "grid_size": [game_state.map_rows, game_state.map_cols],
+        "actions": [
+            {"step": entry.step, "action": entry.action, "tile_id": entry.tile_id, **action_payload(entry)}
+            for entry in get_action_log(db)
+        ],
+    }
+
+
+def replay_game(db: Session, seed: int, grid_size: Tuple[int, int],
+                actions: Iterable[LoggedAction], zone: Optional[str] = None) -> int:
+    """
+    Start a new game from `seed` (and `zone`) and re-apply `actions` in order,
+    committing once at the end. On any error the transaction is rolled back,
+    so the previous game is kept.
+
+    Raises:
+        RuntimeError: If a logged action is rejected (the log does not match the seed)
+
+    Returns:
+        Number of actions replayed
+    """
+    actions = list(actions)  # Read before initialize_game() clears the log
+    try:
+        initialize_game(db, grid_size=grid_size, seed=seed, zone=zone, commit=False)
+        count = _apply_all(db, actions)
+        bump_revision(db)
+        db.commit()
+    except Exception:
+        _abort(db)
+        raise
+    return count
+
+
+def _apply_all(db: Session, actions: Iterable[LoggedAction]) -> int:
+    count = 0
+    for action, tile_id, payload in actions:
+        result = apply_action(db, action, tile_id, **payload)
+        if not result.get("success", False):
+            raise RuntimeError(f"Replay diverged at action #{count + 1} ({action} on tile {tile_id}): "
+                               f"{result.get('message')}")
+        count += 1
+    return count
+
+
+def _abort(db: Session) -> None:
+    """Roll back a rebuild and drop the in-memory state built from the replayed game"""
+    db.rollback()
+    invalidate_map_cache()
+    reset_undo_history()
+    active_tiles.invalidate()
+
+
+def rebuild_game(db: Session) -> int:
+    """
+    Rebuild the current game from its latest snapshot and the actions logged
+    after it, or from its seed and full action log when no snapshot exists yet.
+
+    The game's turn lock is held for the whole rebuild, so no turn or tile
+    action runs on the rows being replaced.
+
+    Raises:
+        ValueError: If no game is initialized or it has neither snapshot nor seed
+        GameBusyError: If the game is advancing or being replaced
+
+    Returns:
+        Number of actions replayed
+    """
+    game_id = db.query(GameState.id).scalar()
+    if game_id is None:
+        raise ValueError("Game cannot be replayed: no snapshot or seed recorded")
+    with game_locks.turn(game_id):
+        try:
+            return _rebuild(db)
+        except Exception:
+            _abort(db)
+            raise
+
+
+def _rebuild(db: Session) -> int:
+    """Body of rebuild_game(), run under the game's turn lock"""
+    snapshot = latest_snapshot(db)
+    if snapshot is not None:
+        tail = get_action_log(db, after_id=snapshot.action_id)
+        actions: List[LoggedAction] = [(entry.action, entry.tile_id, action_payload(entry)) for entry in tail]
+
+        # The tail is re-recorded as it is replayed. Deletes, restore and replay
+        # share one transaction, committed below or rolled back by rebuild_game()
+        db.query(GameAction).filter(GameAction.id > snapshot.action_id).delete()
+        db.query(GameSnapshot).filter(GameSnapshot.id > snapshot.id).delete(synchronize_session=False)
+        restore_snapshot(db, snapshot)
+
+        count = _apply_all(db, actions)
+        bump_revision(db)
+        db.commit()
+        log.info("🔁 Game rebuilt from snapshot", snapshot_step=snapshot.step, actions=count)
+        return count
+
+    game_state = db.query(GameState).first()
+    if not game_state or game_state.seed is None:
+        raise ValueError("Game cannot be replayed: no snapshot or seed recorded")
+
+    seed = game_state.seed
+    grid_size = (game_state.map_rows, game_state.map_cols)
+    actions = [(entry.action, entry.tile_id, action_payload(entry)) for entry in get_action_log(db)]
+
+    count = replay_game(db, seed, grid_size, actions, zone=game_state.zone)
+    log.info("🔁 Game rebuilt from action log", seed=seed, actions=count)
+    return count
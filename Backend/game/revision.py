@@ -0,0 +1,98 @@
+"""
+Game revision: a counter bumped by every state-changing transaction.
+
+GameState.revision is incremented by bump_revision() just before the commits
+that change the game (new game, turn, tile actions, undo / redo, replays) and
+published to `revision_tracker` once the commit succeeds. The tracker keeps
+the current revision and its modification time in memory, so HTTP caching
+(game.http_cache) can answer conditional requests without a query.
+
+Revisions only grow, including across games: a new game or a restored
+snapshot continues from the last revision seen by the process.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+import math
+import threading
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import GameState
+
+# Session.info key of the revision pending until commit
+_PENDING_KEY = "game_revision"
+
+
+class RevisionTracker:
+    """Current game revision and its Last-Modified time, as last committed by this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.revision: Optional[int] = None
+        self.modified_at = 0.0
+
+    def load(self, db: Session) -> Optional[int]:
+        """Read the revision from the database (None when no game exists)"""
+        game_state = db.query(GameState).first()
+        revision = (game_state.revision or 0) if game_state else None
+        with self._lock:
+            self.revision = revision
+            self.modified_at = float(math.floor(time.time()))
+            self.loaded = True
+        return revision
+
+    def current(self, db: Session) -> Tuple[Optional[int], float]:
+        """(revision, modification time), loading them on first use only"""
+        if not self.loaded:
+            self.load(db)
+        with self._lock:
+            return self.revision, self.modified_at
+
+    def publish(self, revision: int) -> None:
+        """Record a committed revision. Last-Modified moves forward by at least one second per revision"""
+        with self._lock:
+            if self.revision is not None and revision <= self.revision:
+                return
+            self.revision = revision
+            self.modified_at = max(float(math.floor(time.time())), self.modified_at + 1)
+            self.loaded = True
+
+
+revision_tracker = RevisionTracker()
+
+
+def bump_revision(db: Session) -> int:
+    """
+    Increment the revision of the current game (committed with the caller's
+    transaction). Call it before the commit of every state-changing request.
+
+    Returns:
+        The new revision
+    """
+    db.flush()  # A game added in this transaction is not visible to queries before the flush
+    game_state = db.query(GameState).first()
+    if game_state is None:
+        raise ValueError("Game not initialized. Call initialize_game() first.")
+
+    revision = max(game_state.revision or 0, revision_tracker.revision or 0,
+                   db.info.get(_PENDING_KEY, 0)) + 1
+    game_state.revision = revision
+    db.info[_PENDING_KEY] = revision
+    return revision
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_revision(session: Session) -> None:
+    revision = session.info.pop(_PENDING_KEY, None)
+    if revision is not None:
+        revision_tracker.publish(revision)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_revision(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
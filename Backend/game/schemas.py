@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Literal
+from typing import Dict, Optional, List, Literal, Union, get_args
+
+from game.chunks import CHUNK_SIZE
 
 
 class TileResponse(BaseModel):
@@ -23,6 +25,28 @@ class TileResponse(BaseModel):
         from_attributes = True
 
 
+def _enum_values(annotation) -> List[Optional[str]]:
+    """Values of a (possibly Optional) Literal annotation, None first when nullable"""
+    values = []
+    for arg in get_args(annotation):
+        if arg is type(None):
+            values.insert(0, None)
+        elif getattr(arg, "__origin__", None) is Literal:
+            values.extend(get_args(arg))
+        else:
+            values.append(arg)
+    return values
+
+
+# Code tables of the enum-coded tile columns (code = index in the list)
+TILE_ENUMS = {
+    name: _enum_values(field.annotation)
+    for name, field in TileResponse.model_fields.items()
+    if name in ("type", "tile_state", "exploited")
+}
+TILE_ENUMS["owner"] = [None, "player"]
+
+
 class PlayerResponse(BaseModel):
     """Response model for player data"""
     shovels: int = Field(ge=0, description="Number of shovels owned")
@@ -43,6 +67,29 @@ class GameStateResponse(BaseModel):
     tiles: List[TileResponse]
     map_shape: List[int] = Field(description="Map dimensions [rows, cols]")
     map_layers: List[str] = Field(default=["mask", "soil_moisture", "soil_temperature"], description="Layer names")
+    chunk_size: int = Field(default=CHUNK_SIZE, description="Side of a map chunk, in tiles")
+    chunks: Optional[List[List[int]]] = Field(default=None, description="Chunks [row, col] included in tiles (None = whole map)")
+    viewport: Optional[List[int]] = Field(default=None, description="Bounding box [row_min, row_max, col_min, col_max] of tiles (None = whole map)")
+    zone: Optional[str] = Field(default=None, description="Zone or region of the map (None = synthetic island)")
+
+
+class GameStateColumnsResponse(BaseModel):
+    """Game state with tiles as one array per field (/game/state?layout=columns)"""
+    step: int = Field(ge=0, description="Current turn/step number")
+    max_steps: int = Field(ge=1, description="Maximum number of steps in game")
+    is_game_over: bool = Field(description="Whether game has ended")
+    player: PlayerResponse
+    tile_count: int = Field(ge=0, description="Number of tiles, the length of every column")
+    tile_columns: Dict[str, List[Union[int, float]]] = Field(
+        description="Tile field -> values in tile id order; booleans as 0 / 1, enum fields as codes into tile_enums")
+    tile_enums: Dict[str, List[Optional[str]]] = Field(
+        description="Enum field (type, owner, tile_state, exploited) -> values, indexed by code")
+    map_shape: List[int] = Field(description="Map dimensions [rows, cols]")
+    map_layers: List[str] = Field(default=["mask", "soil_moisture", "soil_temperature"], description="Layer names")
+    chunk_size: int = Field(default=CHUNK_SIZE, description="Side of a map chunk, in tiles")
+    chunks: Optional[List[List[int]]] = Field(default=None, description="Chunks [row, col] included in tiles (None = whole map)")
+    viewport: Optional[List[int]] = Field(default=None, description="Bounding box [row_min, row_max, col_min, col_max] of tiles (None = whole map)")
+    zone: Optional[str] = Field(default=None, description="Zone or region of the map (None = synthetic island)")
 
 
 class TileActionRequest(BaseModel):
@@ -0,0 +1,29 @@
+"""
+Response serializers selectable per request.
+
+"pydantic" (default) validates GameStateResponse models and lets FastAPI
+encode them; "orjson" encodes plain dicts built straight from rows with orjson,
+falling back to the standard json module when orjson is not installed.
+
+Tiles are sent either as a list of objects ("rows", GameStateResponse) or as
+one list per field ("columns", see get_game_state_columns()); the columnar
+layout always takes the orjson path.
+"""
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+SERIALIZERS = ("pydantic", "orjson")
+TILE_LAYOUTS = ("rows", "columns")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson (NaN/inf become null, as orjson does)"""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
@@ -0,0 +1,141 @@
+"""
+Periodic compressed snapshots of the game.
+
+A snapshot stores every tile column as one NumPy array (plus player and game
+state scalars) in an np.savez_compressed archive. Restoring the latest
+snapshot and replaying the action log entries recorded after it rebuilds the
+game without regenerating the map or replaying it from step 0.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import Dict, Optional
+import io
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.models import GameAction, GameSnapshot, GameState, Player, Tile
+from game.active import active_tiles
+from game.chunks import chunk_id_of
+from game.history import reset_undo_history
+from game.state import _TILE_INSERT_COLUMNS, insert_tile_rows, invalidate_map_cache
+from monitoring.log import get_logger
+
+log = get_logger(__name__)
+
+# Steps between two periodic snapshots (taken by advance_to_next_step)
+SNAPSHOT_INTERVAL = 5
+# Older snapshots are pruned beyond this count
+SNAPSHOTS_KEPT = 3
+
+# Array dtype of each tile column; nullable string columns store None as ""
+_TILE_DTYPES = {
+    "id": np.int32, "grid_i": np.int32, "grid_j": np.int32, "zone_id": np.int32, "chunk_id": np.int32,
+    "temperature": np.float64, "humidity": np.float64,
+    "type": np.str_, "owner": np.str_, "tile_state": np.str_,
+    "has_water_reserve": np.bool_, "has_firebreak": np.bool_,
+    "last_irrigated_step": np.int32, "irrigated_this_step": np.bool_, "exploited": np.str_,
+}
+_PLAYER_FIELDS = ("shovels", "drops", "score")
+_GAME_FIELDS = ("current_step", "max_steps", "is_game_over", "map_rows", "map_cols", "seed", "zone")
+
+
+def encode_snapshot(db: Session) -> bytes:
+    """Serialize tiles, player and game state into a compressed archive"""
+    db.flush()
+    columns = [getattr(Tile, name) for name in _TILE_INSERT_COLUMNS]
+    rows = db.connection().execute(select(*columns).order_by(Tile.id)).all()
+    values_by_column = list(zip(*rows)) or [()] * len(columns)
+
+    arrays: Dict[str, np.ndarray] = {}
+    for name, values in zip(_TILE_INSERT_COLUMNS, values_by_column):
+        dtype = _TILE_DTYPES[name]
+        if dtype is np.str_:
+            arrays[f"tile_{name}"] = np.array([v or "" for v in values], dtype=np.str_)
+        else:
+            arrays[f"tile_{name}"] = np.fromiter(values, dtype=dtype, count=len(values))
+
+    player = db.query(Player).first()
+    game_state = db.query(GameState).first()
+    for name in _PLAYER_FIELDS:
+        arrays[f"player_{name}"] = np.asarray(getattr(player, name))
+    for name in _GAME_FIELDS:
+        value = getattr(game_state, name)
+        arrays[f"game_{name}"] = np.asarray(-1 if value is None else value)
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def take_snapshot(db: Session) -> GameSnapshot:
+    """
+    Store a snapshot of the current state covering every logged action so far.
+    Does not commit.
+    """
+    data = encode_snapshot(db)
+    game_state = db.query(GameState).first()
+    last_action_id = db.query(func.max(GameAction.id)).scalar() or 0
+    tile_count = db.query(func.count(Tile.id)).scalar()
+
+    snapshot = GameSnapshot(step=game_state.current_step, action_id=last_action_id,
+                            tile_count=tile_count, data=data)
+    db.add(snapshot)
+    db.flush()
+
+    # Prune old snapshots
+    stale = (db.query(GameSnapshot.id)
+             .order_by(GameSnapshot.id.desc())
+             .offset(SNAPSHOTS_KEPT)
+             .all())
+    if stale:
+        db.query(GameSnapshot).filter(GameSnapshot.id.in_([row.id for row in stale])).delete(
+            synchronize_session=False)
+
+    log.info("📸 Snapshot stored", step=snapshot.step, action_id=last_action_id,
+             tiles=tile_count, size_kb=round(len(data) / 1024, 1))
+    return snapshot
+
+
+def latest_snapshot(db: Session) -> Optional[GameSnapshot]:
+    """Return the most recent snapshot, or None"""
+    return db.query(GameSnapshot).order_by(GameSnapshot.id.desc()).first()
+
+
+def restore_snapshot(db: Session, snapshot: GameSnapshot) -> None:
+    """
+    Replace tiles, player and game state with the content of a snapshot.
+    Does not commit.
+    """
+    with np.load(io.BytesIO(snapshot.data)) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+
+    db.query(Tile).delete()
+    db.query(Player).delete()
+    db.query(GameState).delete()
+    invalidate_map_cache()
+    reset_undo_history()
+    active_tiles.invalidate()
+
+    # Fields missing from older snapshots are left to their default
+    game = {name: arrays[f"game_{name}"].item() for name in _GAME_FIELDS if f"game_{name}" in arrays}
+    for name, value in game.items():
+        if value == -1 and name in ("seed", "zone"):
+            game[name] = None
+    db.add(GameState(**game))
+    db.add(Player(**{name: arrays[f"player_{name}"].item() for name in _PLAYER_FIELDS}))
+
+    if "tile_chunk_id" not in arrays:  # Snapshot taken before tiles had chunk ids
+        arrays["tile_chunk_id"] = chunk_id_of(arrays["tile_grid_i"], arrays["tile_grid_j"])
+
+    columns = []
+    for name in _TILE_INSERT_COLUMNS:
+        values = arrays[f"tile_{name}"].tolist()
+        if name in ("owner", "tile_state"):
+            values = [v or None for v in values]
+        columns.append(values)
+    insert_tile_rows(db, zip(*columns))
+    db.flush()
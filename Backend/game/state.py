@@ -1,4 +1,8 @@
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import secrets
 import sys
 import os
 import numpy as np
@@ -6,33 +10,107 @@ import numpy as np
 # Add Backend to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from database.models import GameState, Player, Tile
-from game.schemas import GameStateResponse, PlayerResponse, TileResponse
+from database.models import GameAction, GameSnapshot, GameState, Player, Tile
+from game.active import active_tiles
+from game.chunks import CHUNK_SIZE, Viewport, chunk_bounds, chunk_id, chunk_id_of
+from game.history import reset_undo_history
+from game.journal import record_action
+from game.locks import NEW_GAME, game_locks
+from game.map_pool import map_pool
+from game.prefetch import weather_prefetch
+from game.revision import bump_revision
+from game.schemas import TILE_ENUMS, GameStateResponse, PlayerResponse, TileResponse
 from get_map.get_map import get_map
-from get_map.get_history_info import get_history_info
+from get_map.get_history_info import get_history_info_batch
+from get_map.weather_field import get_soil_field
+from get_map.zones import ZoneSpec, get_zone_map, resolve_zone, weather_origin
+from monitoring.metrics import TURN_DURATION, WEATHER_FETCH, record_cache
+from monitoring.log import get_logger
 
+log = get_logger(__name__)
 
-def initialize_game(db: Session) -> None:
+# Layers of the map matrix, in order
+MAP_LAYERS = ("mask", "soil_moisture", "soil_temperature")
+
+# Tile fields sent to clients, in TileResponse order
+TILE_FIELDS = tuple(TileResponse.model_fields)
+_BOOL_FIELDS = {name for name, field in TileResponse.model_fields.items() if field.annotation is bool}
+
+# Rows per executemany batch when bulk inserting tiles
+TILE_INSERT_BATCH_SIZE = 20000
+
+# Columns written by insert_tiles() (Tile defaults are Python-side, so every column is explicit)
+_TILE_INSERT_COLUMNS = (
+    "id", "grid_i", "grid_j", "zone_id", "chunk_id", "temperature", "humidity",
+    "type", "owner", "tile_state", "has_water_reserve", "has_firebreak",
+    "last_irrigated_step", "irrigated_this_step", "exploited",
+)
+# Values of the trailing columns above for a freshly created tile
+_NEW_TILE_DEFAULTS = ("empty", None, None, False, False, -1, False, "conserve")
+
+
+def initialize_game(db: Session, grid_size: Tuple[int, int] = (50, 50),
+                    seed: Optional[int] = None, zone: Optional[str] = None,
+                    commit: bool = True) -> None:
     """
     Initialize new game with default state.
     Creates GameState, Player, and Tiles from map generation.
+
+    Args:
+        db: Database session
+        grid_size: Map dimensions (rows, cols)
+        seed: Map generation seed (random when None); stored on GameState so
+              the game can be rebuilt from its action log
+        zone: Zone ("tempere") or region ("paris") name: the island is the
+              region's real polygon with that zone's GeoTIFF layers and zone_id
+              (cached per zone, see get_map.zones). None = synthetic island.
+        commit: False only flushes the new game, leaving the transaction to the
+                caller (replays commit or roll back once every action is applied)
+
+    Raises:
+        ValueError: On unknown zones
+        GameBusyError: If the current game is advancing or being replaced
     """
-    print("🎮 [initialize_game] Starting game initialization")
-
-    # Clean up old game if exists
-    existing_state = db.query(GameState).first()
-    if existing_state:
-        print("🎮 [initialize_game] Cleaning up existing game")
-        db.query(Tile).delete()
-        db.query(Player).delete()
-        db.query(GameState).delete()
-        db.commit()
+    log.info("🎮 Starting game initialization")
+    spec = resolve_zone(zone) if zone is not None else None
+
+    # A pre-generated (seed, map) pair from the pool when no seed was asked for
+    pooled = map_pool.pop(grid_size) if seed is None and spec is None else None
+    if pooled is not None:
+        seed, matrix = pooled
+    else:
+        if seed is None:
+            seed = secrets.randbelow(2 ** 31)
+
+        # Generate initial map ONCE (before touching the database, so the
+        # transaction below stays short)
+        if spec is None:
+            matrix = get_map(grid_size=grid_size, seed=seed)  # Returns (ny, nx, 3) array
+        else:
+            matrix = get_zone_map(spec, grid_size)
+    ny, nx = matrix.shape[0], matrix.shape[1]
+    log.debug("🎮 Map generated", rows=ny, cols=nx)
+
+    # Replace the previous game and create the new one in a single transaction,
+    # holding the game so no turn or action runs on the rows being replaced
+    game_id = db.query(GameState.id).scalar()
+    with game_locks.turn(NEW_GAME if game_id is None else game_id):
+        _replace_game(db, matrix, seed, spec, commit)
+
 
-    # Generate initial map ONCE
-    print("🎮 [initialize_game] Calling get_map() to generate new map")
-    matrix = get_map()  # Returns (ny, nx, 3) array
+def _replace_game(db: Session, matrix: np.ndarray, seed: int, spec: Optional[ZoneSpec],
+                  commit: bool) -> None:
+    """Body of initialize_game() once the map is built, run under the game's turn lock"""
     ny, nx = matrix.shape[0], matrix.shape[1]
-    print(f"🎮 [initialize_game] Received map with dimensions {ny}x{nx}")
+    db.query(Tile).delete()
+    db.query(Player).delete()
+    db.query(GameState).delete()
+    db.query(GameAction).delete()
+    db.query(GameSnapshot).delete()
+    invalidate_map_cache()
+    reset_undo_history()
+    active_tiles.invalidate()
+    weather_prefetch.cancel()
 
     # Create new game state with map dimensions
     game_state = GameState(
@@ -40,106 +118,319 @@ def initialize_game(db: Session) -> None:
         max_steps=10,
         is_game_over=False,
         map_rows=ny,
-        map_cols=nx
+        map_cols=nx,
+        seed=seed,
+        zone=spec.key if spec else None
     )
     player = Player(shovels=3, drops=3, score=0)
-
-    # Create tiles from matrix
-    tiles = []
-    tile_id = 1
-    island_cells = 0
-    water_cells = 0
-
-    for i in range(ny):
-        for j in range(nx):
-            if matrix[i, j, 0] == 1:  # Island mask - only create tiles for island
-                tile = Tile(
-                    id=tile_id,
-                    grid_i=i,
-                    grid_j=j,
-                    zone_id=1,  # Default zone, could be determined by location
-                    type="empty",
-                    owner=None,
-                    temperature=float(matrix[i, j, 2]),
-                    humidity=float(matrix[i, j, 1]),
-                    last_irrigated_step=-1,
-                    irrigated_this_step=False,
-                    exploited="conserve"
-                )
-                tiles.append(tile)
-                tile_id += 1
-                island_cells += 1
-            else:
-                water_cells += 1
-
-    # Add all objects and commit once
     db.add(game_state)
     db.add(player)
-    db.add_all(tiles)
-    db.commit()
 
-    print(f"🎮 [initialize_game] Game initialized successfully")
-    print(f"🎮 [initialize_game] Map dimensions: {ny}x{nx} = {ny*nx} total cells")
-    print(f"🎮 [initialize_game] Island tiles created: {island_cells}")
-    print(f"🎮 [initialize_game] Water cells: {water_cells}")
-    print(f"🎮 [initialize_game] Verification: {island_cells + water_cells} = {ny*nx} ✓")
+    island_cells = insert_tiles(db, matrix, zone_id=spec.zone_id if spec else 1)
+    bump_revision(db)
+    _commit(db, commit)
+
+    log.info("🎮 Game initialized", seed=seed, zone=spec.key if spec else None, rows=ny, cols=nx, island_tiles=island_cells,
+             water_cells=ny * nx - island_cells)
+    prefetch_weather(game_state, 1)
+
+
+def insert_tiles(db: Session, matrix: np.ndarray, zone_id: int = 1,
+                 batch_size: int = TILE_INSERT_BATCH_SIZE) -> int:
+    """
+    Bulk insert one tile per island cell of a (ny, nx, 3) map matrix.
+    Rows are generated from np.nonzero(mask) and written with executemany
+    batches instead of ORM objects; ids follow row-major grid order from 1.
+    Does not commit.
 
+    Args:
+        db: Database session
+        matrix: Map matrix (layer 0 = mask, 1 = humidity, 2 = temperature)
+        zone_id: Zone assigned to every tile
+        batch_size: Rows per executemany call (bounds memory for large islands)
 
-def get_map_from_tiles(db: Session) -> np.ndarray:
+    Returns:
+        Number of tiles inserted
+    """
+    rows, cols = np.nonzero(matrix[:, :, 0] == 1)
+    humidity = matrix[rows, cols, 1].astype(float)
+    temperature = matrix[rows, cols, 2].astype(float)
+    chunk_ids = chunk_id_of(rows, cols)
+
+    return insert_tile_rows(db, (
+        (tile_id, i, j, zone_id, chunk, temp, hum, *_NEW_TILE_DEFAULTS)
+        for tile_id, i, j, chunk, temp, hum in zip(
+            range(1, rows.size + 1), rows.tolist(), cols.tolist(), chunk_ids.tolist(),
+            temperature.tolist(), humidity.tolist(),
+        )
+    ), batch_size)
+
+
+def insert_tile_rows(db: Session, rows: Iterable[tuple],
+                     batch_size: int = TILE_INSERT_BATCH_SIZE) -> int:
+    """
+    Bulk insert tile rows given as tuples in _TILE_INSERT_COLUMNS order.
+    Does not commit.
+
+    Returns:
+        Number of rows inserted
+    """
+    connection = db.connection()
+    if connection.dialect.name == "sqlite":
+        # Driver-level executemany of plain tuples skips per-row bind processing
+        placeholders = ", ".join("?" * len(_TILE_INSERT_COLUMNS))
+        sql = f"INSERT INTO {Tile.__tablename__} ({', '.join(_TILE_INSERT_COLUMNS)}) VALUES ({placeholders})"
+        execute_batch = lambda batch: connection.exec_driver_sql(sql, batch)
+    else:
+        statement = Tile.__table__.insert()
+        execute_batch = lambda batch: connection.execute(
+            statement, [dict(zip(_TILE_INSERT_COLUMNS, row)) for row in batch]
+        )
+
+    rows = iter(rows)
+    count = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return count
+        execute_batch(batch)
+        count += len(batch)
+
+
+def update_tile_weather(db: Session, ids: np.ndarray, humidity: np.ndarray,
+                        temperature: np.ndarray, batch_size: int = TILE_INSERT_BATCH_SIZE) -> int:
+    """
+    Write per-tile humidity / temperature with executemany batches. Does not commit.
+
+    Returns:
+        Number of rows updated
+    """
+    rows = zip(humidity.astype(float).tolist(), temperature.astype(float).tolist(), ids.tolist())
+    connection = db.connection()
+    if connection.dialect.name == "sqlite":
+        sql = f"UPDATE {Tile.__tablename__} SET humidity = ?, temperature = ? WHERE id = ?"
+        execute_batch = lambda batch: connection.exec_driver_sql(sql, batch)
+    else:
+        statement = (Tile.__table__.update()
+                     .where(Tile.__table__.c.id == bindparam("tile_id"))
+                     .values(humidity=bindparam("hum"), temperature=bindparam("temp")))
+        execute_batch = lambda batch: connection.execute(
+            statement, [{"hum": hum, "temp": temp, "tile_id": tile_id} for hum, temp, tile_id in batch]
+        )
+
+    count = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return count
+        execute_batch(batch)
+        count += len(batch)
+
+
+class _MaskLayer(NamedTuple):
+    """Island layout of the current game: tile ids and coordinates (ordered by id) and mask layer"""
+    ids: np.ndarray
+    rows: np.ndarray
+    cols: np.ndarray
+    mask: np.ndarray
+
+
+# The island layout never changes after initialize_game, so the mask layer and
+# the tile coordinates are cached per (game id, rows, cols)
+_mask_cache: Dict[tuple, _MaskLayer] = {}
+
+
+def invalidate_map_cache() -> None:
+    """Drop cached map layers (called when a new game replaces the tiles)"""
+    _mask_cache.clear()
+
+
+def _fetch_tile_columns(db: Session, *columns) -> np.ndarray:
+    """Fetch tile columns ordered by id as an (n_tiles, n_columns) array, bypassing ORM objects"""
+    rows = db.connection().execute(select(*columns).order_by(Tile.id)).all()
+    data = np.empty((len(rows), len(columns)), dtype=np.float64)
+    # Transpose row tuples into columns once, then fill each array column in C
+    for index, values in enumerate(zip(*rows)):
+        data[:, index] = np.fromiter(values, dtype=np.float64, count=len(rows))
+    return data
+
+
+def _build_layout(columns: np.ndarray, ny: int, nx: int) -> _MaskLayer:
+    """Island layout from (id, grid_i, grid_j) tile columns"""
+    ids, rows, cols = columns.astype(np.intp).T
+    mask = np.zeros((ny, nx), dtype=np.float32)
+    mask[rows, cols] = 1
+    return _MaskLayer(ids, rows, cols, mask)
+
+
+def _get_layout(db: Session, game_state: GameState) -> _MaskLayer:
+    """Cached island layout of the game, loaded when missing or stale"""
+    ny, nx = game_state.map_rows, game_state.map_cols
+    key = (game_state.id, ny, nx)
+    layout = _mask_cache.get(key)
+    if layout is not None and db.query(Tile).count() != layout.ids.size:
+        layout = None
+    record_cache("map_mask", layout is not None)
+    if layout is None:
+        layout = _mask_cache[key] = _build_layout(_fetch_tile_columns(db, Tile.id, Tile.grid_i, Tile.grid_j), ny, nx)
+    return layout
+
+
+def get_map_from_tiles(db: Session, use_mask_cache: bool = True) -> np.ndarray:
     """
     Reconstruct map matrix from stored tiles.
-    Returns (ny, nx, 3) array where:
+    Returns (ny, nx, 3) float32 array where:
     - Layer 0: mask (0 = water, 1 = land)
     - Layer 1: soil moisture (humidity)
     - Layer 2: temperature
+
+    Args:
+        db: Database session
+        use_mask_cache: Reuse the cached island layout and only fetch weather columns
     """
     game_state = db.query(GameState).first()
     if not game_state:
         raise ValueError("Game not initialized")
 
     ny, nx = game_state.map_rows, game_state.map_cols
-    matrix = np.zeros((ny, nx, 3))
+    key = (game_state.id, ny, nx)
+
+    layout = _mask_cache.get(key) if use_mask_cache else None
+    weather = None
+    if layout is not None:
+        weather = _fetch_tile_columns(db, Tile.humidity, Tile.temperature)
+        if len(weather) != layout.rows.size:
+            # Tiles were replaced by another process: rebuild the layout
+            layout = None
+    if use_mask_cache:
+        record_cache("map_mask", layout is not None)
+
+    if layout is None:
+        columns = _fetch_tile_columns(db, Tile.id, Tile.grid_i, Tile.grid_j, Tile.humidity, Tile.temperature)
+        layout = _build_layout(columns[:, :3], ny, nx)
+        weather = columns[:, 3:]
+        if use_mask_cache:
+            _mask_cache[key] = layout
+
+    # Scatter tile values into the grid
+    matrix = np.zeros((ny, nx, 3), dtype=np.float32)
+    matrix[:, :, 0] = layout.mask
+    matrix[layout.rows, layout.cols, 1] = weather[:, 0]
+    matrix[layout.rows, layout.cols, 2] = weather[:, 1]
+
+    island_cells = layout.rows.size
+    log.debug("🗺️ Map reconstructed from tiles", rows=ny, cols=nx,
+              island_cells=island_cells, water_cells=ny * nx - island_cells, sample_every=50)
 
-    # Get all tiles
-    tiles = db.query(Tile).all()
+    return matrix
 
-    print(f"🗺️ [get_map_from_tiles] Reconstructing map from {len(tiles)} tiles")
-    print(f"🗺️ [get_map_from_tiles] Map dimensions: {ny}x{nx}")
 
-    # Fill matrix from tiles
-    for tile in tiles:
-        i, j = tile.grid_i, tile.grid_j
-        matrix[i, j, 0] = 1  # mask - tile exists (island)
-        matrix[i, j, 1] = tile.humidity
-        matrix[i, j, 2] = tile.temperature
+def get_map_chunks(db: Session, chunks: Sequence[Tuple[int, int]]) -> List[dict]:
+    """
+    Reconstruct only the requested chunks of the map matrix.
 
-    # Count island vs water cells
-    island_cells = np.sum(matrix[:, :, 0] == 1)
-    water_cells = (ny * nx) - island_cells
+    Args:
+        db: Database session
+        chunks: (chunk_row, chunk_col) pairs
 
-    print(f"🗺️ [get_map_from_tiles] Island cells: {island_cells}, Water cells: {water_cells}")
+    Returns:
+        list of {"chunk": [row, col], "origin": [i0, j0], "data": (h, w, 3) float32 array}
+    """
+    game_state = db.query(GameState).first()
+    if not game_state:
+        raise ValueError("Game not initialized")
+    ny, nx = game_state.map_rows, game_state.map_cols
+
+    ids = [chunk_id(row, col) for row, col in chunks]
+    rows = db.connection().execute(
+        select(Tile.grid_i, Tile.grid_j, Tile.humidity, Tile.temperature)
+        .where(Tile.chunk_id.in_(ids))
+    ).all()
+    values = np.asarray(rows, dtype=np.float64).reshape(-1, 4)
+    grid_i, grid_j = values[:, 0].astype(np.intp), values[:, 1].astype(np.intp)
+    tile_chunks = chunk_id_of(grid_i, grid_j)
+
+    result = []
+    for (row, col), cid in zip(chunks, ids):
+        i0, i1, j0, j1 = chunk_bounds(row, col, ny, nx)
+        matrix = np.zeros((i1 - i0, j1 - j0, 3), dtype=np.float32)
+        selected = tile_chunks == cid
+        local_i, local_j = grid_i[selected] - i0, grid_j[selected] - j0
+        matrix[local_i, local_j, 0] = 1
+        matrix[local_i, local_j, 1] = values[selected, 2]
+        matrix[local_i, local_j, 2] = values[selected, 3]
+        result.append({"chunk": [row, col], "origin": [i0, j0], "data": matrix})
+    return result
+
+
+def get_map_window(db: Session, viewport: Viewport) -> np.ndarray:
+    """
+    Reconstruct the part of the map matrix inside a bounding box.
+    Only tiles in the box are read (through the (grid_i, grid_j) index).
 
+    Returns:
+        (rows, cols, 3) float32 array, row 0 / col 0 being viewport.row_min / col_min
+    """
+    rows = db.connection().execute(
+        select(Tile.grid_i, Tile.grid_j, Tile.humidity, Tile.temperature)
+        .where(Tile.grid_i.between(viewport.row_min, viewport.row_max),
+               Tile.grid_j.between(viewport.col_min, viewport.col_max))
+    ).all()
+    values = np.asarray(rows, dtype=np.float64).reshape(-1, 4)
+    local_i = values[:, 0].astype(np.intp) - viewport.row_min
+    local_j = values[:, 1].astype(np.intp) - viewport.col_min
+
+    matrix = np.zeros((*viewport.shape, 3), dtype=np.float32)
+    matrix[local_i, local_j, 0] = 1
+    matrix[local_i, local_j, 1] = values[:, 2]
+    matrix[local_i, local_j, 2] = values[:, 3]
     return matrix
 
 
-def get_current_game_state(db: Session) -> GameStateResponse:
+def parse_layers(value: str) -> List[int]:
+    """
+    Map a comma-separated list of layer names to their index in the map matrix.
+
+    Raises:
+        ValueError: On unknown layer names
+    """
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in MAP_LAYERS]
+    if unknown or not names:
+        raise ValueError(f"Unknown layers {unknown}, available: {', '.join(MAP_LAYERS)}")
+    return [MAP_LAYERS.index(name) for name in names]
+
+
+def get_current_game_state(db: Session,
+                           chunks: Optional[Sequence[Tuple[int, int]]] = None,
+                           viewport: Optional[Viewport] = None) -> GameStateResponse:
     """
     Retrieve complete game state.
     Returns a Pydantic GameStateResponse with all game data.
+
+    Args:
+        db: Database session
+        chunks: Only return tiles of these (chunk_row, chunk_col) chunks
+        viewport: Only return tiles inside this bounding box
     """
     game_state = db.query(GameState).first()
     player = db.query(Player).first()
-    tiles = db.query(Tile).all()
 
     if not game_state or not player:
         raise ValueError("Game not initialized. Call initialize_game() first.")
 
-    print(f"🔍 [get_current_game_state] GameState attributes: {dir(game_state)}")
-    print(f"🔍 [get_current_game_state] Has map_rows: {hasattr(game_state, 'map_rows')}")
-    print(f"🔍 [get_current_game_state] Has map_cols: {hasattr(game_state, 'map_cols')}")
-
-    # Calculate tiles_owned
-    tiles_owned = [t.id for t in tiles if t.owner == "player"]
+    if chunks is None and viewport is None:
+        tiles = db.query(Tile).all()
+        tiles_owned = [t.id for t in tiles if t.owner == "player"]
+    else:
+        query = db.query(Tile)
+        if chunks is not None:
+            query = query.filter(Tile.chunk_id.in_([chunk_id(row, col) for row, col in chunks]))
+        if viewport is not None:
+            query = query.filter(Tile.grid_i.between(viewport.row_min, viewport.row_max),
+                                 Tile.grid_j.between(viewport.col_min, viewport.col_max))
+        tiles = query.order_by(Tile.id).all()
+        tiles_owned = [row.id for row in db.query(Tile.id).filter(Tile.owner == "player").order_by(Tile.id)]
 
     # Create Pydantic response models
     player_response = PlayerResponse(
@@ -151,7 +442,8 @@ def get_current_game_state(db: Session) -> GameStateResponse:
 
     tile_responses = [TileResponse.model_validate(t) for t in tiles]
 
-    print(f"🔍 [get_current_game_state] map_rows={game_state.map_rows}, map_cols={game_state.map_cols}")
+    log.debug("🔍 Game state loaded", step=game_state.current_step, tiles=len(tile_responses),
+              map_rows=game_state.map_rows, map_cols=game_state.map_cols, sample_every=50)
 
     return GameStateResponse(
         step=game_state.current_step,
@@ -159,62 +451,212 @@ def get_current_game_state(db: Session) -> GameStateResponse:
         is_game_over=game_state.is_game_over,
         player=player_response,
         tiles=tile_responses,
-        map_shape=[game_state.map_rows, game_state.map_cols],
-        map_layers=["mask", "soil_moisture", "soil_temperature"]
+        **_map_fields(game_state, chunks, viewport)
     )
 
 
-def load_next_step_data(step: int, db: Session) -> dict:
+def _tile_query(names: Sequence[str], chunks: Optional[Sequence[Tuple[int, int]]],
+                viewport: Optional[Viewport]):
+    """Core select of the `names` tile columns, filtered by chunks / viewport, in id order"""
+    query = select(*(getattr(Tile, name) for name in names)).order_by(Tile.id)
+    if chunks is not None:
+        query = query.where(Tile.chunk_id.in_([chunk_id(row, col) for row, col in chunks]))
+    if viewport is not None:
+        query = query.where(Tile.grid_i.between(viewport.row_min, viewport.row_max),
+                            Tile.grid_j.between(viewport.col_min, viewport.col_max))
+    return query
+
+
+def _header_fields(db: Session, game_state: GameState, player: Player) -> dict:
+    """Step and player fields of GameStateResponse, before the tiles"""
+    tiles_owned = db.connection().execute(
+        select(Tile.id).where(Tile.owner == "player").order_by(Tile.id)
+    ).scalars().all()
+    return {
+        "step": game_state.current_step,
+        "max_steps": game_state.max_steps,
+        "is_game_over": game_state.is_game_over,
+        "player": {
+            "shovels": player.shovels,
+            "drops": player.drops,
+            "score": player.score,
+            "tiles_owned": tiles_owned,
+        },
+    }
+
+
+def _map_fields(game_state: GameState, chunks: Optional[Sequence[Tuple[int, int]]],
+                viewport: Optional[Viewport]) -> dict:
+    """Map description fields of GameStateResponse, after the tiles"""
+    return {
+        "map_shape": [game_state.map_rows, game_state.map_cols],
+        "map_layers": list(MAP_LAYERS),
+        "chunk_size": CHUNK_SIZE,
+        "chunks": [list(chunk) for chunk in chunks] if chunks is not None else None,
+        "viewport": list(viewport) if viewport is not None else None,
+        "zone": game_state.zone,
+    }
+
+
+def get_game_state_payload(db: Session,
+                           chunks: Optional[Sequence[Tuple[int, int]]] = None,
+                           viewport: Optional[Viewport] = None,
+                           fields: Optional[Iterable[str]] = None) -> dict:
+    """
+    Same content as get_current_game_state(...).model_dump(mode="json"), built
+    from plain rows without ORM objects or Pydantic models, for the fast JSON
+    serialization path of /game/state.
+
+    Args:
+        db: Database session
+        chunks, viewport: See get_current_game_state()
+        fields: Tile fields to include (all TileResponse fields when None)
+    """
+    game_state = db.query(GameState).first()
+    player = db.query(Player).first()
+
+    if not game_state or not player:
+        raise ValueError("Game not initialized. Call initialize_game() first.")
+
+    names = [name for name in TILE_FIELDS if fields is None or name in fields]
+    rows = db.connection().execute(_tile_query(names, chunks, viewport))
+    tiles = [dict(zip(names, row)) for row in rows]
+
+    return {
+        **_header_fields(db, game_state, player),
+        "tiles": tiles,
+        **_map_fields(game_state, chunks, viewport),
+    }
+
+
+def get_game_state_columns(db: Session,
+                           chunks: Optional[Sequence[Tuple[int, int]]] = None,
+                           viewport: Optional[Viewport] = None,
+                           fields: Optional[Iterable[str]] = None) -> dict:
+    """
+    Columnar variant of get_game_state_payload(): instead of `tiles`, one list
+    per tile field under `tile_columns`, in tile id order. Booleans are sent as
+    0 / 1 and enum fields (type, owner, tile_state, exploited) as indexes into
+    the `tile_enums` code tables, so every column maps to a typed array.
+
+    Args:
+        db: Database session
+        chunks, viewport: See get_current_game_state()
+        fields: Tile fields to include (all TileResponse fields when None)
+    """
+    game_state = db.query(GameState).first()
+    player = db.query(Player).first()
+
+    if not game_state or not player:
+        raise ValueError("Game not initialized. Call initialize_game() first.")
+
+    names = [name for name in TILE_FIELDS if fields is None or name in fields]
+    rows = db.connection().execute(_tile_query(names, chunks, viewport)).all()
+    values = list(zip(*rows)) if rows else [()] * len(names)
+
+    columns, enums = {}, {}
+    for name, column in zip(names, values):
+        if name in TILE_ENUMS:
+            table = list(TILE_ENUMS[name])
+            codes = {value: code for code, value in enumerate(table)}
+            for value in set(column) - codes.keys():
+                # Values outside the schema (e.g. another owner) get codes appended to the table
+                codes[value] = len(table)
+                table.append(value)
+            columns[name] = [codes[value] for value in column]
+            enums[name] = table
+        elif name in _BOOL_FIELDS:
+            columns[name] = list(map(int, column))
+        else:
+            columns[name] = list(column)
+
+    return {
+        **_header_fields(db, game_state, player),
+        "tile_count": len(rows),
+        "tile_columns": columns,
+        "tile_enums": enums,
+        **_map_fields(game_state, chunks, viewport),
+    }
+
+
+def _weather_key(game_state: GameState, step: int) -> tuple:
+    return (game_state.id, game_state.seed, game_state.zone, game_state.map_rows, game_state.map_cols, step)
+
+
+def _compute_weather_field(zone: Optional[str], step: int, ny: int, nx: int) -> np.ndarray:
+    """(ny, nx, 2) soil moisture / temperature of a step"""
+    # Each step = 1 week = 7 days
+    with WEATHER_FETCH.time(source="open_meteo"):
+        return get_soil_field(get_history_info_batch, weather_origin(zone)).grid(step * 7, ny, nx)
+
+
+def prefetch_weather(game_state: GameState, step: int) -> None:
+    """Compute the weather field of `step` in the background, unless the game ends before it"""
+    if game_state.is_game_over or step >= game_state.max_steps:
+        return
+    zone, ny, nx = game_state.zone, game_state.map_rows, game_state.map_cols
+    weather_prefetch.schedule(_weather_key(game_state, step),
+                              lambda: _compute_weather_field(zone, step, ny, nx))
+
+
+def _commit(db: Session, commit: bool) -> None:
+    """Commit, or only flush when the caller owns the transaction"""
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+
+
+def load_next_step_data(step: int, db: Session, commit: bool = True) -> dict:
     """
     Load weather data for the next step.
-    Updates tile temperatures and humidities based on new data.
+    Updates tile temperatures and humidities from the interpolated weather field.
     Each step = 1 week, so we advance by 7 days in the historical data.
 
     Args:
         step: The step number to load data for
         db: Database session
+        commit: See advance_to_next_step()
 
     Returns:
-        dict with update statistics
+        dict with update statistics (humidity / temperature are island means)
     """
     try:
-        # Get historical data (using a default location for now)
-        history_data = get_history_info(0.943227, 20.000000)
+        game_state = db.query(GameState).first()
+        ny, nx = game_state.map_rows, game_state.map_cols
 
         # Each step = 1 week = 7 days
         day_index = step * 7
 
-        if day_index < len(history_data.get("soil_moisture_0_to_7cm_mean", [])):
-            humidity = history_data["soil_moisture_0_to_7cm_mean"][day_index]
-            temperature = history_data["soil_temperature_28_to_100cm_mean"][day_index]
-        else:
-            # Use last available data if step exceeds available data
-            humidity = history_data["soil_moisture_0_to_7cm_mean"].iloc[-1]
-            temperature = history_data["soil_temperature_28_to_100cm_mean"].iloc[-1]
-
-        # Update all tiles with new weather data
-        tiles = db.query(Tile).all()
-        updated_count = 0
+        # Soil weather on a coarse grid of points, interpolated to every cell
+        # (all points in one request, fetched once; grids are cached per step).
+        # Usually prefetched when the previous step completed.
+        field = weather_prefetch.take(_weather_key(game_state, step))
+        if field is None:
+            field = _compute_weather_field(game_state.zone, step, ny, nx)
 
-        for tile in tiles:
-            tile.humidity = float(humidity)
-            tile.temperature = float(temperature)
-            updated_count += 1
+        layout = _get_layout(db, game_state)
+        values = field[layout.rows, layout.cols]
+        updated_count = update_tile_weather(db, layout.ids, values[:, 0], values[:, 1])
 
-        db.commit()
+        bump_revision(db)
+        _commit(db, commit)
 
-        print(f"🌦️ [load_next_step_data] Step {step} -> Day {day_index}: temp={temperature:.1f}°C, humidity={humidity:.3f}")
+        humidity = float(values[:, 0].mean()) if len(values) else float(field[..., 0].mean())
+        temperature = float(values[:, 1].mean()) if len(values) else float(field[..., 1].mean())
+        log.debug("🌦️ Weather loaded", step=step, day_index=day_index,
+                  temperature=temperature, humidity=humidity)
 
         return {
             "step": step,
             "day_index": day_index,
             "tiles_updated": updated_count,
-            "humidity": float(humidity),
-            "temperature": float(temperature)
+            "humidity": humidity,
+            "temperature": temperature
         }
 
     except Exception as e:
-        print(f"❌ [load_next_step_data] Error loading weather data: {e}")
+        log.error("❌ Error loading weather data", step=step, error=str(e))
         return {
             "step": step,
             "tiles_updated": 0,
@@ -222,7 +664,8 @@ def load_next_step_data(step: int, db: Session) -> dict:
         }
 
 
-def advance_to_next_step(db: Session) -> dict:
+@TURN_DURATION.time()
+def advance_to_next_step(db: Session, commit: bool = True) -> dict:
     """
     Progress game to next turn with all mechanics.
     This is the main turn progression function that:
@@ -235,42 +678,62 @@ def advance_to_next_step(db: Session) -> dict:
     7. Advances crop states
     8. Generates resources
 
+    The game's turn lock is held for the whole advance, so a concurrent
+    advance or tile action on the same game fails instead of interleaving.
+
     Args:
         db: Database session
+        commit: False only flushes the turn, leaving the transaction to the caller
+
+    Raises:
+        GameBusyError: If the game is already advancing
 
     Returns:
         dict with turn summary
     """
+    game_id = db.query(GameState.id).scalar()
+    if game_id is None:
+        log.warning("❌ Cannot advance step: game not initialized")
+        return {
+            "success": False,
+            "message": "Game not initialized"
+        }
+
+    with game_locks.turn(game_id):
+        # Loaded under the lock, so a turn that just completed is seen
+        game_state = db.query(GameState).first()
+        player = db.query(Player).first()
+        if not game_state or not player:
+            log.warning("❌ Cannot advance step: game not initialized")
+            return {
+                "success": False,
+                "message": "Game not initialized"
+            }
+        return _run_turn(db, game_state, player, commit)
+
+
+def _run_turn(db: Session, game_state: GameState, player: Player, commit: bool) -> dict:
+    """Body of advance_to_next_step(), run under the game's turn lock"""
     from game.mechanics import (
         reset_irrigation_flags,
         apply_water_reserve_auto_irrigation,
         check_crop_death,
-        advance_crop_state
+        advance_crop_state,
+        apply_turn_income
     )
+    from game.snapshots import SNAPSHOT_INTERVAL, take_snapshot
 
-    print("\n🎯 [advance_to_next_step] ========== START TURN ADVANCE ==========")
-
-    game_state = db.query(GameState).first()
-    player = db.query(Player).first()
-
-    if not game_state or not player:
-        print("❌ [advance_to_next_step] Game not initialized")
-        return {
-            "success": False,
-            "message": "Game not initialized"
-        }
-
-    print(f"📊 [advance_to_next_step] Current step: {game_state.current_step}")
+    record_action(db, "next_step", step=game_state.current_step)
 
     # Increment step
     game_state.current_step += 1
-    print(f"📊 [advance_to_next_step] New step: {game_state.current_step}")
 
     # Check game over
     if game_state.current_step >= game_state.max_steps:
         game_state.is_game_over = True
-        db.commit()
-        print(f"🏁 [advance_to_next_step] Game Over! Final score: {player.score}")
+        bump_revision(db)
+        _commit(db, commit)
+        log.info("🏁 Game over", step=game_state.current_step, final_score=player.score)
         return {
             "success": True,
             "message": "Game Over!",
@@ -280,9 +743,7 @@ def advance_to_next_step(db: Session) -> dict:
         }
 
     # Load new weather data
-    print(f"🌦️ [advance_to_next_step] Loading weather for step {game_state.current_step}")
-    weather_update = load_next_step_data(game_state.current_step, db)
-    print(f"🌦️ [advance_to_next_step] Weather loaded: temp={weather_update.get('temperature')}°C, humidity={weather_update.get('humidity')}")
+    weather_update = load_next_step_data(game_state.current_step, db, commit)
 
     # Reset irrigation flags (start of turn)
     reset_irrigation_flags(db)
@@ -290,30 +751,33 @@ def advance_to_next_step(db: Session) -> dict:
     # Apply water reserve auto-irrigation
     auto_irrigated = apply_water_reserve_auto_irrigation(db, game_state.current_step)
 
-    # Check crop deaths
-    tiles_with_crops = db.query(Tile).filter(Tile.tile_state.isnot(None)).all()
+    # Check crop deaths (only planted tiles, from the sparse active set)
+    tiles_with_crops = active_tiles.load(db, active_tiles.ensure(db).planted)
     crops_died = 0
     for tile in tiles_with_crops:
         if check_crop_death(tile, game_state.current_step, db):
             crops_died += 1
 
     # Advance crop states for surviving crops
-    surviving_crops = db.query(Tile).filter(Tile.tile_state.isnot(None)).all()
+    surviving_crops = [tile for tile in tiles_with_crops if tile.tile_state is not None]
     crops_advanced = 0
     for tile in surviving_crops:
         advance_crop_state(tile, db)
         crops_advanced += 1
 
     # Generate resources per step (from INITAL.md specifications)
-    player.shovels += 1  # +1 shovel per step
-    player.drops += 1    # +1 drop per step
-    player.score += 10   # +10 score per step
+    apply_turn_income(player)
 
     # Calculate score bonuses from maintained crops
-    harvest_ready = db.query(Tile).filter(Tile.tile_state == "harvest").count()
+    harvest_ready = sum(1 for tile in surviving_crops if tile.tile_state == "harvest")
+
+    # Periodic snapshot, so a rebuild only replays the actions since then
+    if game_state.current_step % SNAPSHOT_INTERVAL == 0:
+        take_snapshot(db)
 
     # Commit all changes together
-    db.commit()
+    bump_revision(db)
+    _commit(db, commit)
 
     result = {
         "success": True,
@@ -334,7 +798,10 @@ def advance_to_next_step(db: Session) -> dict:
         "is_game_over": game_state.is_game_over
     }
 
-    print(f"✅ [advance_to_next_step] Turn complete. Result: {result}")
-    print("🎯 [advance_to_next_step] ========== END TURN ADVANCE ==========\n")
+    log.info("✅ Turn complete", step=game_state.current_step, auto_irrigated=auto_irrigated,
+             crops_died=crops_died, crops_advanced=crops_advanced, harvest_ready=harvest_ready,
+             score=player.score)
+
+    prefetch_weather(game_state, game_state.current_step + 1)
 
     return result
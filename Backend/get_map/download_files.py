@@ -1,15 +1,21 @@
 import math
-import requests
+import os
 import geopandas as gpd
 import pandas as pd
 from shapely.geometry import Polygon, Point
 import numpy as np
+from get_map.fetcher import fetch_all, get_session
+from monitoring.log import get_logger
+
+log = get_logger(__name__)
+
+# Point endpoint of the NASA POWER API (overridable, e.g. to point at a local mock server)
+NASA_POWER_URL = os.getenv("FARMIT_NASA_POWER_URL", "https://power.larc.nasa.gov/api/temporal/daily/point")
 
 # --- Génération GeoJSON directement dans le script ---
 
 # --- NASA POWER pour un point ---
 def get_nasa_power_point(lat, lon, start="20230101", end="20231231"):
-    url = "https://power.larc.nasa.gov/api/temporal/daily/point"
     params = {
         "parameters": "T2M,RH2M,PRECTOT",
         "community": "AG",
@@ -19,10 +25,13 @@ def get_nasa_power_point(lat, lon, start="20230101", end="20231231"):
         "end": end,
         "format": "JSON"
     }
-    r = requests.get(url, params=params)
+    r = get_session().get(NASA_POWER_URL, params=params, timeout=60)
+    # 429 / 5xx sont levées pour être réessayées par fetch_all()
+    if r.status_code == 429 or r.status_code >= 500:
+        r.raise_for_status()
     data = r.json()
     if "properties" not in data or "parameter" not in data["properties"]:
-        print("⚠️ Réponse inattendue :", data.get("messages", data))
+        log.warning("⚠️ Réponse inattendue", response=data.get("messages", data))
         return None
     df = pd.DataFrame(data["properties"]["parameter"])
     df.index = pd.to_datetime(df.index, format="%Y%m%d")
@@ -45,20 +54,21 @@ def sample_points_in_polygon(polygon, n_points_x=10, n_points_y=10):
 def get_nasa_power_all_points_geo(gdf, year=2023, n_points_x=10, n_points_y=10):
     polygon = gdf.geometry.iloc[0]
     points = sample_points_in_polygon(polygon, n_points_x, n_points_y)
-    print(f"📌 {len(points)} points échantillonnés dans le polygone")
+    log.info("📌 Points échantillonnés dans le polygone", points=len(points))
 
     all_points_data = []
 
-    for i, p in enumerate(points):
-        print(f"📡 Point {i+1}/{len(points)} : ({p.y:.4f}, {p.x:.4f})")
-        df = get_nasa_power_point(p.y, p.x, start=f"{year}0101", end=f"{year}1231")
+    # Requêtes en parallèle (pool de threads, limite de débit, réessais)
+    frames = fetch_all(get_nasa_power_point,
+                       [(p.y, p.x, f"{year}0101", f"{year}1231") for p in points], source="nasa_power")
+    for p, df in zip(points, frames):
         if df is not None:
             df["lat"] = p.y
             df["lon"] = p.x
             all_points_data.append(df)
 
     if not all_points_data:
-        print("❌ Aucun point valide récupéré")
+        log.error("❌ Aucun point valide récupéré")
         return None
 
     df_all = pd.concat(all_points_data)
@@ -66,26 +76,18 @@ def get_nasa_power_all_points_geo(gdf, year=2023, n_points_x=10, n_points_y=10):
     df_all.rename(columns={"index": "date"}, inplace=True)
     return df_all
 
-def generate_grid_histories_25(lon, lat, n_points=25, spacing_km=2):
+def grid_points(lon, lat, n_rows=5, n_cols=5, spacing_km=2):
     """
-    Génère 25 points autour d'un point central (lon, lat), espacés d'environ spacing_km,
-    et récupère l'historique pour chacun.
+    Coordonnées (lat, lon) d'une grille n_rows x n_cols de points espacés d'environ
+    spacing_km, à partir de (lon, lat) vers le nord (lignes) et l'est (colonnes).
+    Ordre ligne par ligne.
     """
-    histories = []
-
     # Rayon de la Terre en km
     R = 6371.0
 
-    # Générer une grille 5x5
-    n_cols = 5
-    n_rows = 5
-    idx = 0
-
+    points = []
     for i in range(n_rows):
         for j in range(n_cols):
-            if idx >= n_points:
-                break
-
             # Décalage en km
             dx = j * spacing_km
             dy = i * spacing_km
@@ -94,13 +96,16 @@ def generate_grid_histories_25(lon, lat, n_points=25, spacing_km=2):
             dlat = dy / R * (180 / math.pi)
             dlon = dx / R * (180 / math.pi) / math.cos(lat * math.pi / 180)
 
-            lat_i = lat + dlat
-            lon_i = lon + dlon
-
-            # Récupérer l'historique
-            history_info = get_nasa_power_point(lat_i, lon_i)
-            histories.append(history_info)
+            points.append((lat + dlat, lon + dlon))
+    return points
 
-            idx += 1
 
-    return histories
+def generate_grid_histories_25(lon, lat, n_points=25, spacing_km=2):
+    """
+    Génère 25 points autour d'un point central (lon, lat), espacés d'environ spacing_km,
+    et récupère l'historique pour chacun.
+    """
+    # Générer une grille 5x5 et récupérer les historiques en parallèle
+    # (None pour les points en échec)
+    points = grid_points(lon, lat, 5, 5, spacing_km)[:n_points]
+    return fetch_all(lambda lat_i, lon_i: get_nasa_power_point(lat_i, lon_i), points, source="nasa_power")
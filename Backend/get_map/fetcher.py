@@ -0,0 +1,156 @@
+"""
+Concurrent fetching of weather points.
+
+Weather APIs are queried once per point; fetch_all() runs those calls on a
+thread pool sharing one keep-alive requests.Session, with a token-bucket rate
+limiter and retries with exponential backoff on transient errors.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from monitoring.log import get_logger
+from monitoring.metrics import WEATHER_RETRIES
+
+log = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Concurrent requests per fetch_all() call (and keep-alive connections per host)
+MAX_WORKERS = 8
+# Requests per second allowed to one API, and burst size
+RATE_LIMIT = 10.0
+RATE_BURST = 10
+# Attempts after the first one, and base delay of the exponential backoff
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, at most `capacity` stored.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Bucket size (burst)
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns the time waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+# One limiter per API, shared by every fetch_all() call of the process
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(source: str) -> TokenBucket:
+    """Process-wide rate limiter of a weather source"""
+    with _limiters_lock:
+        if source not in _limiters:
+            _limiters[source] = TokenBucket(RATE_LIMIT, RATE_BURST)
+        return _limiters[source]
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Keep-alive session shared by the weather fetchers (connection pool sized for MAX_WORKERS)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def is_transient(error: Exception) -> bool:
+    """Errors worth retrying: network failures, timeouts, 429 and 5xx responses"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def call_with_retry(fn: Callable[[], T], source: str, limiter: Optional[TokenBucket] = None,
+                    retries: int = MAX_RETRIES, backoff: float = BACKOFF_SECONDS) -> T:
+    """
+    Call fn(), waiting for the rate limiter before every attempt and retrying
+    transient errors with exponential backoff and jitter.
+
+    Raises:
+        The last error when every attempt failed, or any non-transient error
+    """
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not is_transient(e):
+                raise
+            delay = backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+            WEATHER_RETRIES.inc(source=source)
+            log.debug("🔁 Weather fetch retry", source=source, attempt=attempt + 1, delay=round(delay, 2),
+                      error=str(e))
+            time.sleep(delay)
+
+
+def fetch_all(fn: Callable[..., T], args: Sequence[tuple], source: str,
+              max_workers: int = MAX_WORKERS, retries: int = MAX_RETRIES,
+              backoff: float = BACKOFF_SECONDS) -> List[Optional[T]]:
+    """
+    Run fn(*a) for every tuple of `args` on a thread pool.
+
+    Args:
+        fn: Fetch function (e.g. get_nasa_power_point)
+        args: Positional arguments of each call
+        source: Weather source name, selects the rate limiter and labels metrics
+        max_workers: Concurrent calls
+        retries, backoff: See call_with_retry()
+
+    Returns:
+        Results in the order of `args`, None for calls that failed
+    """
+    limiter = get_limiter(source)
+
+    def run(call_args: tuple) -> Optional[T]:
+        try:
+            return call_with_retry(lambda: fn(*call_args), source, limiter, retries, backoff)
+        except Exception as e:
+            log.warning("⚠️ Weather fetch failed", source=source, point=str(call_args), error=str(e))
+            return None
+
+    if max_workers <= 1 or len(args) <= 1:
+        return [run(call_args) for call_args in args]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(args)),
+                            thread_name_prefix=f"fetch-{source}") as pool:
+        return list(pool.map(run, args))
@@ -1,34 +1,49 @@
 import openmeteo_requests
 
+from typing import Sequence
+
+import numpy as np
 import pandas as pd
 import requests_cache
 from retry_requests import retry
+from monitoring.metrics import record_cache
 
 # Setup the Open-Meteo API client with cache and retry on error
 cache_session = requests_cache.CachedSession('.cache', expire_after = 3600)
+# Track HTTP cache hit rate (hooks also fire for responses served from cache)
+cache_session.hooks["response"].append(
+    lambda response, *args, **kwargs: record_cache("open_meteo_http", getattr(response, "from_cache", False))
+)
 retry_session = retry(cache_session, retries = 5, backoff_factor = 0.2)
 openmeteo = openmeteo_requests.Client(session = retry_session)
 
-def get_history_info(lat: float, lon: float):
+# Daily archive queried by the game (one year of soil moisture / temperature)
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+DAILY_VARIABLES = ("soil_moisture_0_to_7cm_mean", "soil_temperature_28_to_100cm_mean")
+START_DATE = "2024-01-01"
+END_DATE = "2024-12-31"
+
+
+def _archive_params(lat, lon):
     # Make sure all required weather variables are listed here
     # The order of variables in hourly or daily is important to assign them correctly below
-    url = "https://archive-api.open-meteo.com/v1/archive"
-    params = {
+    return {
     "latitude": lat,
     "longitude": lon,
-    "start_date": "2024-01-01",
-    "end_date": "2024-12-31",
-    "daily": ["soil_moisture_0_to_7cm_mean", "soil_temperature_28_to_100cm_mean"],
+    "start_date": START_DATE,
+    "end_date": END_DATE,
+    "daily": list(DAILY_VARIABLES),
     }
-    responses = openmeteo.weather_api(url, params=params)
 
-    # Process first location. Add a for-loop for multiple locations or weather models
+
+def get_history_info(lat: float, lon: float):
+    responses = openmeteo.weather_api(ARCHIVE_URL, params=_archive_params(lat, lon))
+
+    # Process first location
     response = responses[0]
 
     # Process daily data. The order of variables needs to be the same as requested.
     daily = response.Daily()
-    daily_soil_moisture_0_to_7cm_mean = daily.Variables(0).ValuesAsNumpy()
-    daily_soil_temperature_28_to_100cm_mean = daily.Variables(1).ValuesAsNumpy()
 
     daily_data = {"date": pd.date_range(
     	start = pd.to_datetime(daily.Time(), unit = "s", utc = True),
@@ -37,8 +52,44 @@ def get_history_info(lat: float, lon: float):
     	inclusive = "left"
     )}
 
-    daily_data["soil_moisture_0_to_7cm_mean"] = daily_soil_moisture_0_to_7cm_mean
-    daily_data["soil_temperature_28_to_100cm_mean"] = daily_soil_temperature_28_to_100cm_mean
+    for index, name in enumerate(DAILY_VARIABLES):
+        daily_data[name] = daily.Variables(index).ValuesAsNumpy()
 
     daily_dataframe = pd.DataFrame(data = daily_data)
     return daily_dataframe
+
+
+def stack_daily_responses(responses, n_variables: int = len(DAILY_VARIABLES)) -> np.ndarray:
+    """
+    Stack the daily variables of Open-Meteo responses (one per location, ordered
+    by LocationId) into a (locations, days, variables) float64 array.
+    Shorter series are padded with NaN.
+    """
+    responses = sorted(responses, key=lambda response: response.LocationId())
+    series = [np.column_stack([response.Daily().Variables(k).ValuesAsNumpy() for k in range(n_variables)])
+              for response in responses]
+    days = max((len(values) for values in series), default=0)
+    stacked = np.full((len(series), days, n_variables), np.nan)
+    for index, values in enumerate(series):
+        stacked[index, :len(values)] = values
+    return stacked
+
+
+def get_history_info_batch(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """
+    Daily DAILY_VARIABLES for many locations in a single Open-Meteo request.
+
+    Args:
+        lats, lons: Coordinates of the locations (same length)
+
+    Returns:
+        (locations, days, variables) array, locations in input order
+    """
+    lats, lons = [float(lat) for lat in lats], [float(lon) for lon in lons]
+    if len(lats) != len(lons):
+        raise ValueError("lats and lons must have the same length")
+    if not lats:
+        return np.empty((0, 0, len(DAILY_VARIABLES)))
+
+    responses = openmeteo.weather_api(ARCHIVE_URL, params=_archive_params(lats, lons))
+    return stack_daily_responses(responses)
@@ -148,20 +148,29 @@
 
 
 import os
-from get_map.download_files import get_nasa_power_point
+from get_map.raster_layers import stack_layers
+from get_map.weather_field import nasa_surface_field
 from get_map.get_history_info import get_history_info
 import numpy as np
 import math
 import random
 import geopandas as gpd
+import shapely
 from shapely.geometry import Polygon, Point
-import rasterio
-from skimage.transform import resize
 import matplotlib.pyplot as plt
+from monitoring.metrics import WEATHER_FETCH
+from monitoring.log import get_logger
+
+log = get_logger(__name__)
 
 def generate_bean_gdf_and_mask(grid_size=(50,50), scale_range=(0.2,0.5),
-                               R_km=30.0, e=0.35, squash=0.75, x_offset_km=4.5, N=240):
+                               R_km=30.0, e=0.35, squash=0.75, x_offset_km=4.5, N=240, rng=None):
+    """
+    rng: random.Random à utiliser pour la taille/position (module random global si None),
+         afin qu'une graine reproduise exactement la même île
+    """
     ny, nx = grid_size
+    rng = rng or random
 
     # 1️⃣ Haricot original
     theta = np.linspace(0, 2*math.pi, N, endpoint=False)
@@ -177,11 +186,11 @@ def generate_bean_gdf_and_mask(grid_size=(50,50), scale_range=(0.2,0.5),
     poly_norm = Polygon([((px - minx)/(maxx - minx), (py - miny)/(maxy - miny)) for px, py in poly.exterior.coords])
 
     # 3️⃣ Choisir taille aléatoire et position aléatoire
-    scale_factor = random.uniform(*scale_range)
+    scale_factor = rng.uniform(*scale_range)
     # Plage pour que le polygone reste dans [0,1]
     max_offset = 1 - scale_factor
-    cx = random.uniform(0, max_offset)
-    cy = random.uniform(0, max_offset)
+    cx = rng.uniform(0, max_offset)
+    cy = rng.uniform(0, max_offset)
 
     poly_trans = Polygon([((px*scale_factor + cx), (py*scale_factor + cy)) for px, py in poly_norm.exterior.coords])
 
@@ -192,12 +201,8 @@ def generate_bean_gdf_and_mask(grid_size=(50,50), scale_range=(0.2,0.5),
     xs = np.linspace(0,1,nx)
     ys = np.linspace(0,1,ny)
     xx, yy = np.meshgrid(xs, ys[::-1])
-    mask = np.zeros((ny,nx), dtype=int)
-
-    for i in range(ny):
-        for j in range(nx):
-            if poly_trans.contains(Point(xx[i,j], yy[i,j])):
-                mask[i,j] = 1
+    # Test de tous les points en une fois (même résultat que Polygon.contains(Point))
+    mask = shapely.contains_xy(poly_trans, xx, yy).astype(int)
 
     return gdf, mask
 
@@ -209,25 +214,11 @@ def add_tif_layers_to_mask(mask, gdf, tif_files):
     tif_files: dict { "temperature": "temperature.tif", "humidity": "humidity.tif", ... }
     
     Retourne : np.array (ny, nx, N+1) avec N = nombre de tif_files + 1 pour la couche mask
-    """
-    ny, nx = mask.shape
-    combined_matrix = mask[..., np.newaxis]  # couche 0 = présence de l'île
-
-    for key, file in tif_files.items():
-        with rasterio.open(file) as src:
-            data = src.read(1)  # lire la première bande
-            transform = src.transform
-
-            # On peut créer un masque pour le polygone si besoin
-            # mais ici on rééchantillonne simplement la donnée sur la taille de mask
-            data_resized = resize(data, (ny, nx), order=1, preserve_range=True)
 
-            # Ne garder les valeurs que sur l'île
-            data_resized *= mask
-
-            combined_matrix = np.concatenate([combined_matrix, data_resized[..., np.newaxis]], axis=-1)
-
-    return combined_matrix
+    Seule la fenêtre du raster couvrant l'île est lue et rééchantillonnée
+    (avec cache), voir raster_layers.stack_layers.
+    """
+    return stack_layers(mask, tif_files)
 
 def save_combined_matrix_txt(combined_matrix, filename="combined_matrix.txt", layer_names=None):
     """
@@ -252,28 +243,26 @@ def save_combined_matrix_txt(combined_matrix, filename="combined_matrix.txt", la
                 line = f"{i},{j}," + ",".join(map(str, values))
                 f.write(line + "\n")
 
-    print(f"Matrice sauvegardée dans {filename}")
+    log.info("Matrice sauvegardée", path=filename)
 
 
-def get_map():
-    gdf, mask = generate_bean_gdf_and_mask(scale_range=(0.4,0.8))
+def get_map(grid_size=(50,50), seed=None):
+    rng = random.Random(seed) if seed is not None else None
+    gdf, mask = generate_bean_gdf_and_mask(grid_size=grid_size, scale_range=(0.4,0.8), rng=rng)
 
-    history_info=get_nasa_power_point(0.943227, 20.000000)
-
-    TEMP = history_info["T2M"]
-    HUM = history_info["RH2M"]
+    ny, nx = mask.shape
 
-    temp = TEMP[0]
-    hum = HUM[0]
+    # Météo du premier jour sur une grille 5x5 de points, interpolée sur la carte
+    with WEATHER_FETCH.time(source="nasa_power"):
+        field = nasa_surface_field(0, ny, nx)
 
-    ny, nx = mask.shape
     combined_matrix = np.zeros((ny, nx, 3))
 
     # Couche 0 : présence de l’île
     combined_matrix[:, :, 0] = mask
 
     # Couche 1 et 2 : valeurs météo uniquement sur l’île
-    combined_matrix[:, :, 1] = mask * temp
-    combined_matrix[:, :, 2] = mask * hum
-    print(combined_matrix.shape)
+    combined_matrix[:, :, 1] = mask * field[:, :, 0]  # T2M
+    combined_matrix[:, :, 2] = mask * field[:, :, 1]  # RH2M
+    log.debug("Map generated", shape=combined_matrix.shape)
     return combined_matrix
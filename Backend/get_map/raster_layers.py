@@ -0,0 +1,110 @@
+"""
+GeoTIFF layers sampled on the map grid.
+
+Each raster is stretched over the whole grid (as the original resize() of the
+full band did), but only the window covering the island's bounding box is
+read, resampled by rasterio to the box size in grid cells. Resampled windows
+are cached per (file, grid size, bounds) and layers are written into a
+preallocated (ny, nx, n_layers + 1) stack.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import os
+import threading
+
+import numpy as np
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.windows import Window
+
+from monitoring.log import get_logger
+from monitoring.metrics import record_cache
+
+log = get_logger(__name__)
+
+# Resampled windows kept in memory
+RASTER_CACHE_SIZE = 64
+
+# (row_min, row_max, col_min, col_max) in grid cells, max bounds exclusive
+Bounds = Tuple[int, int, int, int]
+
+_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def island_bounds(mask: np.ndarray) -> Optional[Bounds]:
+    """Bounding box of the island cells of a (ny, nx) mask, None when the mask is empty"""
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size == 0:
+        return None
+    return int(rows[0]), int(rows[-1]) + 1, int(cols[0]), int(cols[-1]) + 1
+
+
+def read_window(path: str, grid_size: Tuple[int, int], bounds: Bounds,
+                resampling: Resampling = Resampling.bilinear) -> np.ndarray:
+    """
+    Read the part of band 1 under `bounds` of a grid_size grid stretched over
+    the raster, resampled to (row_max - row_min, col_max - col_min) cells.
+    Nodata pixels are replaced by the mean of the valid ones.
+    """
+    ny, nx = grid_size
+    row_min, row_max, col_min, col_max = bounds
+    with rasterio.open(path) as src:
+        scale_y, scale_x = src.height / ny, src.width / nx
+        window = Window(col_min * scale_x, row_min * scale_y,
+                        (col_max - col_min) * scale_x, (row_max - row_min) * scale_y)
+        # GDAL picks an overview level itself when the file has some
+        data = src.read(1, window=window, out_shape=(row_max - row_min, col_max - col_min),
+                        resampling=resampling, masked=True)
+
+    data = data.astype(np.float64)
+    if np.ma.is_masked(data):
+        fill = data.mean() if data.count() else 0.0
+        data = data.filled(fill)
+    return np.asarray(data)
+
+
+def sample_layer(path: str, grid_size: Tuple[int, int], bounds: Bounds) -> np.ndarray:
+    """read_window() cached per (file, modification time, grid size, bounds); the result is read-only"""
+    path = os.path.abspath(path)
+    key = (path, os.path.getmtime(path), tuple(grid_size), tuple(bounds))
+    with _cache_lock:
+        layer = _cache.get(key)
+        if layer is not None:
+            _cache.move_to_end(key)
+    record_cache("raster_layer", layer is not None)
+
+    if layer is None:
+        layer = read_window(path, grid_size, bounds)
+        layer.setflags(write=False)
+        with _cache_lock:
+            _cache[key] = layer
+            if len(_cache) > RASTER_CACHE_SIZE:
+                _cache.popitem(last=False)
+        log.debug("🗺️ Raster window sampled", file=os.path.basename(path), bounds=bounds)
+    return layer
+
+
+def clear_raster_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def stack_layers(mask: np.ndarray, tif_files: Dict[str, str]) -> np.ndarray:
+    """
+    (ny, nx, len(tif_files) + 1) stack: layer 0 = mask, then one layer per
+    file in dict order, zero outside the island.
+    """
+    ny, nx = mask.shape
+    stack = np.zeros((ny, nx, len(tif_files) + 1))
+    stack[:, :, 0] = mask
+
+    bounds = island_bounds(mask)
+    if bounds is None:
+        return stack
+    row_min, row_max, col_min, col_max = bounds
+    island = mask[row_min:row_max, col_min:col_max]
+    for index, path in enumerate(tif_files.values(), start=1):
+        stack[row_min:row_max, col_min:col_max, index] = sample_layer(path, (ny, nx), bounds) * island
+    return stack
@@ -0,0 +1,184 @@
+"""
+Spatial weather fields.
+
+Weather is fetched on a coarse grid of points around the island (see
+download_files.grid_points) and bilinearly interpolated to the tile grid with
+NumPy, so tiles get spatially varying values without one network call or
+Python loop per tile. Point histories are fetched once per process and
+interpolated grids are cached per step.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence, Tuple
+import threading
+
+import numpy as np
+
+from get_map.download_files import generate_grid_histories_25, grid_points
+from monitoring.log import get_logger
+from monitoring.metrics import record_cache
+
+log = get_logger(__name__)
+
+# Reference location of the island (lat, lon)
+WEATHER_LAT = 0.943227
+WEATHER_LON = 20.000000
+# Coarse grid of weather points: 5x5, ~15 km apart (ERA5-Land / NASA POWER cells
+# are ~10-50 km, closer points would all return the same values)
+WEATHER_GRID_SHAPE = (5, 5)
+WEATHER_GRID_SPACING_KM = 15.0
+# Interpolated (ny, nx) grids kept per field
+FIELD_CACHE_SIZE = 16
+
+
+def interpolate_field(coarse: np.ndarray, ny: int, nx: int) -> np.ndarray:
+    """
+    Bilinear interpolation of a coarse (rows, cols, k) field to a (ny, nx, k) grid.
+    Coarse corners are aligned with the grid corners; row 0 is the top of the map.
+    """
+    rows, cols = coarse.shape[:2]
+    ys = np.linspace(0, rows - 1, ny)
+    xs = np.linspace(0, cols - 1, nx)
+    y0 = np.clip(np.floor(ys).astype(np.intp), 0, max(rows - 2, 0))
+    x0 = np.clip(np.floor(xs).astype(np.intp), 0, max(cols - 2, 0))
+    y1 = np.minimum(y0 + 1, rows - 1)
+    x1 = np.minimum(x0 + 1, cols - 1)
+    wy = (ys - y0)[:, None, None]
+    wx = (xs - x0)[None, :, None]
+
+    top = coarse[np.ix_(y0, x0)] * (1 - wx) + coarse[np.ix_(y0, x1)] * wx
+    bottom = coarse[np.ix_(y1, x0)] * (1 - wx) + coarse[np.ix_(y1, x1)] * wx
+    return top * (1 - wy) + bottom * wy
+
+
+def _fill_missing(values: np.ndarray) -> np.ndarray:
+    """
+    Replace missing (NaN) values of a (rows, cols, days, k) series, day by day,
+    by the mean of the points that have that day. A point missing a few days
+    (shorter series padded with NaN) keeps all its other days.
+    """
+    missing = np.isnan(values)
+    if not missing.any():
+        return values
+    available = ~missing.all(axis=(0, 1))
+    if not available.all():
+        raise ValueError(f"No weather point has data for day {int(np.argmin(available.all(axis=-1)))}")
+    log.warning("⚠️ Weather values missing, using the mean of the other points for those days",
+                points=int(missing.any(axis=(2, 3)).sum()), values=int(missing.sum()))
+    means = np.nanmean(values, axis=(0, 1))
+    values[missing] = np.broadcast_to(means, values.shape)[missing]
+    return values
+
+
+class WeatherField:
+    """
+    Daily weather series on a coarse grid of points, interpolated on demand.
+
+    Args:
+        fetch_batch: fetch_batch(lats, lons) -> (locations, days, k) array
+                     (e.g. get_history_info_batch)
+        lat, lon: South-west point of the grid
+        shape: Coarse grid (rows, cols)
+        spacing_km: Distance between points
+    """
+
+    def __init__(self, fetch_batch: Callable, lat: float = WEATHER_LAT, lon: float = WEATHER_LON,
+                 shape: Tuple[int, int] = WEATHER_GRID_SHAPE,
+                 spacing_km: float = WEATHER_GRID_SPACING_KM):
+        self.fetch_batch = fetch_batch
+        self.shape = shape
+        self.points = grid_points(lon, lat, shape[0], shape[1], spacing_km)
+        self._series: Optional[np.ndarray] = None  # (rows, cols, days, k)
+        self._grids: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def series(self) -> np.ndarray:
+        """(rows, cols, days, k) daily values, fetched on first use"""
+        if self._series is None:
+            lats, lons = zip(*self.points)
+            values = np.asarray(self.fetch_batch(lats, lons), dtype=np.float64)
+            # grid_points() goes north row by row, row 0 of the map is the north
+            values = values.reshape(*self.shape, *values.shape[1:])[::-1]
+            self._series = _fill_missing(np.ascontiguousarray(values))
+        return self._series
+
+    def coarse(self, day_index: int) -> np.ndarray:
+        """(rows, cols, k) values of a day (the last day when past the end of the series)"""
+        series = self.series()
+        return series[:, :, min(day_index, series.shape[2] - 1)]
+
+    def grid(self, day_index: int, ny: int, nx: int) -> np.ndarray:
+        """(ny, nx, k) interpolated values of a day, cached"""
+        key = (day_index, ny, nx)
+        with self._lock:
+            grid = self._grids.get(key)
+            record_cache("weather_field", grid is not None)
+            if grid is None:
+                grid = interpolate_field(self.coarse(day_index), ny, nx)
+                self._grids[key] = grid
+                if len(self._grids) > FIELD_CACHE_SIZE:
+                    self._grids.popitem(last=False)
+            else:
+                self._grids.move_to_end(key)
+        return grid
+
+
+# Fields shared by the whole process, one per (fetch function, origin)
+_fields: Dict[tuple, WeatherField] = {}
+
+
+def get_soil_field(fetch_batch: Callable, origin: Optional[Tuple[float, float]] = None) -> WeatherField:
+    """
+    Open-Meteo soil moisture / temperature field used by turns (fetch_batch = get_history_info_batch).
+    origin: south-west (lat, lon) of the grid, the island's reference location when None
+    """
+    lat, lon = origin or (WEATHER_LAT, WEATHER_LON)
+    key = (fetch_batch, lat, lon)
+    field = _fields.get(key)
+    if field is None:
+        field = _fields[key] = WeatherField(fetch_batch, lat=lat, lon=lon)
+    return field
+
+
+# Coarse NASA POWER fields per day, kept once every point was fetched
+_nasa_coarse: Dict[int, np.ndarray] = {}
+# Flat air temperature (°C) / relative humidity (%) when no NASA POWER point answers
+DEFAULT_SURFACE_WEATHER = (25.0, 70.0)
+
+
+def _surface_values(history, day_index: int) -> Tuple[float, float]:
+    row = min(day_index, len(history) - 1)
+    return history["T2M"].iloc[row], history["RH2M"].iloc[row]
+
+
+def nasa_surface_field(day_index: int, ny: int, nx: int) -> np.ndarray:
+    """
+    (ny, nx, 2) air temperature (T2M) and relative humidity (RH2M) from the
+    25 NASA POWER points of generate_grid_histories_25, interpolated to the grid.
+
+    When a point is missing the map is not failed: it gets the flat values of
+    the reference point (WEATHER_LAT, WEATHER_LON, the single point maps used
+    before), or DEFAULT_SURFACE_WEATHER when that one is missing too. Such
+    fallbacks are not cached, so the next map fetches the points again.
+    """
+    coarse = _nasa_coarse.get(day_index)
+    record_cache("nasa_field", coarse is not None)
+    if coarse is None:
+        histories = generate_grid_histories_25(WEATHER_LON, WEATHER_LAT, spacing_km=WEATHER_GRID_SPACING_KM)
+        missing = sum(history is None for history in histories)
+        if missing == 0:
+            coarse = np.array([_surface_values(history, day_index) for history in histories], dtype=np.float64)
+            # Rows of generate_grid_histories_25 go north, row 0 of the map is the north
+            coarse = np.ascontiguousarray(coarse.reshape(*WEATHER_GRID_SHAPE, 2)[::-1])
+            _nasa_coarse[day_index] = coarse
+        else:
+            reference = histories[0] if histories else None  # grid_points() starts at the reference point
+            if reference is not None:
+                log.warning("⚠️ NASA POWER points missing, using the reference point for the whole map",
+                            missing=missing)
+                values = _surface_values(reference, day_index)
+            else:
+                log.error("❌ NASA POWER reference point missing, using default surface weather",
+                          missing=missing, default=DEFAULT_SURFACE_WEATHER)
+                values = DEFAULT_SURFACE_WEATHER
+            coarse = np.broadcast_to(np.asarray(values, dtype=np.float64), (*WEATHER_GRID_SHAPE, 2))
+    return interpolate_field(coarse, ny, nx)
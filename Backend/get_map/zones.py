@@ -0,0 +1,164 @@
+"""
+Zone-aware maps built from the real GeoJSON polygons of data/masks.
+
+A zone is one of the four climates of the game rules (froide, aride,
+tropicale, tempere). Regions are the bean polygons of data/masks, each in one
+zone; the zone selects the GeoTIFFs sampled for the initial soil moisture and
+temperature. Rasterized masks and sampled layers are cached per
+(region, grid size) and can be precomputed at startup with warm_zone_maps().
+"""
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+import glob
+import json
+import math
+import os
+import random
+import threading
+
+import numpy as np
+import shapely
+from shapely.geometry import shape
+
+from get_map.raster_layers import stack_layers
+from monitoring.log import get_logger
+from monitoring.metrics import record_cache
+
+log = get_logger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# Zone ids used by Tile.zone_id (see game.mechanics.HUMIDITY_THRESHOLDS)
+ZONE_IDS = {"froide": 1, "aride": 2, "tropicale": 3, "tempere": 4}
+
+# Region -> (zone, GeoJSON file in data/masks)
+REGIONS = {
+    "paris": ("tempere", "farmit_paris_bean.geojson"),
+    "amazon": ("tropicale", "farmit_amazon_central_bean.geojson"),
+    "kinshasa": ("tropicale", "farmit_kinshasa_brazzaville_bean.geojson"),
+    "biskra": ("aride", "farmit_north_africa_arid_biskra_bean.geojson"),
+}
+# Region used when only a zone is requested (no polygon for "froide": synthetic bean)
+DEFAULT_REGIONS = {"tempere": "paris", "tropicale": "amazon", "aride": "biskra"}
+
+# GeoTIFF folders, in map layer order (1 = soil moisture, 2 = temperature)
+TIF_DIRS = {"humidity": "humidite", "temperature": "temperature"}
+# MODIS LST is stored as Kelvin / 0.02
+LST_SCALE = 0.02
+KELVIN = 273.15
+
+# Share of the grid spanned by the polygon's longest side
+POLYGON_FILL = 0.8
+
+
+class ZoneSpec(NamedTuple):
+    """Resolved zone request: key stored on GameState, climate zone, zone id and polygon region"""
+    key: str
+    zone: str
+    zone_id: int
+    region: Optional[str]
+
+
+def resolve_zone(name: str) -> ZoneSpec:
+    """
+    Resolve a zone ("tempere") or region ("paris") name.
+
+    Raises:
+        ValueError: On unknown names
+    """
+    name = name.strip().lower()
+    if name in REGIONS:
+        zone = REGIONS[name][0]
+        return ZoneSpec(name, zone, ZONE_IDS[zone], name)
+    if name in ZONE_IDS:
+        region = DEFAULT_REGIONS.get(name)
+        return ZoneSpec(region or name, name, ZONE_IDS[name], region)
+    raise ValueError(f"Unknown zone '{name}', available: {', '.join(list(ZONE_IDS) + list(REGIONS))}")
+
+
+def zone_tif_files(zone: str) -> Dict[str, str]:
+    """{layer: GeoTIFF path} of a zone, files being prefixed by the zone name"""
+    files = {}
+    for layer, folder in TIF_DIRS.items():
+        matches = sorted(glob.glob(os.path.join(DATA_DIR, folder, f"{zone}_*.tif")))
+        if not matches:
+            raise FileNotFoundError(f"No {layer} GeoTIFF for zone '{zone}' in {folder}")
+        files[layer] = matches[0]
+    return files
+
+
+@lru_cache(maxsize=None)
+def load_region_polygon(region: str):
+    """First polygon of a region's GeoJSON file (WGS84)"""
+    with open(os.path.join(DATA_DIR, "masks", REGIONS[region][1])) as f:
+        return shape(json.load(f)["features"][0]["geometry"])
+
+
+def rasterize_polygon(polygon, grid_size: Tuple[int, int], fill: float = POLYGON_FILL) -> np.ndarray:
+    """
+    (ny, nx) 0/1 mask of a lon/lat polygon centred on the grid, its longest
+    side spanning `fill` of the grid (longitudes scaled by cos(latitude)).
+    """
+    ny, nx = grid_size
+    minx, miny, maxx, maxy = polygon.bounds
+    lat_scale = math.cos(math.radians((miny + maxy) / 2))
+    width, height = (maxx - minx) * lat_scale, maxy - miny
+    size = max(width, height) / fill
+
+    # Cell centres in polygon coordinates, row 0 at the north (as generate_bean_gdf_and_mask)
+    xs = (minx + maxx) / 2 + (np.linspace(0, 1, nx) - 0.5) * size / lat_scale
+    ys = (miny + maxy) / 2 + (np.linspace(0, 1, ny) - 0.5) * size
+    xx, yy = np.meshgrid(xs, ys[::-1])
+    return shapely.contains_xy(polygon, xx, yy).astype(int)
+
+
+def build_zone_map(spec: ZoneSpec, grid_size: Tuple[int, int]) -> np.ndarray:
+    """
+    (ny, nx, 3) map matrix of a zone: mask, soil moisture (m3/m3) and land
+    surface temperature (°C) sampled from the zone's GeoTIFFs.
+    """
+    if spec.region is not None:
+        mask = rasterize_polygon(load_region_polygon(spec.region), grid_size)
+    else:
+        from get_map.get_map import generate_bean_gdf_and_mask
+        _, mask = generate_bean_gdf_and_mask(grid_size=grid_size, scale_range=(0.4, 0.8),
+                                             rng=random.Random(spec.zone_id))
+
+    matrix = stack_layers(mask, zone_tif_files(spec.zone))
+    island = mask == 1
+    matrix[:, :, 2] = np.where(island, matrix[:, :, 2] * LST_SCALE - KELVIN, 0)
+    return matrix
+
+
+_zone_maps: Dict[tuple, np.ndarray] = {}
+_zone_maps_lock = threading.Lock()
+
+
+def get_zone_map(spec: ZoneSpec, grid_size: Tuple[int, int]) -> np.ndarray:
+    """build_zone_map() cached per (region or zone, grid size); the result is read-only"""
+    key = (spec.key, tuple(grid_size))
+    with _zone_maps_lock:
+        matrix = _zone_maps.get(key)
+        record_cache("zone_map", matrix is not None)
+        if matrix is None:
+            matrix = build_zone_map(spec, grid_size)
+            matrix.setflags(write=False)
+            _zone_maps[key] = matrix
+    return matrix
+
+
+def warm_zone_maps(grid_size: Tuple[int, int] = (50, 50)) -> int:
+    """Precompute the map of every region and polygon-less zone. Returns the number of maps built"""
+    keys = list(REGIONS) + [zone for zone in ZONE_IDS if zone not in DEFAULT_REGIONS]
+    for name in keys:
+        get_zone_map(resolve_zone(name), grid_size)
+    log.info("🗺️ Zone maps precomputed", maps=len(keys), rows=grid_size[0], cols=grid_size[1])
+    return len(keys)
+
+
+def weather_origin(key: Optional[str]) -> Optional[Tuple[float, float]]:
+    """South-west (lat, lon) corner of a region's polygon, None for synthetic maps"""
+    if key not in REGIONS:
+        return None
+    minx, miny, _, _ = load_region_polygon(key).bounds
+    return miny, minx
@@ -1,9 +1,11 @@
 from chatbot import ChatRequest, ChatResponse, build_input_blocks
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from openai import OpenAI
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import sys
 import os
 import fitz
@@ -11,10 +13,18 @@ import fitz
 # Ajouter le dossier Backend au path pour les imports
 
 from get_map.get_map import get_map
+from get_map.zones import warm_zone_maps
 from in_game.get_event import get_event
-from database.models import Base
-from database.session import engine, get_db
+from database.session import SessionLocal, engine, get_db, init_db
+from game.map_pool import map_pool
+from game.chunks import CHUNK_SIZE, backfill_chunk_ids, make_viewport, parse_chunks, slice_chunks
+from game.compression import CompressionMiddleware
+from game.http_cache import cached_response
+from game.revision import revision_tracker
 from routers import game, tile
+from monitoring.metrics import REGISTRY, CHAT_TOKENS, instrument_engine
+from monitoring.middleware import MetricsMiddleware
+from monitoring.log import configure_logging, get_logger
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
@@ -23,6 +33,10 @@ load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Queued structured logging (levels configurable through FARMIT_LOG_* variables)
+configure_logging()
+log = get_logger(__name__)
+
 app = FastAPI(
     title="Farm It API",
     version="1.0.0",
@@ -32,8 +46,30 @@ app = FastAPI(
 # Database initialization on startup
 @app.on_event("startup")
 async def startup_event():
-    """Create database tables on application startup"""
-    Base.metadata.create_all(bind=engine)
+    """Create database tables (and any columns added since) on application startup"""
+    init_db(engine)
+    with SessionLocal() as db:
+        if backfill_chunk_ids(db):
+            db.commit()
+        # Current game revision, for ETags and 304 responses
+        revision_tracker.load(db)
+    # Zone maps are precomputed so /game/start?zone= is a cache hit
+    try:
+        warm_zone_maps()
+    except Exception:
+        log.exception("❌ Zone maps could not be precomputed")
+    # Pre-generated synthetic maps, refilled in worker processes
+    map_pool.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the map pool workers"""
+    map_pool.shutdown()
+
+
+# gzip / brotli / zstd response compression (innermost, so metrics include it)
+app.add_middleware(CompressionMiddleware)
 
 # Configuration CORS
 app.add_middleware(
@@ -44,6 +80,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics (latency, status, SQL statements per route)
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+
 # Include routers
 app.include_router(game.router, prefix="/game", tags=["game"])
 app.include_router(tile.router, prefix="/tile", tags=["tile"])
@@ -57,7 +97,16 @@ async def root():
     return {"message": "Farm It API", "version": "1.0.0"}
 
 @app.get("/get_map")
-async def api_get_map(db: Session = Depends(get_db)):
+async def api_get_map(
+    request: Request,
+    chunk: Optional[List[str]] = Query(None, description="Chunks to return, as 'row,col' (repeatable)"),
+    row_min: Optional[int] = Query(None, description="Bounding box first row (inclusive)"),
+    row_max: Optional[int] = Query(None, description="Bounding box last row (inclusive)"),
+    col_min: Optional[int] = Query(None, description="Bounding box first column (inclusive)"),
+    col_max: Optional[int] = Query(None, description="Bounding box last column (inclusive)"),
+    layers: Optional[str] = Query(None, description="Comma-separated layers to return (default: all)"),
+    db: Session = Depends(get_db)
+):
     """
     Returns the current game map:
     - If game is initialized: reconstruct map from tiles in database
@@ -67,35 +116,79 @@ async def api_get_map(db: Session = Depends(get_db)):
     - Couche 0 : présence de l'île (mask)
     - Couche 1 : humidité du sol (soil_moisture)
     - Couche 2 : température du sol (soil_temperature)
+
+    With `chunk` parameters, only those CHUNK_SIZE x CHUNK_SIZE chunks are returned
+    (each with its [row, col] and grid origin) instead of the whole matrix.
+    With a bounding box, only that window is returned (with its origin).
+    `layers` keeps only the listed layers.
+    Once a game exists, responses carry ETag / Last-Modified validators of the
+    game revision (304 on a match) and are cached until the next state change.
     """
     try:
-        from game.state import get_map_from_tiles
-        from database.models import GameState
-
-        # Check if game is initialized
-        game_state = db.query(GameState).first()
-
-        if game_state:
-            # Game initialized - use stored tiles
-            print("📍 [/get_map] Game initialized, reconstructing map from tiles")
-            combined_matrix = get_map_from_tiles(db)
-        else:
-            # No game - generate new random map for preview
-            print("📍 [/get_map] No game initialized, generating random preview map")
-            combined_matrix = get_map()
-
-        # Convertir le numpy array en liste pour la sérialisation JSON
-        print(f"📍 [/get_map] Returning map with shape: {combined_matrix.shape}")
-        return {
-            "status": "success",
-            "shape": combined_matrix.shape,
-            "data": combined_matrix.tolist(),
-            "layers": ["mask", "soil_moisture", "soil_temperature"]
-        }
+        def build():
+            from game.state import MAP_LAYERS, get_map_chunks, get_map_from_tiles, get_map_window, parse_layers
+            from database.models import GameState
+
+            # Check if game is initialized
+            game_state = db.query(GameState).first()
+            preview = None
+            if game_state:
+                ny, nx = game_state.map_rows, game_state.map_cols
+            else:
+                # No game - generate new random map for preview
+                log.info("📍 No game initialized, generating random preview map")
+                preview = get_map()
+                ny, nx = preview.shape[:2]
+
+            try:
+                layer_index = parse_layers(layers) if layers else list(range(len(MAP_LAYERS)))
+                chunks = parse_chunks(chunk, ny, nx) if chunk else None
+                viewport = make_viewport(row_min, row_max, col_min, col_max, ny, nx)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            layer_names = [MAP_LAYERS[i] for i in layer_index]
+
+            if chunks is not None:
+                map_chunks = get_map_chunks(db, chunks) if game_state else slice_chunks(preview, chunks)
+                return {
+                    "status": "success",
+                    "shape": [ny, nx, len(layer_index)],
+                    "chunk_size": CHUNK_SIZE,
+                    "chunks": [{**c, "data": c["data"][:, :, layer_index].tolist()} for c in map_chunks],
+                    "layers": layer_names
+                }
+
+            if viewport is not None:
+                if game_state:
+                    combined_matrix = get_map_window(db, viewport)
+                else:
+                    combined_matrix = preview[viewport.row_min:viewport.row_max + 1,
+                                              viewport.col_min:viewport.col_max + 1]
+            elif game_state:
+                # Game initialized - use stored tiles
+                combined_matrix = get_map_from_tiles(db)
+            else:
+                combined_matrix = preview
+            if layers:
+                combined_matrix = combined_matrix[:, :, layer_index]
+
+            # Convertir le numpy array en liste pour la sérialisation JSON
+            response = {
+                "status": "success",
+                "shape": combined_matrix.shape,
+                "data": combined_matrix.tolist(),
+                "layers": layer_names
+            }
+            if viewport is not None:
+                response["origin"] = [viewport.row_min, viewport.col_min]
+                response["map_shape"] = [ny, nx]
+            return response
+
+        return await cached_response(request, db, lambda: JSONResponse(jsonable_encoder(build())))
+    except HTTPException:
+        raise
     except Exception as e:
-        import traceback
-        print(f"❌ ERROR in /get_map: {e}")
-        print(traceback.format_exc())
+        log.exception("❌ Error in /get_map")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/get_event")
@@ -121,6 +214,14 @@ async def api_get_event(request: EventRequest):
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Expose request, turn, weather, cache and chat token metrics
+    in the Prometheus text format.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 
 # --- Fonction pour lire le PDF ---
 def extract_text_from_pdf(file_path: str) -> str:
@@ -162,6 +263,11 @@ def chat(req: ChatRequest):
         usage_in = getattr(resp, "usage", None).input_tokens if getattr(resp, "usage", None) else None
         usage_out = getattr(resp, "usage", None).output_tokens if getattr(resp, "usage", None) else None
 
+        if usage_in:
+            CHAT_TOKENS.inc(usage_in, model=req.model, direction="input")
+        if usage_out:
+            CHAT_TOKENS.inc(usage_out, model=req.model, direction="output")
+
         return ChatResponse(
             text=text,
             model=req.model,
@@ -0,0 +1,196 @@
+"""
+Structured, leveled logging for the backend.
+
+Records are pushed to a bounded in-memory queue by the request thread and
+formatted/written by a background listener thread, so logging never blocks
+on stdout. Configuration comes from the environment:
+
+- FARMIT_LOG_LEVEL: root level (default INFO)
+- FARMIT_LOG_LEVELS: per-module levels, e.g. "game.state=DEBUG,get_map=WARNING"
+- FARMIT_LOG_FORMAT: "json" (default) or "text"
+"""
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+
+# Attributes present on every LogRecord; anything else was passed as a field
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_configure_lock = threading.Lock()
+
+
+class StructuredFormatter(logging.Formatter):
+    """Render records as one JSON object per line, including extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "func": record.funcName,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable format for local development: message followed by key=value fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(
+            f"{key}={value}" for key, value in record.__dict__.items()
+            if key not in _RESERVED_ATTRS and not key.startswith("_")
+        )
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line = f"{line} | {fields}"
+        if record.exc_info:
+            line = f"{line}\n{self.formatException(record.exc_info)}"
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only one record out of `sample_every` for high-frequency messages.
+    Records opt in through the `sample_every` field; counts are kept per
+    (logger, message template) and the kept record reports how many were seen.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._counts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = record.__dict__.pop("sample_every", None)
+        if not every or every <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        if (count - 1) % every:
+            return False
+        record.sampled = f"1/{every}"
+        record.seen = count
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    Logger adapter accepting structured fields as keyword arguments:
+
+        log.info("Turn complete", step=3, crops_died=1)
+        log.debug("State polled", tiles=1085, sample_every=100)
+
+    Fields named like a LogRecord attribute (args, name, msg...) would make
+    logging raise, so they are renamed with a "field_" prefix (field_args).
+    """
+
+    def process(self, msg, kwargs):
+        extra = dict(kwargs.pop("extra", None) or {})
+        for key in list(kwargs):
+            if key not in ("exc_info", "stack_info", "stacklevel"):
+                extra[key] = kwargs.pop(key)
+        kwargs["extra"] = {
+            f"field_{key}" if key in _RESERVED_ATTRS else key: value for key, value in extra.items()
+        }
+        return msg, kwargs
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level: Optional[str] = None,
+                      module_levels: Optional[Dict[str, str]] = None,
+                      fmt: Optional[str] = None,
+                      queue_size: int = 10000) -> None:
+    """
+    Install the queued structured handler on the root logger.
+    Safe to call several times; only the first call installs handlers.
+
+    Args:
+        level: Root log level (defaults to FARMIT_LOG_LEVEL or INFO)
+        module_levels: Per-logger levels (defaults to FARMIT_LOG_LEVELS)
+        fmt: "json" or "text" (defaults to FARMIT_LOG_FORMAT or json)
+        queue_size: Maximum number of pending records before dropping
+    """
+    global _listener, _queue_handler
+
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        level = (level or os.getenv("FARMIT_LOG_LEVEL", "INFO")).upper()
+        if module_levels is None:
+            module_levels = _parse_levels(os.getenv("FARMIT_LOG_LEVELS", ""))
+        fmt = (fmt or os.getenv("FARMIT_LOG_FORMAT", "json")).lower()
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(TextFormatter() if fmt == "text" else StructuredFormatter())
+
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        queue_handler = DroppingQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        _queue_handler = queue_handler
+
+        for name, module_level in module_levels.items():
+            logging.getLogger(name).setLevel(module_level)
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush pending records and stop the listener thread"""
+    global _listener, _queue_handler
+    with _configure_lock:
+        if _queue_handler is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+            _queue_handler = None
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """Return a structured logger for the given module name"""
+    return StructuredLogger(logging.getLogger(name), {})
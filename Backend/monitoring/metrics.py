@@ -0,0 +1,259 @@
+"""
+In-process metrics registry rendered in the Prometheus text exposition format.
+Metrics are plain counters/histograms guarded by a lock, so recording a sample
+costs a dict lookup and a bisect, without any external dependency.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Default latency buckets (seconds), tuned for an API answering in ms to a few s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for per-request database query counts
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500, 1000, 5000)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """Base class holding name, help text and label names"""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall-clock duration of the wrapped block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._values.get(self._key(labels))
+        return int(sum(series[:-1])) if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._values.items()]
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            le = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "farmit_http_requests_total", "HTTP requests handled", ["method", "route", "status"])
+HTTP_LATENCY = REGISTRY.histogram(
+    "farmit_http_request_duration_seconds", "HTTP request latency", ["method", "route"])
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "farmit_http_requests_in_flight", "HTTP requests currently being handled")
+DB_QUERIES = REGISTRY.histogram(
+    "farmit_db_queries_per_request", "SQL statements executed per HTTP request", ["route"],
+    buckets=QUERY_COUNT_BUCKETS)
+DB_QUERIES_TOTAL = REGISTRY.counter(
+    "farmit_db_queries_total", "SQL statements executed")
+TURN_DURATION = REGISTRY.histogram(
+    "farmit_turn_duration_seconds", "Duration of advance_to_next_step")
+WEATHER_FETCH = REGISTRY.histogram(
+    "farmit_weather_fetch_duration_seconds", "Duration of weather data fetches", ["source"])
+WEATHER_RETRIES = REGISTRY.counter(
+    "farmit_weather_fetch_retries_total", "Weather requests retried after a transient error", ["source"])
+MAP_POOL_DEPTH = REGISTRY.gauge(
+    "farmit_map_pool_depth", "Pre-generated maps ready in the pool", ["grid"])
+MAP_POOL_REFILL = REGISTRY.histogram(
+    "farmit_map_pool_refill_seconds", "Time from map request to pre-generated map ready", ["grid"])
+CACHE_REQUESTS = REGISTRY.counter(
+    "farmit_cache_requests_total", "Cache lookups by cache and result (hit/miss)", ["cache", "result"])
+COMPRESSION_SECONDS = REGISTRY.histogram(
+    "farmit_compression_duration_seconds", "Time spent compressing response bodies", ["encoding"])
+COMPRESSION_BYTES = REGISTRY.counter(
+    "farmit_compression_bytes_total", "Response bytes before (in) and after (out) compression", ["encoding", "stage"])
+CHAT_TOKENS = REGISTRY.counter(
+    "farmit_chat_tokens_total", "OpenAI tokens consumed by /chat", ["model", "direction"])
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup for the hit-rate counters"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+# Per-request SQL statement counter, set by the metrics middleware
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("farmit_query_counter", default=None)
+
+
+def start_query_count():
+    """Start counting SQL statements for the current request context"""
+    return _query_counter.set([0])
+
+
+def stop_query_count(token) -> int:
+    """Stop counting and return the number of statements executed"""
+    counter = _query_counter.get()
+    _query_counter.reset(token)
+    return counter[0] if counter else 0
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    DB_QUERIES_TOTAL.inc()
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count every statement executed on the given engine"""
+    if not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
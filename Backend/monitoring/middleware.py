@@ -0,0 +1,52 @@
+import time
+
+from monitoring.metrics import (
+    HTTP_REQUESTS,
+    HTTP_LATENCY,
+    HTTP_IN_FLIGHT,
+    DB_QUERIES,
+    start_query_count,
+    stop_query_count,
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and SQL statement count per route.
+    Routes are labelled by their template (e.g. /tile/{tile_id}/buy) to keep
+    label cardinality bounded; unmatched paths are grouped under "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        token = start_query_count()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            queries = stop_query_count(token)
+            HTTP_IN_FLIGHT.dec()
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "GET")
+
+            HTTP_LATENCY.observe(duration, method=method, route=route_path)
+            HTTP_REQUESTS.inc(method=method, route=route_path, status=str(status_code))
+            DB_QUERIES.observe(queries, route=route_path)
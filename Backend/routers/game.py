@@ -1,45 +1,131 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Literal, Optional, Union
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+from database.models import GameState
 from database.session import get_db
-from game.state import initialize_game, get_current_game_state, advance_to_next_step
-from game.schemas import GameStateResponse
+from game.chunks import make_viewport, parse_chunks
+from game.exceptions import GameBusyError
+from game.http_cache import cached_response
+from game.state import initialize_game, get_current_game_state, get_game_state_payload, get_game_state_columns, advance_to_next_step
+from game.replay import export_game, rebuild_game
+from game.schemas import GameStateColumnsResponse, GameStateResponse, TileResponse
+from game.serialization import SERIALIZERS, TILE_LAYOUTS, FastJSONResponse
+from get_map.zones import resolve_zone
+from monitoring.log import get_logger
+
+log = get_logger(__name__)
 
 router = APIRouter()
 
 
-@router.get("/state", response_model=GameStateResponse)
-async def get_game_state(db: Session = Depends(get_db)):
+@router.get("/state", response_model=Union[GameStateResponse, GameStateColumnsResponse])
+async def get_game_state(
+    request: Request,
+    chunk: Optional[List[str]] = Query(None, description="Chunks to return, as 'row,col' (repeatable)"),
+    row_min: Optional[int] = Query(None, description="Bounding box first row (inclusive)"),
+    row_max: Optional[int] = Query(None, description="Bounding box last row (inclusive)"),
+    col_min: Optional[int] = Query(None, description="Bounding box first column (inclusive)"),
+    col_max: Optional[int] = Query(None, description="Bounding box last column (inclusive)"),
+    fields: Optional[str] = Query(None, description="Comma-separated tile fields to return (id, grid_i and grid_j are always included)"),
+    serializer: Literal[SERIALIZERS] = Query("pydantic", description="'orjson' skips Pydantic models and encodes rows with orjson (faster on large islands)"),
+    layout: Literal[TILE_LAYOUTS] = Query("rows", description="'columns' sends tiles as one array per field (tile_columns), enums as codes into tile_enums"),
+    db: Session = Depends(get_db)
+):
     """
     Get current game state including player resources and all tiles.
+    With `chunk` parameters and/or a bounding box, only the matching tiles are
+    returned; `fields` limits the tile fields sent. Both serializers return
+    the same document. `layout=columns` replaces `tiles` by `tile_count`,
+    `tile_columns` and `tile_enums` (GameStateColumnsResponse).
+
+    Responses carry an ETag / Last-Modified of the game revision: a matching
+    If-None-Match or If-Modified-Since gets a 304, and bodies are cached until
+    the next state change.
     """
     try:
-        return get_current_game_state(db)
-    except ValueError as e:
+        return await cached_response(request, db, lambda: _render_game_state(
+            db, chunk, row_min, row_max, col_min, col_max, fields, serializer, layout))
+    except HTTPException:
+        raise
+    except (ValueError, LookupError) as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving game state: {str(e)}")
 
 
+def _render_game_state(db: Session, chunk: Optional[List[str]], row_min: Optional[int], row_max: Optional[int],
+                       col_min: Optional[int], col_max: Optional[int], fields: Optional[str],
+                       serializer: str, layout: str) -> JSONResponse:
+    """Full /game/state response for the given query parameters"""
+    chunks = viewport = None
+    tile_fields = None
+    try:
+        if fields:
+            tile_fields = {"id", "grid_i", "grid_j"} | {f.strip() for f in fields.split(",") if f.strip()}
+            unknown = tile_fields - set(TileResponse.model_fields)
+            if unknown:
+                raise ValueError(f"Unknown tile fields: {', '.join(sorted(unknown))}")
+        if chunk or any(v is not None for v in (row_min, row_max, col_min, col_max)):
+            game_state = db.query(GameState).first()
+            if not game_state:
+                raise LookupError("Game not initialized. Call initialize_game() first.")
+            ny, nx = game_state.map_rows, game_state.map_cols
+            chunks = parse_chunks(chunk, ny, nx) if chunk else None
+            viewport = make_viewport(row_min, row_max, col_min, col_max, ny, nx)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if layout == "columns":
+        return FastJSONResponse(get_game_state_columns(db, chunks=chunks, viewport=viewport, fields=tile_fields))
+    if serializer == "orjson":
+        return FastJSONResponse(get_game_state_payload(db, chunks=chunks, viewport=viewport, fields=tile_fields))
+
+    state = get_current_game_state(db, chunks=chunks, viewport=viewport)
+    if tile_fields is None:
+        return JSONResponse(state.model_dump(mode="json"))
+    return JSONResponse(state.model_dump(mode="json", include={
+        **{name: True for name in GameStateResponse.model_fields if name != "tiles"},
+        "tiles": {"__all__": tile_fields},
+    }))
+
+
 @router.post("/start", response_model=GameStateResponse)
-async def start_game(db: Session = Depends(get_db)):
+async def start_game(
+    seed: Optional[int] = None,
+    zone: Optional[str] = Query(None, description="Zone (froide, aride, tropicale, tempere) or region (paris, amazon, kinshasa, biskra)"),
+    db: Session = Depends(get_db)
+):
     """
     Start a new game. Resets all game state and creates fresh map.
+    Pass `seed` to reproduce a previous map, `zone` to play on a real region
+    with that zone's climate layers. A start while the current game is
+    advancing or being replayed gets a 409.
     Returns the complete game state including map structure.
     """
     try:
-        print("🚀 [POST /game/start] Received request to start new game")
-        initialize_game(db)
-        print("🚀 [POST /game/start] Game initialized, fetching game state")
+        try:
+            if zone is not None:
+                resolve_zone(zone)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await run_in_threadpool(initialize_game, db, seed=seed, zone=zone)
         game_state = get_current_game_state(db)
-        print(f"🚀 [POST /game/start] Returning game state with {len(game_state.tiles)} tiles")
+        log.info("🚀 New game started", tiles=len(game_state.tiles))
         return game_state
+    except HTTPException:
+        raise
+    except GameBusyError as e:
+        raise HTTPException(status_code=409, detail=e.message)
     except Exception as e:
-        print(f"❌ [POST /game/start] Error: {str(e)}")
+        log.exception("❌ Error starting game")
         raise HTTPException(status_code=500, detail=f"Error starting game: {str(e)}")
 
 
@@ -48,13 +134,52 @@ async def next_step(db: Session = Depends(get_db)):
     """
     Advance to the next turn/step.
     Applies all game mechanics: weather updates, irrigation, crop growth, resource generation.
+    The turn runs in the thread pool, so reads and tile actions are served
+    meanwhile; a second advance of the same game gets a 409.
     """
     try:
-        result = advance_to_next_step(db)
+        result = await run_in_threadpool(advance_to_next_step, db)
         if not result.get("success", False):
             raise HTTPException(status_code=400, detail=result.get("message", "Failed to advance step"))
         return result
     except HTTPException:
         raise
+    except GameBusyError as e:
+        raise HTTPException(status_code=409, detail=e.message)
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Game changed during the turn, retry")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error advancing step: {str(e)}")
+
+
+@router.get("/actions")
+async def get_game_actions(db: Session = Depends(get_db)):
+    """
+    Get the seed and ordered action log of the current game.
+    Posting them back through /game/start?seed= and the tile endpoints reproduces the game.
+    """
+    try:
+        return export_game(db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/replay", response_model=GameStateResponse)
+async def replay_game_endpoint(db: Session = Depends(get_db)):
+    """
+    Rebuild the current game from its seed and action log.
+    Runs in the thread pool under the game's turn lock (409 while it is busy).
+    """
+    try:
+        await run_in_threadpool(rebuild_game, db)
+        return get_current_game_state(db)
+    except GameBusyError as e:
+        raise HTTPException(status_code=409, detail=e.message)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        log.exception("❌ Error replaying game")
+        raise HTTPException(status_code=500, detail=f"Error replaying game: {str(e)}")
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from typing import AsyncIterator
 import sys
 import os
 
@@ -10,8 +12,32 @@ from database.models import Tile, Player, GameState
 from game.actions import buy_tile, plant_crop, build_water_reserve, build_firebreak
 from game.mechanics import irrigate_tile, harvest_tile
 from game.schemas import TileActionRequest
+from game.exceptions import GameBusyError
+from game.history import record_undoable, undo_history
+from game.locks import game_locks
+from game.revision import bump_revision
+
+# Tile and Player rows are version-checked: a concurrent change of the same
+# rows (e.g. a double-clicked action) fails the update instead of silently
+# overwriting it
+CONFLICT_DETAIL = "Tile or player changed concurrently, retry the action"
+
+
+async def tile_action_lock(db: Session = Depends(get_db)) -> AsyncIterator[None]:
+    """Run the request as a tile action of its game: refused with a 409 while the turn advances"""
+    game_id = db.query(GameState.id).scalar()
+    if game_id is None:
+        # Endpoints report the missing game themselves
+        yield
+        return
+    try:
+        with game_locks.action(game_id):
+            yield
+    except GameBusyError as e:
+        raise HTTPException(status_code=409, detail=e.message)
+
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(tile_action_lock)])
 
 
 @router.post("/{tile_id}/buy")
@@ -24,7 +50,11 @@ async def buy_tile_endpoint(tile_id: int, db: Session = Depends(get_db)):
         if not player:
             raise HTTPException(status_code=404, detail="Player not found. Initialize game first.")
 
+        undo_history.capture(db, [tile_id])
         result = buy_tile(tile_id, player, db)
+        if result["success"]:
+            record_undoable(db, "buy", tile_id)
+            bump_revision(db)
         db.commit()
 
         if not result["success"]:
@@ -33,6 +63,10 @@ async def buy_tile_endpoint(tile_id: int, db: Session = Depends(get_db)):
         return result
     except HTTPException:
         raise
+    except StaleDataError:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error buying tile: {str(e)}")
@@ -58,7 +92,11 @@ async def plant_crop_endpoint(
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
 
+        undo_history.capture(db, [tile_id])
         result = plant_crop(tile_id, player, request.crop_type, db)
+        if result["success"]:
+            record_undoable(db, "plant", tile_id, crop_type=request.crop_type)
+            bump_revision(db)
         db.commit()
 
         if not result["success"]:
@@ -67,6 +105,10 @@ async def plant_crop_endpoint(
         return result
     except HTTPException:
         raise
+    except StaleDataError:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error planting crop: {str(e)}")
@@ -90,7 +132,11 @@ async def irrigate_tile_endpoint(tile_id: int, db: Session = Depends(get_db)):
         if not game_state:
             raise HTTPException(status_code=404, detail="Game state not found")
 
+        undo_history.capture(db, [tile_id])
         result = irrigate_tile(tile, player, game_state.current_step, db)
+        if result["success"]:
+            record_undoable(db, "irrigate", tile_id)
+            bump_revision(db)
         db.commit()
 
         if not result["success"]:
@@ -99,6 +145,10 @@ async def irrigate_tile_endpoint(tile_id: int, db: Session = Depends(get_db)):
         return result
     except HTTPException:
         raise
+    except StaleDataError:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error irrigating tile: {str(e)}")
@@ -118,7 +168,11 @@ async def harvest_tile_endpoint(tile_id: int, db: Session = Depends(get_db)):
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
 
+        undo_history.capture(db, [tile_id])
         result = harvest_tile(tile, player, db)
+        if result["success"]:
+            record_undoable(db, "harvest", tile_id)
+            bump_revision(db)
         db.commit()
 
         if not result["success"]:
@@ -127,6 +181,10 @@ async def harvest_tile_endpoint(tile_id: int, db: Session = Depends(get_db)):
         return result
     except HTTPException:
         raise
+    except StaleDataError:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error harvesting tile: {str(e)}")
@@ -143,7 +201,11 @@ async def build_water_reserve_endpoint(tile_id: int, db: Session = Depends(get_d
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
 
+        undo_history.capture(db, [tile_id])
         result = build_water_reserve(tile_id, player, db)
+        if result["success"]:
+            record_undoable(db, "build_water_reserve", tile_id)
+            bump_revision(db)
         db.commit()
 
         if not result["success"]:
@@ -152,6 +214,10 @@ async def build_water_reserve_endpoint(tile_id: int, db: Session = Depends(get_d
         return result
     except HTTPException:
         raise
+    except StaleDataError:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error building water reserve: {str(e)}")
@@ -168,7 +234,11 @@ async def build_firebreak_endpoint(tile_id: int, db: Session = Depends(get_db)):
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
 
+        undo_history.capture(db, [tile_id])
         result = build_firebreak(tile_id, player, db)
+        if result["success"]:
+            record_undoable(db, "build_firebreak", tile_id)
+            bump_revision(db)
         db.commit()
 
         if not result["success"]:
@@ -177,6 +247,56 @@ async def build_firebreak_endpoint(tile_id: int, db: Session = Depends(get_db)):
         return result
     except HTTPException:
         raise
+    except StaleDataError:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error building firebreak: {str(e)}")
+
+
+@router.post("/undo")
+async def undo_endpoint(db: Session = Depends(get_db)):
+    """
+    Undo the last tile action of the current turn.
+    """
+    try:
+        result = undo_history.undo(db)
+        bump_revision(db)
+        db.commit()
+        return result
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except StaleDataError:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+    except Exception as e:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=500, detail=f"Error undoing action: {str(e)}")
+
+
+@router.post("/redo")
+async def redo_endpoint(db: Session = Depends(get_db)):
+    """
+    Redo the last undone tile action of the current turn.
+    """
+    try:
+        result = undo_history.redo(db)
+        bump_revision(db)
+        db.commit()
+        return result
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except StaleDataError:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+    except Exception as e:
+        db.rollback()
+        undo_history.reset()
+        raise HTTPException(status_code=500, detail=f"Error redoing action: {str(e)}")
@@ -0,0 +1 @@
+# Headless simulation package
@@ -0,0 +1,214 @@
+"""
+In-memory game engine for headless simulations.
+
+Plays the same rules as the API (game.actions / game.mechanics) on plain
+Python tile objects instead of SQLite rows, so thousands of games can run
+in worker processes without touching the database.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from game.actions import (
+    apply_buy_tile,
+    apply_plant_crop,
+    apply_build_water_reserve,
+    apply_build_firebreak,
+    apply_forest_exploitation,
+)
+from game.adjacency import get_neighbors
+from game.mechanics import (
+    advance_crop_state,
+    check_crop_death,
+    irrigate_tile,
+    apply_harvest,
+    auto_irrigate_tile,
+    apply_turn_income,
+)
+
+
+# Days of weather consumed per step (1 step = 1 week)
+DAYS_PER_STEP = 7
+
+
+@dataclass
+class SimTile:
+    """In-memory counterpart of database.models.Tile"""
+    id: int
+    grid_i: int
+    grid_j: int
+    zone_id: int = 1
+    type: str = "empty"
+    owner: Optional[str] = None
+    tile_state: Optional[str] = None
+    has_water_reserve: bool = False
+    has_firebreak: bool = False
+    temperature: float = 0.0
+    humidity: float = 0.0
+    last_irrigated_step: int = -1
+    irrigated_this_step: bool = False
+    exploited: str = "conserve"
+
+
+@dataclass
+class SimPlayer:
+    """In-memory counterpart of database.models.Player"""
+    shovels: int = 3
+    drops: int = 3
+    score: int = 0
+
+
+@dataclass
+class GameStats:
+    """Counters accumulated while a game is played"""
+    harvests: int = 0
+    crops_died: int = 0
+    crops_planted: int = 0
+    tiles_bought: int = 0
+    irrigations: int = 0
+    auto_irrigations: int = 0
+    rejected_actions: int = 0
+
+
+def seasonal_weather(days: int = 366, seed: int = 0) -> np.ndarray:
+    """
+    Synthetic daily weather shaped like get_history_info():
+    column 0 = soil moisture (m3/m3), column 1 = soil temperature (°C).
+    """
+    rng = np.random.default_rng(seed)
+    phase = np.linspace(0, 2 * np.pi, days)
+    humidity = 0.2 + 0.08 * np.sin(phase) + rng.normal(0, 0.02, days)
+    temperature = 21.0 + 5.0 * np.cos(phase) + rng.normal(0, 1.0, days)
+    return np.column_stack([np.clip(humidity, 0, 1), temperature])
+
+
+class SimGame:
+    """
+    Single game held in memory. Mirrors initialize_game / advance_to_next_step
+    and exposes the tile actions of routers/tile.py as methods.
+    """
+
+    def __init__(self, mask: np.ndarray, weather: np.ndarray, max_steps: int = 10,
+                 zone_id: int = 1):
+        self.ny, self.nx = mask.shape
+        self.weather = weather
+        self.step = 0
+        self.max_steps = max_steps
+        self.is_game_over = False
+        self.player = SimPlayer()
+        self.stats = GameStats()
+
+        humidity, temperature = self._weather_for_step(0)
+        rows, cols = np.nonzero(mask == 1)
+        self.tiles: List[SimTile] = [
+            SimTile(id=index + 1, grid_i=i, grid_j=j, zone_id=zone_id,
+                    humidity=humidity, temperature=temperature)
+            for index, (i, j) in enumerate(zip(rows.tolist(), cols.tolist()))
+        ]
+        self._by_position: Dict[Tuple[int, int], SimTile] = {(t.grid_i, t.grid_j): t for t in self.tiles}
+
+    # --- Lookups -----------------------------------------------------------
+
+    def tile(self, tile_id: int) -> Optional[SimTile]:
+        if 1 <= tile_id <= len(self.tiles):
+            return self.tiles[tile_id - 1]
+        return None
+
+    def adjacent_tiles(self, tile: SimTile) -> List[SimTile]:
+        neighbors = get_neighbors(tile.grid_i, tile.grid_j, self.ny, self.nx)
+        return [self._by_position[n] for n in neighbors if n in self._by_position]
+
+    def owned_tiles(self) -> List[SimTile]:
+        return [t for t in self.tiles if t.owner == "player"]
+
+    def _weather_for_step(self, step: int) -> Tuple[float, float]:
+        day_index = min(step * DAYS_PER_STEP, len(self.weather) - 1)
+        humidity, temperature = self.weather[day_index]
+        return float(humidity), float(temperature)
+
+    # --- Player actions ----------------------------------------------------
+
+    def _record(self, result: dict, counter: Optional[str] = None) -> dict:
+        if result["success"]:
+            if counter:
+                setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+        else:
+            self.stats.rejected_actions += 1
+        return result
+
+    def _with_tile(self, tile_id: int, action, counter: Optional[str] = None) -> dict:
+        tile = self.tile(tile_id)
+        if tile is None:
+            return self._record({"success": False, "message": f"Tile {tile_id} not found"})
+        return self._record(action(tile), counter)
+
+    def buy(self, tile_id: int) -> dict:
+        return self._with_tile(tile_id, lambda t: apply_buy_tile(t, self.player), "tiles_bought")
+
+    def plant(self, tile_id: int, crop_type: str = "wheat") -> dict:
+        return self._with_tile(tile_id, lambda t: apply_plant_crop(t, self.player, crop_type), "crops_planted")
+
+    def irrigate(self, tile_id: int) -> dict:
+        return self._with_tile(tile_id, lambda t: irrigate_tile(t, self.player, self.step, None), "irrigations")
+
+    def harvest(self, tile_id: int) -> dict:
+        def action(tile):
+            forests = sum(1 for t in self.adjacent_tiles(tile)
+                          if t.type == "forest" and t.exploited == "conserve")
+            return apply_harvest(tile, self.player, forests)
+        return self._with_tile(tile_id, action, "harvests")
+
+    def build_water_reserve(self, tile_id: int) -> dict:
+        return self._with_tile(tile_id, lambda t: apply_build_water_reserve(t, self.player))
+
+    def build_firebreak(self, tile_id: int) -> dict:
+        return self._with_tile(tile_id, lambda t: apply_build_firebreak(t, self.player))
+
+    def set_forest_exploitation(self, tile_id: int, mode: str) -> dict:
+        return self._with_tile(tile_id, lambda t: apply_forest_exploitation(t, self.player, mode))
+
+    # --- Turn progression --------------------------------------------------
+
+    def next_step(self) -> dict:
+        """Advance one turn, in the same order as game.state.advance_to_next_step"""
+        if self.is_game_over:
+            return {"success": False, "message": "Game is over"}
+
+        self.step += 1
+        if self.step >= self.max_steps:
+            self.is_game_over = True
+            return {"success": True, "step": self.step, "is_game_over": True,
+                    "final_score": self.player.score}
+
+        # Weather for the new step
+        humidity, temperature = self._weather_for_step(self.step)
+        for tile in self.tiles:
+            tile.humidity = humidity
+            tile.temperature = temperature
+            tile.irrigated_this_step = False
+
+        # Water reserve auto-irrigation
+        irrigated = set()
+        for reserve in (t for t in self.tiles if t.has_water_reserve):
+            for tile in self.adjacent_tiles(reserve):
+                if tile.id not in irrigated and auto_irrigate_tile(tile, self.step):
+                    irrigated.add(tile.id)
+        self.stats.auto_irrigations += len(irrigated)
+
+        # Crop deaths, then growth of the survivors
+        crops = [t for t in self.tiles if t.tile_state is not None]
+        died = sum(1 for tile in crops if check_crop_death(tile, self.step, None))
+        self.stats.crops_died += died
+        for tile in crops:
+            if tile.tile_state is not None:
+                advance_crop_state(tile, None)
+
+        apply_turn_income(self.player)
+
+        return {"success": True, "step": self.step, "is_game_over": False,
+                "crops_died": died, "auto_irrigated_tiles": len(irrigated)}
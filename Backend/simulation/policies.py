@@ -0,0 +1,95 @@
+"""
+Player policies for headless simulations.
+
+A policy is any object with an `act(game, rng)` method, called once per turn
+before the step advances. Policies are looked up by name in POLICIES or
+imported from a "module:ClassName" path, so new strategies can be plugged in
+without touching the runner.
+"""
+from typing import Dict, Type
+import importlib
+import random
+
+from game.mechanics import HUMIDITY_THRESHOLDS
+from simulation.engine import SimGame
+
+
+class Policy:
+    """Base policy: does nothing"""
+    name = "idle"
+
+    def act(self, game: SimGame, rng: random.Random) -> None:
+        pass
+
+
+class RandomPolicy(Policy):
+    """Tries a handful of random actions on random tiles every turn"""
+    name = "random"
+    actions_per_turn = 5
+
+    def act(self, game: SimGame, rng: random.Random) -> None:
+        if not game.tiles:
+            return
+        actions = (game.buy, game.plant, game.irrigate, game.harvest,
+                   game.build_water_reserve, game.build_firebreak)
+        for _ in range(self.actions_per_turn):
+            rng.choice(actions)(rng.randrange(1, len(game.tiles) + 1))
+
+
+class GreedyFarmerPolicy(Policy):
+    """
+    Harvests everything ripe, keeps buying tiles next to its farm, plants every
+    free owned tile and irrigates crops when the soil is below the death threshold.
+    """
+    name = "greedy"
+
+    def act(self, game: SimGame, rng: random.Random) -> None:
+        owned = game.owned_tiles()
+
+        for tile in owned:
+            if tile.tile_state == "harvest":
+                game.harvest(tile.id)
+
+        # Expand around the farm (or anywhere for the first purchase)
+        while game.player.shovels > 0:
+            candidates = [n for t in owned for n in game.adjacent_tiles(t) if n.owner is None]
+            if not candidates:
+                candidates = [t for t in game.tiles if t.owner is None]
+            if not candidates:
+                break
+            tile = rng.choice(candidates)
+            if not game.buy(tile.id)["success"]:
+                break
+            owned.append(tile)
+
+        for tile in owned:
+            if tile.type in ("empty", "field") and tile.tile_state is None:
+                game.plant(tile.id)
+
+        # Irrigate crops that would die at the current humidity
+        for tile in owned:
+            threshold = HUMIDITY_THRESHOLDS.get(tile.zone_id, 0.15)
+            if tile.tile_state is not None and tile.humidity < threshold and game.player.drops > 0:
+                game.irrigate(tile.id)
+
+
+POLICIES: Dict[str, Type[Policy]] = {
+    Policy.name: Policy,
+    RandomPolicy.name: RandomPolicy,
+    GreedyFarmerPolicy.name: GreedyFarmerPolicy,
+}
+
+
+def load_policy(name: str) -> Policy:
+    """
+    Instantiate a policy by registered name or "package.module:ClassName" path.
+
+    Raises:
+        ValueError: If the policy cannot be found
+    """
+    if name in POLICIES:
+        return POLICIES[name]()
+    if ":" in name:
+        module_name, class_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), class_name)()
+    raise ValueError(f"Unknown policy '{name}'. Available: {', '.join(sorted(POLICIES))}")
@@ -0,0 +1,155 @@
+"""
+Headless batch simulation runner.
+
+Plays N games with a pluggable policy across a ProcessPoolExecutor and writes
+per-game statistics as a compressed columnar .npz file (one array per column).
+
+Usage (from Backend/):
+    python -m simulation.runner --games 1000 --policy greedy --workers 8 --output sims.npz
+    python -m simulation.runner --games 200 --policy mypkg.bots:MyPolicy
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from get_map.get_map import generate_bean_gdf_and_mask
+from simulation.engine import SimGame, seasonal_weather
+from simulation.policies import load_policy
+
+
+# Columns of the output file, in order
+RESULT_COLUMNS = (
+    "seed", "score", "steps", "tiles", "tiles_owned", "shovels", "drops",
+    "harvests", "crops_died", "crops_planted", "tiles_bought", "irrigations",
+    "auto_irrigations", "rejected_actions", "duration_ms",
+)
+
+
+def play_game(seed: int, policy_name: str, grid_size: Tuple[int, int] = (50, 50),
+              max_steps: int = 10, weather: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """
+    Generate a map and play one full game with the given policy.
+
+    Args:
+        seed: Seed for map generation, weather noise and the policy
+        policy_name: Registered policy name or "module:Class" path
+        grid_size: Map dimensions (rows, cols)
+        max_steps: Game length in steps
+        weather: Daily (humidity, temperature) array; synthetic when None
+
+    Returns:
+        dict with one value per RESULT_COLUMNS entry
+    """
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    _, mask = generate_bean_gdf_and_mask(grid_size=grid_size, scale_range=(0.4, 0.8), rng=rng)
+    if weather is None:
+        weather = seasonal_weather(seed=seed)
+
+    game = SimGame(mask, weather, max_steps=max_steps)
+    policy = load_policy(policy_name)
+    while not game.is_game_over:
+        policy.act(game, rng)
+        game.next_step()
+
+    return {
+        "seed": seed,
+        "score": game.player.score,
+        "steps": game.step,
+        "tiles": len(game.tiles),
+        "tiles_owned": len(game.owned_tiles()),
+        "shovels": game.player.shovels,
+        "drops": game.player.drops,
+        **asdict(game.stats),
+        "duration_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def _play_chunk(seeds: Sequence[int], policy_name: str, grid_size: Tuple[int, int],
+                max_steps: int, weather: Optional[np.ndarray]) -> List[Dict[str, float]]:
+    return [play_game(seed, policy_name, grid_size, max_steps, weather) for seed in seeds]
+
+
+def run_batch(n_games: int, policy_name: str, workers: Optional[int] = None,
+              grid_size: Tuple[int, int] = (50, 50), max_steps: int = 10,
+              base_seed: int = 0, weather: Optional[np.ndarray] = None,
+              chunk_size: int = 16) -> Dict[str, np.ndarray]:
+    """
+    Play `n_games` games in parallel and return the results as columns.
+
+    Games are sent to workers in chunks to amortise inter-process overhead;
+    seeds are base_seed .. base_seed + n_games - 1, so a batch is reproducible.
+
+    Returns:
+        dict mapping each RESULT_COLUMNS name to a NumPy array of length n_games
+    """
+    load_policy(policy_name)  # fail fast on unknown policies
+    seeds = list(range(base_seed, base_seed + n_games))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, n_games, chunk_size)]
+
+    rows: List[Dict[str, float]] = []
+    if workers == 1:
+        for chunk in chunks:
+            rows.extend(_play_chunk(chunk, policy_name, grid_size, max_steps, weather))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_play_chunk, chunk, policy_name, grid_size, max_steps, weather)
+                       for chunk in chunks]
+            for future in futures:
+                rows.extend(future.result())
+
+    return {column: np.asarray([row[column] for row in rows]) for column in RESULT_COLUMNS}
+
+
+def save_results(path: str, columns: Dict[str, np.ndarray], **meta) -> None:
+    """Write result columns (plus scalar metadata) as a compressed .npz file"""
+    compact = {}
+    for name, values in columns.items():
+        if name == "duration_ms":
+            compact[name] = values.astype(np.float32)
+        else:
+            compact[name] = values.astype(np.int32)
+    np.savez_compressed(path, **compact, **{f"meta_{k}": np.asarray(v) for k, v in meta.items()})
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run headless Farm It games in parallel")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--policy", default="greedy",
+                        help="Registered policy name or module:Class path")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--grid", type=int, nargs=2, default=[50, 50], metavar=("ROWS", "COLS"))
+    parser.add_argument("--max-steps", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game")
+    parser.add_argument("--output", default="simulations.npz")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    columns = run_batch(args.games, args.policy, args.workers, tuple(args.grid),
+                        args.max_steps, args.seed)
+    elapsed = time.perf_counter() - start
+
+    save_results(args.output, columns, policy=args.policy, grid=args.grid,
+                 max_steps=args.max_steps, base_seed=args.seed)
+
+    scores = columns["score"]
+    print(f"{args.games} games with policy '{args.policy}' in {elapsed:.1f}s "
+          f"({args.games / elapsed:.1f} games/s)")
+    print(f"score: mean={scores.mean():.1f} std={scores.std():.1f} "
+          f"min={scores.min()} p50={np.median(scores):.0f} max={scores.max()}")
+    print(f"harvests/game={columns['harvests'].mean():.2f} "
+          f"crops_died/game={columns['crops_died'].mean():.2f}")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
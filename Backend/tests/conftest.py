@@ -0,0 +1,49 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+os.environ.setdefault("FARMIT_LOG_LEVEL", "WARNING")
+os.environ.setdefault("FARMIT_MAP_POOL_DEPTH", "0")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.stubs import stub_weather, temp_database
+from database.session import get_db
+from game.http_cache import response_cache
+
+
+@pytest.fixture
+def sessions():
+    """Session factory of a temporary database, weather sources stubbed"""
+    with stub_weather(), temp_database() as SessionLocal:
+        yield SessionLocal
+
+
+@pytest.fixture
+def client(sessions):
+    """API client whose requests use the `sessions` database"""
+    from main import app
+
+    def override_get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    response_cache.clear()
+    try:
+        # No `with`: the startup handlers would open the default database file
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def start_game(client, seed: int = 7) -> list:
+    """Start a game and return its tile ids"""
+    response = client.post("/game/start", params={"seed": seed})
+    assert response.status_code == 200
+    return [tile["id"] for tile in response.json()["tiles"]]
@@ -0,0 +1,68 @@
+"""Sparse active tile sets kept in step with committed rows (see game.active)"""
+from conftest import start_game
+from database.models import Player, Tile
+from database.session import get_db
+from game.actions import buy_tile, plant_crop
+from game.active import active_tiles
+
+
+def _committed_sets(sessions) -> tuple:
+    with sessions() as db:
+        owned = {tile_id for (tile_id,) in db.query(Tile.id).filter(Tile.owner.isnot(None))}
+        planted = {tile_id for (tile_id,) in db.query(Tile.id).filter(Tile.tile_state.isnot(None))}
+        sets = active_tiles.ensure(db)
+        return (owned, planted), (set(sets.owned), set(sets.planted))
+
+
+def test_committed_action_is_kept(client, sessions):
+    tile_ids = start_game(client)
+    with sessions() as db:
+        buy_tile(tile_ids[0], db.query(Player).first(), db)
+        db.commit()
+        assert tile_ids[0] in active_tiles.owned
+
+    committed, sets = _committed_sets(sessions)
+    assert sets == committed == ({tile_ids[0]}, set())
+
+
+def test_rolled_back_action_is_dropped(client, sessions):
+    tile_ids = start_game(client)
+    with sessions() as db:
+        player = db.query(Player).first()
+        assert buy_tile(tile_ids[0], player, db)["success"]
+        assert plant_crop(tile_ids[0], player, "wheat", db)["success"]
+        assert tile_ids[0] in active_tiles.planted
+        db.rollback()
+
+    committed, sets = _committed_sets(sessions)
+    assert sets == committed == (set(), set())
+
+
+def test_action_closed_without_commit_is_dropped(client, sessions):
+    tile_ids = start_game(client)
+    db = sessions()
+    buy_tile(tile_ids[0], db.query(Player).first(), db)
+    db.close()
+
+    committed, sets = _committed_sets(sessions)
+    assert sets == committed == (set(), set())
+
+
+def test_conflicting_buy_leaves_no_phantom_tile(client, sessions):
+    tile_ids = start_game(client)
+    stale = sessions()
+    stale_player = stale.query(Player).first()  # noqa: F841 (kept referenced: the identity map is weak)
+    assert client.post(f"/tile/{tile_ids[0]}/buy").status_code == 200
+
+    def stale_db():
+        yield stale
+
+    client.app.dependency_overrides[get_db] = stale_db
+    try:
+        assert client.post(f"/tile/{tile_ids[1]}/buy").status_code == 409
+    finally:
+        stale.close()
+
+    committed, sets = _committed_sets(sessions)
+    assert sets == committed
+    assert tile_ids[1] not in sets[0]
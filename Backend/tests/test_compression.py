@@ -0,0 +1,51 @@
+"""Compression of large bodies off the event loop (see game.compression)"""
+import threading
+
+import pytest
+
+import game.compression as compression
+from conftest import start_game
+
+
+@pytest.fixture
+def gzip_threads(monkeypatch):
+    """Names of the threads gzip ran in, in call order"""
+    threads = []
+    gzip = compression.CODECS["gzip"]
+
+    def recording_gzip(body):
+        threads.append(threading.current_thread().name)
+        return gzip(body)
+
+    monkeypatch.setitem(compression.CODECS, "gzip", recording_gzip)
+    return threads
+
+
+def _gzip_get(client, url):
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    return response
+
+
+def test_large_bodies_are_compressed_in_a_worker_thread(client, gzip_threads, monkeypatch):
+    start_game(client)
+    monkeypatch.setattr(compression, "COMPRESSION_THREAD_MIN_SIZE", 0)
+    gzip_threads.clear()
+
+    _gzip_get(client, "/game/state")  # cached body (game.http_cache)
+    response = client.post("/game/start", params={"seed": 8}, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"  # any response (CompressionMiddleware)
+
+    assert len(gzip_threads) == 2
+    assert all(name == "AnyIO worker thread" for name in gzip_threads)
+
+
+def test_small_bodies_stay_on_the_event_loop(client, gzip_threads, monkeypatch):
+    start_game(client)
+    monkeypatch.setattr(compression, "COMPRESSION_THREAD_MIN_SIZE", 1 << 40)
+    gzip_threads.clear()
+
+    _gzip_get(client, "/game/state")
+
+    assert gzip_threads and "AnyIO worker thread" not in gzip_threads
@@ -0,0 +1,84 @@
+"""Per-game turn lock and optimistic versioning of tile actions (see game.locks)"""
+import threading
+
+import pytest
+
+from conftest import start_game
+from database.models import Player, Tile
+from database.session import get_db
+from game.exceptions import GameBusyError
+from game.locks import GameLocks, game_locks
+
+
+def test_concurrent_buys_with_one_shovel(client, sessions):
+    tile_ids = start_game(client)
+    with sessions() as db:
+        db.query(Player).first().shovels = 1
+        db.commit()
+
+    # The second buy read the player before the first one committed
+    stale = sessions()
+    stale_player = stale.query(Player).first()  # Kept referenced: the identity map is weak
+    assert stale_player.shovels == 1
+    assert client.post(f"/tile/{tile_ids[0]}/buy").status_code == 200
+
+    def stale_db():
+        yield stale
+
+    client.app.dependency_overrides[get_db] = stale_db
+    try:
+        response = client.post(f"/tile/{tile_ids[1]}/buy")
+    finally:
+        stale.close()
+    assert response.status_code == 409
+
+    with sessions() as db:
+        assert db.query(Player).first().shovels == 0
+        assert db.query(Tile).filter(Tile.owner == "player").count() == 1
+
+
+def test_game_is_busy_during_turn(client):
+    tile_ids = start_game(client)
+    with game_locks.turn(1):
+        assert client.post(f"/tile/{tile_ids[0]}/buy").status_code == 409
+        assert client.post("/game/next-step").status_code == 409
+        assert client.post("/game/start").status_code == 409
+        assert client.post("/game/replay").status_code == 409
+        assert client.get("/game/state").status_code == 200
+    assert client.post(f"/tile/{tile_ids[0]}/buy").status_code == 200
+    assert client.post("/game/next-step").status_code == 200
+    assert client.post("/game/replay").status_code == 200
+
+
+def test_turn_is_reentrant_for_its_thread_only():
+    locks = GameLocks()
+    errors = []
+
+    def other_thread():
+        try:
+            with locks.turn(1):
+                pass
+        except GameBusyError as e:
+            errors.append(e)
+
+    with locks.turn(1):
+        with locks.turn(1):
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+        with pytest.raises(GameBusyError):
+            with locks.action(1):
+                pass
+    assert len(errors) == 1
+    with locks.action(1):
+        pass
+
+
+def test_turn_waits_for_running_actions():
+    locks = GameLocks()
+    with locks.action(1):
+        with pytest.raises(GameBusyError):
+            with locks.turn(1, timeout=0.05):
+                pass
+    with locks.turn(1, timeout=0.05):
+        pass
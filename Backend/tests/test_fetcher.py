@@ -0,0 +1,38 @@
+"""fetch_all() against the local NASA POWER mock: results in order, None for failed points"""
+import requests
+
+from benchmarks.mock_power import mock_power_server
+from benchmarks.stubs import fake_nasa_power_point
+from get_map.download_files import get_nasa_power_point
+from get_map.fetcher import fetch_all
+
+POINTS = [(48.85, 2.35), (-3.1, -60.0), (34.85, 5.73)]
+
+
+def test_fetch_all_returns_points_in_order():
+    with mock_power_server() as server:
+        frames = fetch_all(get_nasa_power_point, POINTS, source="test_power", retries=0)
+
+    assert server.requests == len(POINTS)
+    for (lat, lon), frame in zip(POINTS, frames):
+        expected = fake_nasa_power_point(lat, lon)
+        assert frame["T2M"].iloc[0] == round(expected["T2M"].iloc[0], 3)
+
+
+def test_fetch_all_returns_none_for_failed_points():
+    with mock_power_server(failure_rate=1.0) as server:
+        frames = fetch_all(get_nasa_power_point, POINTS, source="test_power", retries=1, backoff=0.0)
+
+    assert frames == [None] * len(POINTS)
+    assert server.requests == 2 * len(POINTS)
+
+
+def test_fetch_all_keeps_successful_points_when_one_fails():
+    def fetch(lat, lon):
+        if lat < 0:
+            raise requests.ConnectionError("unreachable")
+        return (lat, lon)
+
+    results = fetch_all(fetch, POINTS, source="test_stub", retries=0)
+
+    assert results == [POINTS[0], None, POINTS[2]]
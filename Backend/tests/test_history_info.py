@@ -0,0 +1,55 @@
+"""Multi-location Open-Meteo batch against the offline FakeOpenMeteoClient"""
+import numpy as np
+
+import get_map.get_history_info as history_module
+from benchmarks.stubs import FakeOpenMeteoClient, fake_history_info, stub_weather
+from get_map.get_history_info import DAILY_VARIABLES, get_history_info_batch, stack_daily_responses
+
+LATS = [48.85, -3.1, 34.85]
+LONS = [2.35, -60.0, 5.73]
+
+
+class _ReversedClient(FakeOpenMeteoClient):
+    """Answers locations in reverse order, as the API may"""
+
+    def weather_api(self, url: str, params: dict):
+        return list(reversed(super().weather_api(url, params)))
+
+
+def _expected(lat: float, lon: float) -> np.ndarray:
+    frame = fake_history_info(lat, lon)
+    return np.column_stack([frame[name].to_numpy(dtype=np.float32) for name in DAILY_VARIABLES])
+
+
+def test_batch_shape_is_locations_days_variables():
+    with stub_weather():
+        stacked = get_history_info_batch(LATS, LONS)
+
+    days = len(fake_history_info(0, 0))
+    assert stacked.shape == (len(LATS), days, len(DAILY_VARIABLES))
+
+
+def test_batch_is_ordered_by_location_id():
+    original = history_module.openmeteo
+    history_module.openmeteo = _ReversedClient()
+    try:
+        stacked = get_history_info_batch(LATS, LONS)
+    finally:
+        history_module.openmeteo = original
+
+    for index, (lat, lon) in enumerate(zip(LATS, LONS)):
+        np.testing.assert_allclose(stacked[index], _expected(lat, lon))
+
+
+def test_ragged_responses_are_padded_with_nan():
+    responses = FakeOpenMeteoClient().weather_api("", {"latitude": LATS, "longitude": LONS,
+                                                        "daily": DAILY_VARIABLES})
+    short = responses[1].Daily()
+    short._frame = short._frame.iloc[:100]
+
+    stacked = stack_daily_responses(responses)
+
+    assert stacked.shape[1] == len(fake_history_info(0, 0))
+    assert not np.isnan(stacked[1, :100]).any()
+    assert np.isnan(stacked[1, 100:]).all()
+    assert not np.isnan(stacked[[0, 2]]).any()
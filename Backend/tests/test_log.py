@@ -0,0 +1,29 @@
+"""Structured logger fields (see monitoring.log)"""
+import logging
+
+from monitoring.log import StructuredFormatter, get_logger
+
+
+def test_reserved_field_names_are_prefixed(caplog):
+    log = get_logger("tests.log")
+    with caplog.at_level(logging.INFO, logger="tests.log"):
+        log.info("Point fetched", args=(1, 2), name="paris", filename="map.csv", step=3)
+
+    record = caplog.records[-1]
+    assert record.getMessage() == "Point fetched"
+    assert record.name == "tests.log"
+    assert (record.field_args, record.field_name, record.field_filename) == ((1, 2), "paris", "map.csv")
+    assert record.step == 3
+
+
+def test_exc_info_is_not_a_field(caplog):
+    log = get_logger("tests.log")
+    with caplog.at_level(logging.ERROR, logger="tests.log"):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            log.error("Failed", exc_info=True, module="kept")
+
+    record = caplog.records[-1]
+    assert record.exc_info[0] is ValueError
+    assert '"field_module": "kept"' in StructuredFormatter().format(record)
@@ -0,0 +1,90 @@
+"""Rebuilding a game from its seed, snapshots and action log (see game.replay)"""
+from conftest import start_game
+from database.models import GameAction, GameSnapshot, Tile
+from game.snapshots import SNAPSHOT_INTERVAL
+
+PLANT = {"action": "plant", "crop_type": "wheat"}
+
+
+def _play(client, tile_ids: list, turns: int) -> None:
+    """Buy, plant and irrigate one tile per turn"""
+    for turn in range(turns):
+        tile_id = tile_ids[turn]
+        assert client.post(f"/tile/{tile_id}/buy").status_code == 200
+        assert client.post(f"/tile/{tile_id}/plant", json=PLANT).status_code == 200
+        assert client.post(f"/tile/{tile_id}/irrigate").status_code == 200
+        assert client.post("/game/next-step").status_code == 200
+
+
+def _log_invalid_action(sessions, tile_id: int) -> None:
+    """Append an action the replay will reject: harvesting a tile that is not owned"""
+    with sessions() as db:
+        db.add(GameAction(step=0, action="harvest", tile_id=tile_id))
+        db.commit()
+
+
+def _saved(client, sessions) -> tuple:
+    with sessions() as db:
+        owned = db.query(Tile).filter(Tile.owner == "player").count()
+        snapshots = db.query(GameSnapshot).count()
+    return client.get("/game/state").json(), client.get("/game/actions").json(), owned, snapshots
+
+
+def test_replay_reproduces_the_game(client):
+    tile_ids = start_game(client)
+    _play(client, tile_ids, 2)
+    assert client.post(f"/tile/{tile_ids[10]}/buy").status_code == 200
+    before = client.get("/game/state").json()
+
+    assert client.post("/game/replay").json() == before
+
+
+def test_snapshot_and_tail_equal_full_replay(client, sessions):
+    tile_ids = start_game(client)
+    _play(client, tile_ids, SNAPSHOT_INTERVAL + 2)
+    assert client.post(f"/tile/{tile_ids[0]}/harvest").status_code == 200
+    before = client.get("/game/state").json()
+
+    with sessions() as db:
+        assert db.query(GameSnapshot).count() == 1
+    from_snapshot = client.post("/game/replay").json()
+
+    with sessions() as db:
+        db.query(GameSnapshot).delete()
+        db.commit()
+    from_log = client.post("/game/replay").json()
+
+    assert from_snapshot == before
+    assert from_log == before
+
+
+def test_diverged_replay_leaves_game_intact(client, sessions):
+    tile_ids = start_game(client)
+    _play(client, tile_ids, 1)
+    assert client.post(f"/tile/{tile_ids[5]}/buy").status_code == 200
+    _log_invalid_action(sessions, tile_ids[20])
+    saved = _saved(client, sessions)
+
+    assert client.post("/game/replay").status_code == 409
+
+    assert _saved(client, sessions) == saved
+    assert saved[2] == 2
+
+
+def test_diverged_snapshot_replay_leaves_game_intact(client, sessions):
+    tile_ids = start_game(client)
+    _play(client, tile_ids, SNAPSHOT_INTERVAL + 1)
+    assert client.post(f"/tile/{tile_ids[20]}/buy").status_code == 200
+    _log_invalid_action(sessions, tile_ids[30])
+    saved = _saved(client, sessions)
+    assert saved[3] == 1
+
+    assert client.post("/game/replay").status_code == 409
+
+    assert _saved(client, sessions) == saved
+    # The game is still playable and its log replays once the bad entry is gone
+    with sessions() as db:
+        db.query(GameAction).filter(GameAction.tile_id == tile_ids[30]).delete()
+        db.commit()
+    assert client.post("/game/replay").status_code == 200
+    assert client.post("/game/next-step").status_code == 200
@@ -0,0 +1,20 @@
+"""/game/state documents and their OpenAPI schema (see game.schemas)"""
+from conftest import start_game
+from game.schemas import GameStateColumnsResponse, GameStateResponse
+
+
+def test_rows_and_columns_match_their_models(client):
+    start_game(client)
+    rows = client.get("/game/state").json()
+    columns = client.get("/game/state", params={"layout": "columns"}).json()
+
+    assert GameStateResponse.model_validate(rows).model_dump(mode="json") == rows
+    assert GameStateColumnsResponse.model_validate(columns).model_dump(mode="json") == columns
+    assert columns["tile_count"] == len(rows["tiles"])
+
+
+def test_openapi_documents_both_layouts(client):
+    schema = client.get("/openapi.json").json()["paths"]["/game/state"]["get"]["responses"]["200"]
+    refs = {option["$ref"] for option in schema["content"]["application/json"]["schema"]["anyOf"]}
+
+    assert refs == {"#/components/schemas/GameStateResponse", "#/components/schemas/GameStateColumnsResponse"}
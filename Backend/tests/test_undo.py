@@ -0,0 +1,73 @@
+"""Undo/redo of tile actions over copy-on-write chunks (see game.history)"""
+from conftest import start_game
+from game.active import active_tiles
+from game.history import HISTORY_CHUNK_SIZE, _chunk_index, undo_history
+
+PLANT = {"action": "plant", "crop_type": "wheat"}
+
+
+def _snapshot(client) -> tuple:
+    return client.get("/game/state").json(), client.get("/game/actions").json()
+
+
+def test_undo_and_redo_restore_tiles_and_player(client):
+    tile_ids = start_game(client)
+    tile_id = tile_ids[0]
+    start = _snapshot(client)
+
+    assert client.post(f"/tile/{tile_id}/buy").status_code == 200
+    assert client.post(f"/tile/{tile_id}/plant", json=PLANT).status_code == 200
+    assert client.post(f"/tile/{tile_id}/irrigate").status_code == 200
+    played = _snapshot(client)
+
+    for _ in range(3):
+        assert client.post("/tile/undo").status_code == 200
+    assert client.post("/tile/undo").status_code == 400
+    assert _snapshot(client) == start
+
+    for _ in range(3):
+        assert client.post("/tile/redo").status_code == 200
+    assert client.post("/tile/redo").status_code == 400
+    assert _snapshot(client) == played
+
+
+def test_undo_keeps_active_sets_in_step(client, sessions):
+    tile_ids = start_game(client)
+    assert client.post(f"/tile/{tile_ids[0]}/buy").status_code == 200
+    assert client.post("/tile/undo").status_code == 200
+
+    with sessions() as db:
+        assert tile_ids[0] not in active_tiles.ensure(db).owned
+
+
+def test_new_action_drops_redo(client):
+    tile_ids = start_game(client)
+    assert client.post(f"/tile/{tile_ids[0]}/buy").status_code == 200
+    assert client.post("/tile/undo").status_code == 200
+    assert client.post(f"/tile/{tile_ids[1]}/buy").status_code == 200
+
+    assert client.post("/tile/redo").status_code == 400
+
+
+def test_next_step_drops_history(client):
+    tile_ids = start_game(client)
+    assert client.post(f"/tile/{tile_ids[0]}/buy").status_code == 200
+    assert client.post("/game/next-step").status_code == 200
+
+    assert client.post("/tile/undo").status_code == 400
+
+
+def test_versions_share_untouched_chunks(client):
+    tile_ids = start_game(client)
+    first = tile_ids[0]
+    other = next(tile_id for tile_id in tile_ids if _chunk_index(tile_id) != _chunk_index(first))
+    assert client.post(f"/tile/{first}/buy").status_code == 200
+    assert client.post(f"/tile/{other}/buy").status_code == 200
+
+    start, after_first, after_other = undo_history.versions
+    assert start.chunks == {}
+    assert set(after_first.chunks) == {_chunk_index(first)}
+    assert set(after_other.chunks) == {_chunk_index(first), _chunk_index(other)}
+    # The chunk the second action did not touch is the same object, not a copy
+    assert after_other.chunks[_chunk_index(first)] is after_first.chunks[_chunk_index(first)]
+    assert len(after_first.chunks[_chunk_index(first)]) <= HISTORY_CHUNK_SIZE
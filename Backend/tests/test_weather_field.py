@@ -0,0 +1,71 @@
+"""NASA POWER surface field: interpolated when complete, flat fallbacks otherwise"""
+import numpy as np
+import pytest
+
+import get_map.weather_field as weather_field
+from benchmarks.stubs import fake_nasa_power_point
+from get_map.download_files import grid_points
+
+
+@pytest.fixture
+def histories(monkeypatch):
+    """Fake generate_grid_histories_25 whose failed points are set by the test"""
+    monkeypatch.setattr(weather_field, "_nasa_coarse", {})
+    points = grid_points(weather_field.WEATHER_LON, weather_field.WEATHER_LAT, 5, 5,
+                         weather_field.WEATHER_GRID_SPACING_KM)
+    failed = set()
+
+    def fake_histories(lon, lat, n_points=25, spacing_km=2):
+        return [None if index in failed else fake_nasa_power_point(*point)
+                for index, point in enumerate(points)]
+
+    monkeypatch.setattr(weather_field, "generate_grid_histories_25", fake_histories)
+    return failed
+
+
+def test_complete_field_is_interpolated_and_cached(histories):
+    field = weather_field.nasa_surface_field(0, 20, 30)
+
+    assert field.shape == (20, 30, 2)
+    assert np.ptp(field[:, :, 0]) > 0
+    assert 0 in weather_field._nasa_coarse
+
+
+def test_missing_point_falls_back_to_reference_point(histories):
+    histories.add(12)
+    field = weather_field.nasa_surface_field(0, 20, 30)
+
+    reference = fake_nasa_power_point(weather_field.WEATHER_LAT, weather_field.WEATHER_LON)
+    np.testing.assert_allclose(field[:, :, 0], reference["T2M"].iloc[0])
+    np.testing.assert_allclose(field[:, :, 1], reference["RH2M"].iloc[0])
+    assert weather_field._nasa_coarse == {}
+
+
+def test_no_point_falls_back_to_default_weather(histories):
+    histories.update(range(25))
+    field = weather_field.nasa_surface_field(0, 20, 30)
+
+    np.testing.assert_allclose(field, np.broadcast_to(weather_field.DEFAULT_SURFACE_WEATHER, field.shape))
+
+
+def _soil_field(values: np.ndarray) -> weather_field.WeatherField:
+    return weather_field.WeatherField(lambda lats, lons: values.copy(), shape=(2, 2))
+
+
+def test_padded_point_keeps_its_other_days():
+    # 4 points, 3 days, 1 variable; point 1 has a shorter series padded with NaN
+    values = np.arange(12, dtype=np.float64).reshape(4, 3, 1)
+    values[1, 2] = np.nan
+    series = _soil_field(values).series()[::-1].reshape(4, 3, 1)
+
+    np.testing.assert_array_equal(series[1, :2, 0], values[1, :2, 0])
+    assert series[1, 2, 0] == np.mean(values[[0, 2, 3], 2, 0])
+    np.testing.assert_array_equal(series[[0, 2, 3]], values[[0, 2, 3]])
+
+
+def test_day_without_any_value_raises():
+    values = np.ones((4, 3, 1))
+    values[:, 1] = np.nan
+
+    with pytest.raises(ValueError, match="day 1"):
+        _soil_field(values).series()
@@ -5,9 +5,20 @@
 
 const API_BASE = 'http://localhost:8000';
 
+// Build a query string from defined params only (viewport bounds, fields...)
+function toQuery(params = {}) {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+        if (value !== undefined && value !== null) query.append(key, value);
+    });
+    const text = query.toString();
+    return text ? `?${text}` : '';
+}
+
 // Game State Endpoints
-export async function fetchGameState() {
-    const res = await fetch(`${API_BASE}/game/state`);
+// viewport: optional { row_min, row_max, col_min, col_max, fields } to fetch only visible tiles
+export async function fetchGameState(viewport) {
+    const res = await fetch(`${API_BASE}/game/state${toQuery(viewport)}`);
     if (!res.ok) {
         if (res.status === 404) {
             throw new Error('GAME_NOT_INITIALIZED');
@@ -17,6 +28,54 @@ export async function fetchGameState() {
     return res.json();
 }
 
+// Typed array per tile column of /game/state?layout=columns (enum and boolean columns are codes)
+const TILE_COLUMN_TYPES = {
+    id: Int32Array,
+    grid_i: Int32Array,
+    grid_j: Int32Array,
+    zone_id: Uint8Array,
+    type: Uint8Array,
+    owner: Uint8Array,
+    tile_state: Uint8Array,
+    has_water_reserve: Uint8Array,
+    has_firebreak: Uint8Array,
+    temperature: Float64Array,
+    humidity: Float64Array,
+    last_irrigated_step: Int32Array,
+    irrigated_this_step: Uint8Array,
+    exploited: Uint8Array,
+};
+const BOOLEAN_TILE_COLUMNS = ['has_water_reserve', 'has_firebreak', 'irrigated_this_step'];
+
+// Columnar game state: same fields as fetchGameState(), except tiles, replaced by
+// tileCount, columns (one typed array per tile field) and enums (code -> value tables)
+export async function fetchGameStateColumns(viewport) {
+    const data = await fetchGameState({ ...viewport, layout: 'columns' });
+    const { tile_count, tile_columns, tile_enums, ...state } = data;
+    const columns = {};
+    Object.entries(tile_columns).forEach(([name, values]) => {
+        columns[name] = (TILE_COLUMN_TYPES[name] || Float64Array).from(values);
+    });
+    return { ...state, tileCount: tile_count, columns, enums: tile_enums };
+}
+
+// Tile objects (as in fetchGameState().tiles) from a fetchGameStateColumns() result
+export function tilesFromColumns({ tileCount, columns, enums }) {
+    const names = Object.keys(columns);
+    const tiles = new Array(tileCount);
+    for (let k = 0; k < tileCount; k++) {
+        const tile = {};
+        names.forEach(name => {
+            const value = columns[name][k];
+            if (enums[name]) tile[name] = enums[name][value];
+            else if (BOOLEAN_TILE_COLUMNS.includes(name)) tile[name] = value === 1;
+            else tile[name] = value;
+        });
+        tiles[k] = tile;
+    }
+    return tiles;
+}
+
 export async function startNewGame() {
     const res = await fetch(`${API_BASE}/game/start`, { method: 'POST' });
     if (!res.ok) throw new Error('Failed to start game');